@@ -2,6 +2,7 @@ from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
 from flask_bcrypt import Bcrypt
 from flask_migrate import Migrate
+from werkzeug.middleware.proxy_fix import ProxyFix
 from app.config import Config
 from app.extensions import db, bcrypt
 from app.models import HOD  # Import HOD model
@@ -11,15 +12,41 @@ def create_app():
     app = Flask(__name__)
     app.config.from_object(Config)
 
+    if app.config.get("PROXY_FIX_HOPS"):
+        # Trust that many proxies' X-Forwarded-* headers, so remote_addr is the client (per-IP login throttle)
+        hops = app.config["PROXY_FIX_HOPS"]
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=hops, x_proto=hops)
+
+    from app.json_provider import init_json_provider
+    from app.compression import init_compression
+    init_json_provider(app)
+    init_compression(app)
+
     # Initialize extensions
     db.init_app(app)
     bcrypt.init_app(app)
     migrate = Migrate(app, db)  # db migration assistant
 
+    from app.modules.session_manager import SessionManager
+    from app.modules.login_guard import LoginGuard
+    from app.modules.year_cache import YearCache
+    from app.modules.ref_cache import RefCache
+    from app.modules.reporting_module import ReportingModule
+    from app.modules.report_jobs import ReportJobs
+    SessionManager.init_app(app)
+    LoginGuard.init_app(app)
+    YearCache.init_app(app)
+    RefCache.init_app(app)
+    ReportingModule.init_app(app)
+    ReportJobs.init_app(app)
+
     with app.app_context():
         from app import models  # Ensure models are registered
         db.create_all()  # Create all tables if they don't exist
 
+        from app.schema import check_schema
+        check_schema(app)  # warns about what create_all leaves out on tables that already existed
+
         # Check if there is an HOD, otherwise create a default admin HOD
         if not HOD.query.first():
             default_hod = HOD(
@@ -36,4 +63,7 @@ def create_app():
         from app.routes import register_blueprints
         register_blueprints(app)
 
+        from app.cli import register_commands
+        register_commands(app)
+
     return app
@@ -0,0 +1,100 @@
+import os
+
+import click
+from flask import current_app
+from flask.cli import AppGroup
+
+from app.compression import compress_static_folder
+from app.extensions import db
+from app.modules.marks_module import MarksModule
+from app.modules.table_versions import TableVersions
+from app.schema import duplicate_rows, missing_indexes
+
+marks_cli = AppGroup("marks", help="Maintenance commands for marks data.")
+static_cli = AppGroup("static", help="Static asset commands.")
+schema_cli = AppGroup("schema", help="Database schema repair commands.")
+versions_cli = AppGroup("versions", help="Table version counters behind ETags and the report cache.")
+
+
+@marks_cli.command("rebuild-totals")
+def rebuild_totals():
+    """Recompute the student_subject_totals table from the mark tables."""
+    rows = MarksModule.rebuild_totals()
+    click.echo(f"✅ Rebuilt {rows} student/subject totals")
+
+
+@marks_cli.command("check-totals")
+def check_totals():
+    """Report totals rows that disagree with the mark tables (exit code 1 if any)."""
+    problems = MarksModule.check_totals()
+    for problem in problems:
+        click.echo(problem)
+    if problems:
+        click.echo(f"❌ {len(problems)} inconsistencies, run 'flask marks rebuild-totals' to repair")
+        raise SystemExit(1)
+    click.echo("✅ Totals are consistent")
+
+
+@schema_cli.command("repair-indexes")
+@click.option("--dry-run", is_flag=True, help="Only list the missing indexes and the rows that would be deleted.")
+@click.option("--yes", is_flag=True, help="Delete duplicate rows without asking.")
+def repair_indexes(dry_run, yes):
+    """Create the model indexes missing from existing tables, deleting the duplicate rows that block unique ones."""
+    missing = missing_indexes()
+    if not missing:
+        click.echo("✅ No missing indexes")
+        return
+
+    plan = []
+    with db.engine.connect() as conn:
+        for table, index in missing:
+            rows = duplicate_rows(conn, table, [column.name for column in index.columns]) if index.unique else []
+            plan.append((table, index, rows))
+            click.echo(f"{index.name} on {table.name}" + (f": {len(rows)} duplicate rows to delete" if index.unique else ""))
+            for row in rows:
+                click.echo(f"  {dict(row)}")
+    if dry_run:
+        return
+
+    doomed = sum(len(rows) for _, _, rows in plan)
+    if doomed and not yes:
+        click.confirm(f"Delete {doomed} duplicate rows (the newest row of each key is kept)?", abort=True)
+    for table, index, rows in plan:
+        pk = table.primary_key.columns.values()[0]
+        ids = [row[pk.name] for row in rows]
+        for start in range(0, len(ids), 500):
+            db.session.execute(table.delete().where(pk.in_(ids[start:start + 500])))
+        index.create(db.session.connection(), checkfirst=True)
+    if doomed:
+        TableVersions.bump("marks")
+    db.session.commit()
+    click.echo(f"✅ Created {len(plan)} indexes, deleted {doomed} duplicate rows")
+    if doomed:
+        click.echo("Run 'flask marks rebuild-totals' to recompute the totals of the affected students")
+
+
+@versions_cli.command("bump")
+@click.argument("tables", nargs=-1)
+def bump_versions(tables):
+    """Mark tables as changed after writing them outside the app (default: all of them)."""
+    tables = tables or TableVersions.TABLES
+    TableVersions.bump(*tables)
+    db.session.commit()
+    click.echo(f"✅ Bumped {', '.join(tables)}")
+
+
+@static_cli.command("compress")
+def compress_static():
+    """Write gzipped copies (<file>.gz) of the static assets, served in place of the originals."""
+    if not current_app.has_static_folder or not os.path.isdir(current_app.static_folder):
+        click.echo("No static folder, nothing to compress")
+        return
+    written = compress_static_folder(current_app.static_folder)
+    click.echo(f"✅ Compressed {len(written)} static files")
+
+
+def register_commands(app):
+    app.cli.add_command(marks_cli)
+    app.cli.add_command(static_cli)
+    app.cli.add_command(schema_cli)
+    app.cli.add_command(versions_cli)
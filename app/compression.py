@@ -0,0 +1,111 @@
+import gzip
+import mimetypes
+import os
+import zlib
+
+from flask import request, send_from_directory
+
+# Already-compressed formats (.xlsx is a zip container, images) are left out on purpose
+DEFAULT_MIMETYPES = (
+    "text/html", "text/css", "text/plain", "text/csv", "text/javascript",
+    "application/json", "application/javascript", "application/pdf", "image/svg+xml",
+)
+
+
+def _accepts_gzip():
+    return request.accept_encodings["gzip"] > 0
+
+
+def _gzip_stream(chunks, level):
+    """Compresses an iterable of byte chunks on the fly, closing the source when done"""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)  # wbits 31: gzip container
+    try:
+        for chunk in chunks:
+            data = compressor.compress(chunk)
+            if data:
+                yield data
+        yield compressor.flush()
+    finally:
+        if hasattr(chunks, "close"):
+            chunks.close()
+
+
+def compress_response(response, min_size=1024, level=6, mimetypes_allowed=DEFAULT_MIMETYPES):
+    """
+    Gzips a response when the client accepts it, the content type is allowlisted and the body is
+    at least min_size bytes. Buffered bodies are compressed in one go; streamed and file responses
+    (send_file) are compressed chunk by chunk without being read into memory.
+    """
+    if response.status_code < 200 or response.status_code in (204, 206, 304):
+        return response
+    if response.mimetype not in mimetypes_allowed or "Content-Encoding" in response.headers:
+        return response
+
+    response.vary.add("Accept-Encoding")
+    if not _accepts_gzip():
+        return response
+
+    length = response.content_length
+    if length is not None and length < min_size:
+        return response
+
+    if response.is_streamed or response.direct_passthrough:
+        response.response = _gzip_stream(response.response, level)
+        response.direct_passthrough = False
+        response.headers.pop("Content-Length", None)
+    else:
+        response.set_data(gzip.compress(response.get_data(), compresslevel=level))
+
+    response.headers["Content-Encoding"] = "gzip"
+    response.headers.pop("Accept-Ranges", None)  # byte ranges would refer to the uncompressed file
+    if response.headers.get("ETag") and not response.headers["ETag"].startswith("W/"):
+        response.headers["ETag"] = "W/" + response.headers["ETag"]  # a different encoding of the same data
+    return response
+
+
+def precompressed_static(app):
+    """Serves `<file>.gz` next to a static asset, when present and accepted, instead of the asset itself"""
+    serve_static = app.view_functions.get("static")
+    if serve_static is None:
+        return
+
+    def static(filename):
+        compressed = os.path.join(app.static_folder, filename + ".gz")
+        if _accepts_gzip() and os.path.isfile(compressed):
+            mimetype = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+            response = send_from_directory(app.static_folder, filename + ".gz", mimetype=mimetype)
+            response.headers["Content-Encoding"] = "gzip"
+            response.vary.add("Accept-Encoding")
+            return response
+        return serve_static(filename=filename)
+
+    app.view_functions["static"] = static
+
+
+def compress_static_folder(folder, level=9, mimetypes_allowed=DEFAULT_MIMETYPES):
+    """Writes `<file>.gz` for every compressible file under folder, returns the files written"""
+    written = []
+    for root, _, files in os.walk(folder):
+        for name in files:
+            if name.endswith(".gz") or mimetypes.guess_type(name)[0] not in mimetypes_allowed:
+                continue
+            path = os.path.join(root, name)
+            with open(path, "rb") as source, gzip.open(path + ".gz", "wb", compresslevel=level) as target:
+                target.write(source.read())
+            written.append(path + ".gz")
+    return written
+
+
+def init_compression(app):
+    """Registers gzip compression for responses and precompressed static assets (COMPRESS_* config)"""
+    if not app.config.get("COMPRESS_ENABLED", True):
+        return
+    min_size = app.config.get("COMPRESS_MIN_SIZE", 1024)
+    level = app.config.get("COMPRESS_LEVEL", 6)
+    mimetypes_allowed = frozenset(app.config.get("COMPRESS_MIMETYPES", DEFAULT_MIMETYPES))
+
+    @app.after_request
+    def _compress(response):
+        return compress_response(response, min_size, level, mimetypes_allowed)
+
+    precompressed_static(app)
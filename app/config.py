@@ -3,4 +3,65 @@ import os
 class Config:
     SQLALCHEMY_DATABASE_URI = "sqlite:///database.db"  # Change for PostgreSQL/MySQL
     SQLALCHEMY_TRACK_MODIFICATIONS = False
-    SECRET_KEY = os.urandom(24)  # Used for session security
+    SECRET_KEY = os.environ.get("SECRET_KEY") or os.urandom(24)  # Used for session security; must be shared by all workers in signed mode
+
+    # Session store: "memory" (single process) or "sqlite" (shared by all workers on a host)
+    SESSION_BACKEND = os.environ.get("SESSION_BACKEND", "memory")
+    SESSION_STORE_PATH = os.environ.get("SESSION_STORE_PATH")  # defaults to instance/sessions.db
+    SESSION_IDLE_TTL = int(os.environ.get("SESSION_IDLE_TTL", 2 * 60 * 60))  # seconds of inactivity
+    SESSION_ABSOLUTE_TTL = int(os.environ.get("SESSION_ABSOLUTE_TTL", 12 * 60 * 60))  # seconds since login
+    SESSION_SWEEP_INTERVAL = int(os.environ.get("SESSION_SWEEP_INTERVAL", 60))  # 0 disables the sweeper
+    # Session mode: "server" (session id looked up in the store) or "signed" (stateless itsdangerous token)
+    SESSION_MODE = os.environ.get("SESSION_MODE", "server")
+
+    # Login verification: bcrypt cost and the pool/throttles that bound its CPU use
+    BCRYPT_LOG_ROUNDS = int(os.environ.get("BCRYPT_LOG_ROUNDS", 12))  # existing hashes are upgraded on next login
+    LOGIN_WORKERS = int(os.environ.get("LOGIN_WORKERS", 2))  # concurrent bcrypt verifications
+    LOGIN_QUEUE_DEPTH = int(os.environ.get("LOGIN_QUEUE_DEPTH", 8))  # waiting verifications before 429
+    LOGIN_TIMEOUT = 10  # seconds a request waits for its verification
+    # The per-IP throttle assumes request.remote_addr is the real client address. Behind reverse proxies set
+    # PROXY_FIX_HOPS to their count so it is read from X-Forwarded-For; raise the IP limit for a shared NAT.
+    PROXY_FIX_HOPS = int(os.environ.get("PROXY_FIX_HOPS", 0))  # 0: requests come straight from clients
+    LOGIN_IP_RATE = float(os.environ.get("LOGIN_IP_RATE", 20 / 60))  # tokens per second per client IP
+    LOGIN_IP_BURST = int(os.environ.get("LOGIN_IP_BURST", 20))
+    LOGIN_EMAIL_RATE = 5 / 60  # tokens per second per email address
+    LOGIN_EMAIL_BURST = 5
+
+    # Student/subject year cache used to verify marks writes
+    YEAR_CACHE_SIZE = 4096  # entries
+    YEAR_CACHE_TTL = 300  # seconds; bounds staleness of edits made by other worker processes
+
+    # Reference data cache (subjects, teacher list): "memory" (per process) or "sqlite" (shared per host)
+    REF_CACHE_BACKEND = os.environ.get("REF_CACHE_BACKEND", "memory")
+    REF_CACHE_PATH = os.environ.get("REF_CACHE_PATH")  # sqlite file; defaults to instance/ref_cache.db
+    REF_CACHE_SIZE = 256  # entries
+    REF_CACHE_TTL = 600  # seconds; bounds staleness of edits made by other worker processes (memory backend)
+
+    # gzip response compression (JSON, HTML, PDF reports; .xlsx is already a zip and is skipped)
+    COMPRESS_ENABLED = os.environ.get("COMPRESS_ENABLED", "1") == "1"
+    COMPRESS_MIN_SIZE = 1024  # bytes; smaller bodies are sent as is
+    COMPRESS_LEVEL = 6
+
+    # Excel reports: render in xlsxwriter constant_memory mode into a spooled buffer and stream it,
+    # instead of writing the workbook to REPORTS_DIR first
+    REPORT_STREAMING = os.environ.get("REPORT_STREAMING", "0") == "1"
+
+    # Generated report cache under REPORTS_DIR/cache, keyed on report parameters and data version
+    REPORT_CACHE_ENABLED = os.environ.get("REPORT_CACHE_ENABLED", "1") == "1"
+    REPORT_CACHE_MAX_BYTES = int(os.environ.get("REPORT_CACHE_MAX_BYTES", 200 * 1024 * 1024))  # LRU eviction above this
+    # Backstop for writes that skipped the version counters: entries are regenerated at least this often
+    # (seconds, 0 = never) and removed once unused for this long
+    REPORT_CACHE_TTL = int(os.environ.get("REPORT_CACHE_TTL", 60 * 60))
+
+    # Background report jobs (submit, poll, download); the job table lives in the main database
+    REPORT_JOB_WORKERS = int(os.environ.get("REPORT_JOB_WORKERS", 2))  # reports generated concurrently per process
+    REPORT_JOB_QUEUE_DEPTH = int(os.environ.get("REPORT_JOB_QUEUE_DEPTH", 20))  # waiting jobs before 429
+    REPORT_JOB_STALE_AFTER = 30 * 60  # seconds; a running job older than this is assumed dead and re-queued on restart
+    REPORT_JOB_RETENTION = 7 * 24 * 60 * 60  # seconds finished jobs are kept
+    REPORT_CARD_WORKERS = int(os.environ.get("REPORT_CARD_WORKERS", 0))  # processes rendering bulk report cards; 0: automatic
+    # Automatic sizing (REPORT_CARD_WORKERS = 0): one process per this many students, at most one per CPU;
+    # a year below it renders in the request process, where a new process would cost more than it saves
+    REPORT_CARDS_PER_WORKER = int(os.environ.get("REPORT_CARDS_PER_WORKER", 100))
+
+    # JSON encoding: "default" (stdlib json) or "orjson" (faster, needs `pip install orjson`)
+    JSON_PROVIDER = os.environ.get("JSON_PROVIDER", "default")
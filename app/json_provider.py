@@ -0,0 +1,28 @@
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider that encodes with orjson; decoding and unsupported types fall back to the default"""
+
+    def dumps(self, obj, **kwargs):
+        kwargs.pop("separators", None)  # compact output is all orjson produces
+        if kwargs:  # indent (debug responses), cls, ... keep the stdlib behaviour
+            return super().dumps(obj, **kwargs)
+        option = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, default=self.default, option=option).decode("utf-8")
+
+
+def init_json_provider(app):
+    """Installs the JSON provider selected by JSON_PROVIDER ("default" or "orjson")"""
+    if app.config.get("JSON_PROVIDER") == "orjson":
+        if orjson is None:
+            print("⚠️ JSON_PROVIDER is 'orjson' but orjson is not installed, using the default provider")
+            return
+        app.json = OrjsonProvider(app)
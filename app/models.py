@@ -1,6 +1,6 @@
 from flask_sqlalchemy import SQLAlchemy
 from sqlalchemy.orm import relationship
-from sqlalchemy import Column, Integer, String, ForeignKey, Float
+from sqlalchemy import Column, Integer, String, ForeignKey, Float, Index
 from flask_bcrypt import Bcrypt
 from app.extensions import db, bcrypt
 
@@ -71,7 +71,7 @@ class Subject(db.Model):
     __tablename__ = "subjects"
     subject_id = Column(Integer, primary_key=True)
     subject_name = Column(String(100), nullable=False)
-    year = Column(Integer, nullable=False)
+    year = Column(Integer, nullable=False, index=True)
 
     def serialize(self):
         """Convert SQLAlchemy object to a dictionary"""
@@ -93,7 +93,7 @@ class Student(db.Model):
     dob = Column(String(20), nullable=False)
     gender = Column(String(10), nullable=False)
     address = Column(String(255), nullable=False)
-    current_year = Column(Integer, nullable=False, default=1)
+    current_year = Column(Integer, nullable=False, default=1, index=True)
     admission_year = Column(Integer, nullable=False)
     enrollment_number = Column(String(20), unique=True)  # Unique enrollment number
     exam_seat_number = Column(String(20), unique=True)  # Unique exam seat number
@@ -119,6 +119,9 @@ class Student(db.Model):
 class ManualMarks(db.Model):
     """Stores experiment marks for students dynamically"""
     __tablename__ = "manual_marks"
+    __table_args__ = (
+        Index("ux_manual_marks_student_subject_experiment", "student_id", "subject_id", "experiment_number", unique=True),
+    )
     manual_marks_id = Column(Integer, primary_key=True)
     student_id = Column(Integer, ForeignKey("students.student_id"), nullable=False)
     subject_id = Column(Integer, ForeignKey("subjects.subject_id"), nullable=False)
@@ -130,10 +133,11 @@ class ManualMarks(db.Model):
 
     @staticmethod
     def calculate_total(student_id, subject_id):
-        """Calculate total experiment marks for a student in a subject"""
-        experiments = db.session.query(ManualMarks).filter_by(student_id=student_id, subject_id=subject_id).all()
-        total_exp_marks = sum(exp.marks_obtained for exp in experiments)
-        return total_exp_marks
+        """Total experiment marks for a student in a subject (read from the maintained totals table)"""
+        total_exp_marks = db.session.query(StudentSubjectTotal.experiment_total).filter_by(
+            student_id=student_id, subject_id=subject_id
+        ).scalar()
+        return total_exp_marks or 0
 
     def serialize(self):
         """Convert to dictionary"""
@@ -150,6 +154,9 @@ class ManualMarks(db.Model):
 class PracticalMarks(db.Model):
     """Stores practical exam marks for students"""
     __tablename__ = "practical_marks"
+    __table_args__ = (
+        Index("ux_practical_marks_student_subject", "student_id", "subject_id", unique=True),
+    )
     practical_marks_id = Column(Integer, primary_key=True)
     student_id = Column(Integer, ForeignKey("students.student_id"), nullable=False)
     subject_id = Column(Integer, ForeignKey("subjects.subject_id"), nullable=False)
@@ -172,6 +179,9 @@ class PracticalMarks(db.Model):
 class ClassTestMarks(db.Model):
     """Stores marks for Class Test 1 and Class Test 2"""
     __tablename__ = "class_test_marks"
+    __table_args__ = (
+        Index("ux_class_test_marks_student_subject", "student_id", "subject_id", unique=True),
+    )
     class_test_marks_id = Column(Integer, primary_key=True)
     student_id = Column(Integer, ForeignKey("students.student_id"), nullable=False)
     subject_id = Column(Integer, ForeignKey("subjects.subject_id"), nullable=False)
@@ -201,6 +211,9 @@ class ClassTestMarks(db.Model):
 class SLAMarks(db.Model):
     """Stores SLA marks (Micro Projects, Assignments, Others)"""
     __tablename__ = "sla_marks"
+    __table_args__ = (
+        Index("ux_sla_marks_student_subject", "student_id", "subject_id", unique=True),
+    )
     sla_marks_id = Column(Integer, primary_key=True)
     student_id = Column(Integer, ForeignKey("students.student_id"), nullable=False)
     subject_id = Column(Integer, ForeignKey("subjects.subject_id"), nullable=False)
@@ -220,4 +233,85 @@ class SLAMarks(db.Model):
             "micro_project": self.micro_project,
             "assignment": self.assignment,
             "other_marks": self.other_marks
-        }
\ No newline at end of file
+        }
+
+
+# ---------------------------- MODULE 9: STUDENT SUBJECT TOTALS ----------------------------
+class StudentSubjectTotal(db.Model):
+    """Per (student, subject) totals, kept up to date by MarksModule in the same transaction as each mark write"""
+    __tablename__ = "student_subject_totals"
+    __table_args__ = (
+        Index("ix_student_subject_totals_subject_total", "subject_id", "total"),
+    )
+    student_id = Column(Integer, ForeignKey("students.student_id"), primary_key=True)
+    subject_id = Column(Integer, ForeignKey("subjects.subject_id"), primary_key=True)
+    experiment_total = Column(Float, nullable=False, default=0)
+    practical_exam_marks = Column(Float, nullable=False, default=0)
+    class_test_average = Column(Float, nullable=False, default=0)
+    sla_total = Column(Float, nullable=False, default=0)
+    total = Column(Float, nullable=False, default=0)
+
+    MAX_TOTAL = 400  # maximum marks per subject, used for percentages
+
+    def serialize(self):
+        """Convert to dictionary"""
+        return {
+            "student_id": self.student_id,
+            "subject_id": self.subject_id,
+            "experiment_total": self.experiment_total,
+            "practical_exam_marks": self.practical_exam_marks,
+            "class_test_average": self.class_test_average,
+            "sla_total": self.sla_total,
+            "total": self.total,
+            "percentage": round(self.total / self.MAX_TOTAL * 100, 2)
+        }
+
+
+# ---------------------------- MODULE 10: REPORT JOBS ----------------------------
+class ReportJob(db.Model):
+    """Report generation request run by the background worker pool; kept in the database so jobs survive restarts"""
+    __tablename__ = "report_jobs"
+    __table_args__ = (
+        Index("ix_report_jobs_dedupe_key_status", "dedupe_key", "status"),
+        Index("ix_report_jobs_status_created_at", "status", "created_at"),
+    )
+    job_id = Column(String(32), primary_key=True)
+    report_type = Column(String(20), nullable=False)  # "students" (year report), "student" or "cards" (ZIP of student reports)
+    file_format = Column(String(10), nullable=False)
+    year = Column(Integer, nullable=True)
+    student_id = Column(Integer, nullable=True)
+    dedupe_key = Column(String(64), nullable=False)
+    status = Column(String(10), nullable=False, default="queued")  # queued, running, done, failed
+    file_path = Column(String(500), nullable=True)
+    error = Column(String(500), nullable=True)
+    progress = Column(Integer, nullable=False, default=0)  # items rendered so far, out of total (bulk jobs)
+    total = Column(Integer, nullable=True)
+    created_at = Column(Float, nullable=False)  # unix timestamps
+    started_at = Column(Float, nullable=True)
+    finished_at = Column(Float, nullable=True)
+
+    def serialize(self):
+        """Convert to dictionary"""
+        return {
+            "job_id": self.job_id,
+            "report_type": self.report_type,
+            "format": self.file_format,
+            "year": self.year,
+            "student_id": self.student_id,
+            "status": self.status,
+            "error": self.error,
+            "progress": self.progress,
+            "total": self.total,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at
+        }
+
+
+# ---------------------------- MODULE 11: TABLE VERSIONS ----------------------------
+class TableVersion(db.Model):
+    """Change counter of a group of tables, bumped in the same transaction as each write (ETags, report cache)"""
+    __tablename__ = "table_versions"
+    name = Column(String(50), primary_key=True)  # "students", "subjects", "teachers" or "marks"
+    version = Column(Integer, nullable=False, default=0)
+    modified_at = Column(Float, nullable=False)  # unix timestamp of the last bump
@@ -1,5 +1,6 @@
 from app.models import HOD
 from app.extensions import db
+from app.modules.login_guard import LoginGuard
 
 class HODModule:
     @staticmethod
@@ -35,6 +36,6 @@ class HODModule:
     def login(email, password):
         """Login HOD"""
         hod = HOD.query.filter_by(email=email).first()
-        if hod and hod.check_password(password):
+        if hod and LoginGuard.verify_password(hod, password):
             return hod
         return None
\ No newline at end of file
@@ -0,0 +1,116 @@
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+
+from app.extensions import bcrypt, db
+
+
+class LoginRejected(Exception):
+    """Raised when a login attempt is throttled or the verification pool is saturated"""
+
+    def __init__(self, message, retry_after=1):
+        super().__init__(message)
+        self.message = message
+        self.retry_after = retry_after
+
+
+class TokenBucketLimiter:
+    """Per-key token bucket with lazy refill; the least recently seen keys are dropped past max_keys"""
+
+    def __init__(self, rate, capacity, max_keys=10000):
+        self.rate = rate  # tokens added per second
+        self.capacity = capacity
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()  # key → (tokens, last refill time)
+        self._lock = threading.Lock()
+
+    def consume(self, key):
+        """Takes one token for key, returns (allowed, seconds until the next token)"""
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.pop(key, (self.capacity, now))
+            tokens = min(self.capacity, tokens + (now - updated) * self.rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            self._buckets[key] = (tokens, now)
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return allowed, 0 if allowed else (1 - tokens) / self.rate
+
+
+def _verify_and_rehash(password_hash, password, rounds):
+    """Runs in the login pool: checks the password and rehashes it if the work factor changed"""
+    if not bcrypt.check_password_hash(password_hash, password):
+        return False, None
+    if int(password_hash.split("$")[2]) != rounds:
+        return True, bcrypt.generate_password_hash(password, rounds).decode("utf-8")
+    return True, None
+
+
+class LoginGuard:
+    """
+    Keeps bcrypt verification off the request threads' CPU budget: hashes run on a small,
+    separately sized pool with a bounded backlog, and per-IP / per-email token buckets
+    reject brute-force traffic before any hashing happens.
+    """
+
+    _executor = None
+    _slots = None  # bounds running + queued verifications
+    _timeout = 10
+    _rounds = 12
+    _ip_limiter = None
+    _email_limiter = None
+
+    @staticmethod
+    def init_app(app):
+        """Sizes the verification pool and throttles from the app config"""
+        workers = app.config.get("LOGIN_WORKERS", 2)
+        if LoginGuard._executor is None:
+            LoginGuard._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="login")
+            LoginGuard._slots = threading.BoundedSemaphore(workers + app.config.get("LOGIN_QUEUE_DEPTH", 8))
+        LoginGuard._timeout = app.config.get("LOGIN_TIMEOUT", 10)
+        LoginGuard._rounds = app.config.get("BCRYPT_LOG_ROUNDS", 12)
+        LoginGuard._ip_limiter = TokenBucketLimiter(
+            rate=app.config.get("LOGIN_IP_RATE", 20 / 60), capacity=app.config.get("LOGIN_IP_BURST", 20)
+        )
+        LoginGuard._email_limiter = TokenBucketLimiter(
+            rate=app.config.get("LOGIN_EMAIL_RATE", 5 / 60), capacity=app.config.get("LOGIN_EMAIL_BURST", 5)
+        )
+
+    @staticmethod
+    def admit(ip_address, email):
+        """
+        Applies the per-IP and per-email throttles, raises LoginRejected when either is exhausted.
+        ip_address must be the client's own address: behind a proxy set PROXY_FIX_HOPS, or every
+        user shares the proxy's bucket.
+        """
+        allowed, retry_after = LoginGuard._ip_limiter.consume(ip_address)
+        if allowed:
+            allowed, retry_after = LoginGuard._email_limiter.consume((email or "").strip().lower())
+        if not allowed:
+            raise LoginRejected("Too many login attempts", retry_after=max(1, round(retry_after)))
+
+    @staticmethod
+    def verify_password(user, password):
+        """Checks a user's password on the login pool and upgrades the hash if the work factor changed"""
+        if not LoginGuard._slots.acquire(blocking=False):
+            raise LoginRejected("Login service busy, try again shortly")
+
+        try:
+            future = LoginGuard._executor.submit(_verify_and_rehash, user.password_hash, password, LoginGuard._rounds)
+        except RuntimeError:
+            LoginGuard._slots.release()
+            raise
+        future.add_done_callback(lambda _: LoginGuard._slots.release())
+
+        try:
+            is_valid, new_hash = future.result(timeout=LoginGuard._timeout)
+        except TimeoutError:
+            raise LoginRejected("Login service busy, try again shortly")
+
+        if new_hash:
+            user.password_hash = new_hash
+            db.session.commit()
+        return is_valid
@@ -1,5 +1,17 @@
-from app.models import ManualMarks, PracticalMarks, ClassTestMarks, SLAMarks, Student, Subject
+import base64
+import binascii
+import json
+import math
+
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from sqlalchemy.orm import joinedload
+
+from app.models import ManualMarks, PracticalMarks, ClassTestMarks, SLAMarks, Student, Subject, StudentSubjectTotal
 from app.extensions import db
+from app.modules.year_cache import YearCache
+from app.modules.table_versions import TableVersions
+from app.modules.serializers import rows_to_columns
 
 
 class MarksModule:
@@ -7,29 +19,77 @@ class MarksModule:
     @staticmethod
     def _verify_year(student_id, subject_id):
         """Verify if student and subject belong to the same year."""
-        student = Student.query.get(student_id)
-        subject = Subject.query.get(subject_id)
+        student_year = YearCache.get_student_year(student_id)
+        subject_year = YearCache.get_subject_year(subject_id)
 
-        if not student or not subject:
+        if student_year is None or subject_year is None:
             return False, "Student or Subject not found."
 
-        if student.current_year != subject.year:
+        if student_year != subject_year:
             return False, "Student and Subject belong to different years."
 
         return True, None
 
+    # Helper function for queries whose results are serialized with nested student and subject
+    @staticmethod
+    def _with_relations(model):
+        """Query on a mark model that loads student and subject in the same SELECT."""
+        return model.query.options(joinedload(model.student), joinedload(model.subject))
+
+    # Helper function for INSERT ... ON CONFLICT DO UPDATE on a mark table's unique key
+    UPSERT_CHUNK_SIZE = 500
+
+    @staticmethod
+    def _upsert(model, rows, key_columns, value_columns):
+        """Insert rows, or update value_columns where a row with the same key_columns exists."""
+        dialect = db.session.get_bind().dialect.name
+        for start in range(0, len(rows), MarksModule.UPSERT_CHUNK_SIZE):
+            chunk = rows[start:start + MarksModule.UPSERT_CHUNK_SIZE]
+            if dialect in ("sqlite", "postgresql"):
+                dialect_insert = sqlite.insert if dialect == "sqlite" else postgresql.insert
+                stmt = dialect_insert(model).values(chunk)
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=list(key_columns),
+                    set_={column: stmt.excluded[column] for column in value_columns}
+                )
+            elif dialect in ("mysql", "mariadb"):
+                stmt = mysql.insert(model).values(chunk)
+                stmt = stmt.on_duplicate_key_update({column: stmt.inserted[column] for column in value_columns})
+            else:
+                # No native upsert: fall back to the ORM, one lookup per row
+                for row in chunk:
+                    existing = model.query.filter_by(**{column: row[column] for column in key_columns}).first()
+                    if existing:
+                        for column in value_columns:
+                            setattr(existing, column, row[column])
+                    else:
+                        db.session.add(model(**row))
+                continue
+            db.session.execute(stmt)
+
+    @staticmethod
+    def _upsert_one(model, values, key_columns):
+        """Upsert a single mark row and return it as an ORM object."""
+        value_columns = [column for column in values if column not in key_columns]
+        MarksModule._upsert(model, [values], key_columns, value_columns)
+        MarksModule._refresh_totals(values["subject_id"], [values["student_id"]])
+        TableVersions.bump("marks")
+        db.session.commit()
+        # populate_existing: the row may already sit in the identity map with its old values
+        return model.query.populate_existing().filter_by(**{column: values[column] for column in key_columns}).one()
+
     # -------------------- Manual Marks (Experiments) --------------------
     @staticmethod
     def assign_manual_mark(student_id, subject_id, experiment_number, marks_obtained):
-        """Assign manual (experiment) marks for a student with year verification."""
+        """Assign (or overwrite) manual (experiment) marks for a student with year verification."""
         is_valid, error_message = MarksModule._verify_year(student_id, subject_id)
         if not is_valid:
             return None, error_message
 
-        new_mark = ManualMarks(student_id=student_id, subject_id=subject_id,
-                               experiment_number=experiment_number, marks_obtained=marks_obtained)
-        db.session.add(new_mark)
-        db.session.commit()
+        new_mark = MarksModule._upsert_one(ManualMarks, {
+            "student_id": student_id, "subject_id": subject_id,
+            "experiment_number": experiment_number, "marks_obtained": marks_obtained
+        }, ("student_id", "subject_id", "experiment_number"))
         return new_mark, None
 
     @staticmethod
@@ -49,6 +109,8 @@ class MarksModule:
             return None, error_message
 
         mark.marks_obtained = marks_obtained
+        MarksModule._refresh_totals(mark.subject_id, [mark.student_id])
+        TableVersions.bump("marks")
         db.session.commit()
         return mark, None
 
@@ -58,6 +120,8 @@ class MarksModule:
         mark = ManualMarks.query.get(manual_marks_id)
         if mark:
             db.session.delete(mark)
+            MarksModule._refresh_totals(mark.subject_id, [mark.student_id])
+            TableVersions.bump("marks")
             db.session.commit()
             return True, None
         return False, "Manual mark not found."
@@ -65,21 +129,20 @@ class MarksModule:
     # -------------------- Practical Exam Marks --------------------
     @staticmethod
     def assign_practical_mark(student_id, subject_id, practical_exam_marks):
-        """Assign practical exam marks with year verification."""
+        """Assign or update practical exam marks with year verification."""
         is_valid, error_message = MarksModule._verify_year(student_id, subject_id)
         if not is_valid:
             return None, error_message
 
-        new_mark = PracticalMarks(student_id=student_id, subject_id=subject_id,
-                                  practical_exam_marks=practical_exam_marks)
-        db.session.add(new_mark)
-        db.session.commit()
+        new_mark = MarksModule._upsert_one(PracticalMarks, {
+            "student_id": student_id, "subject_id": subject_id, "practical_exam_marks": practical_exam_marks
+        }, ("student_id", "subject_id"))
         return new_mark, None
 
     @staticmethod
     def get_practical_marks(student_id, subject_id):
         """Fetch practical exam marks of a student."""
-        return PracticalMarks.query.filter_by(student_id=student_id, subject_id=subject_id).first()
+        return MarksModule._with_relations(PracticalMarks).filter_by(student_id=student_id, subject_id=subject_id).first()
 
     @staticmethod
     def update_practical_mark(practical_marks_id, practical_exam_marks):
@@ -93,6 +156,8 @@ class MarksModule:
             return None, error_message
 
         mark.practical_exam_marks = practical_exam_marks
+        MarksModule._refresh_totals(mark.subject_id, [mark.student_id])
+        TableVersions.bump("marks")
         db.session.commit()
         return mark, None
 
@@ -102,6 +167,8 @@ class MarksModule:
         mark = PracticalMarks.query.get(practical_marks_id)
         if mark:
             db.session.delete(mark)
+            MarksModule._refresh_totals(mark.subject_id, [mark.student_id])
+            TableVersions.bump("marks")
             db.session.commit()
             return True, None
         return False, "Practical mark not found."
@@ -114,31 +181,17 @@ class MarksModule:
         if not is_valid:
             return None, error_message
 
-        # Check if the student already has class test marks
-        existing_marks = ClassTestMarks.query.filter_by(student_id=student_id, subject_id=subject_id).first()
-
-        if existing_marks:
-            # ✅ Update existing record
-            existing_marks.class_test_1 = class_test_1
-            existing_marks.class_test_2 = class_test_2
-        else:
-            # ✅ Insert new record if it doesn't exist
-            existing_marks = ClassTestMarks(
-                student_id=student_id,
-                subject_id=subject_id,
-                class_test_1=class_test_1,
-                class_test_2=class_test_2
-            )
-            db.session.add(existing_marks)
-
-        db.session.commit()
-        return existing_marks, None
+        marks = MarksModule._upsert_one(ClassTestMarks, {
+            "student_id": student_id, "subject_id": subject_id,
+            "class_test_1": class_test_1, "class_test_2": class_test_2
+        }, ("student_id", "subject_id"))
+        return marks, None
 
 
     @staticmethod
     def get_class_test_marks(student_id, subject_id):
         """Fetch class test marks of a student."""
-        return ClassTestMarks.query.filter_by(student_id=student_id, subject_id=subject_id).first()
+        return MarksModule._with_relations(ClassTestMarks).filter_by(student_id=student_id, subject_id=subject_id).first()
 
     @staticmethod
     def update_class_test_marks(class_test_marks_id, class_test_1, class_test_2):
@@ -153,6 +206,8 @@ class MarksModule:
 
         marks.class_test_1 = class_test_1
         marks.class_test_2 = class_test_2
+        MarksModule._refresh_totals(marks.subject_id, [marks.student_id])
+        TableVersions.bump("marks")
         db.session.commit()
         return marks, None
 
@@ -162,6 +217,8 @@ class MarksModule:
         marks = ClassTestMarks.query.get(class_test_marks_id)
         if marks:
             db.session.delete(marks)
+            MarksModule._refresh_totals(marks.subject_id, [marks.student_id])
+            TableVersions.bump("marks")
             db.session.commit()
             return True, None
         return False, "Class test marks not found."
@@ -169,21 +226,21 @@ class MarksModule:
     # -------------------- SLA Activity Marks --------------------
     @staticmethod
     def assign_sla_marks(student_id, subject_id, micro_project, assignment, other_marks):
-        """Assign SLA marks (Micro Project, Assignment, Others) with year verification."""
+        """Assign or update SLA marks (Micro Project, Assignment, Others) with year verification."""
         is_valid, error_message = MarksModule._verify_year(student_id, subject_id)
         if not is_valid:
             return None, error_message
 
-        new_marks = SLAMarks(student_id=student_id, subject_id=subject_id,
-                             micro_project=micro_project, assignment=assignment, other_marks=other_marks)
-        db.session.add(new_marks)
-        db.session.commit()
+        new_marks = MarksModule._upsert_one(SLAMarks, {
+            "student_id": student_id, "subject_id": subject_id,
+            "micro_project": micro_project, "assignment": assignment, "other_marks": other_marks
+        }, ("student_id", "subject_id"))
         return new_marks, None
 
     @staticmethod
     def get_sla_marks(student_id, subject_id):
         """Fetch SLA marks of a student."""
-        return SLAMarks.query.filter_by(student_id=student_id, subject_id=subject_id).first()
+        return MarksModule._with_relations(SLAMarks).filter_by(student_id=student_id, subject_id=subject_id).first()
 
     @staticmethod
     def update_sla_marks(sla_marks_id, micro_project, assignment, other_marks):
@@ -198,6 +255,8 @@ class MarksModule:
         marks.micro_project = micro_project
         marks.assignment = assignment
         marks.other_marks = other_marks
+        MarksModule._refresh_totals(marks.subject_id, [marks.student_id])
+        TableVersions.bump("marks")
         db.session.commit()
         return marks, None
 
@@ -207,6 +266,327 @@ class MarksModule:
         marks = SLAMarks.query.get(sla_marks_id)
         if marks:
             db.session.delete(marks)
+            MarksModule._refresh_totals(marks.subject_id, [marks.student_id])
+            TableVersions.bump("marks")
             db.session.commit()
             return True, None
-        return False, "SLA marks not found."
\ No newline at end of file
+        return False, "SLA marks not found."
+
+    # -------------------- Gradebook --------------------
+    @staticmethod
+    def get_gradebook(subject):
+        """
+        All students of the subject's year with their manual, practical, class test and SLA marks
+        for that subject, in a columnar layout. Always five queries, whatever the class size.
+        """
+        year_students = select(Student.student_id).where(Student.current_year == subject.year)
+
+        def fetch(model, names):
+            rows = db.session.execute(
+                select(*[getattr(model, name) for name in names])
+                .where(model.subject_id == subject.subject_id, model.student_id.in_(year_students))
+                .order_by(model.student_id)
+            )
+            return rows_to_columns(rows, names)
+
+        student_columns = ("student_id", "enrollment_number", "exam_seat_number", "name")
+        students = db.session.execute(
+            select(*[getattr(Student, name) for name in student_columns])
+            .where(Student.current_year == subject.year)
+            .order_by(Student.student_id)
+        )
+
+        return {
+            "subject": subject.serialize(),
+            "students": rows_to_columns(students, student_columns),
+            "manual_marks": fetch(ManualMarks, ("student_id", "experiment_number", "marks_obtained")),
+            "practical_marks": fetch(PracticalMarks, ("student_id", "practical_exam_marks")),
+            "class_test_marks": fetch(ClassTestMarks, ("student_id", "class_test_1", "class_test_2")),
+            "sla_marks": fetch(SLAMarks, ("student_id", "micro_project", "assignment", "other_marks")),
+        }
+
+    # -------------------- Batch Upsert --------------------
+    # mark type → (model, natural key columns within a subject, value columns)
+    BATCH_TABLES = {
+        "manual_marks": (ManualMarks, ("student_id", "experiment_number"), ("marks_obtained",)),
+        "practical_marks": (PracticalMarks, ("student_id",), ("practical_exam_marks",)),
+        "class_test_marks": (ClassTestMarks, ("student_id",), ("class_test_1", "class_test_2")),
+        "sla_marks": (SLAMarks, ("student_id",), ("micro_project", "assignment", "other_marks")),
+    }
+
+    @staticmethod
+    def bulk_upsert_marks(subject_id, batch):
+        """
+        Insert or update a whole batch of marks for one subject in a single transaction.
+        `batch` maps a mark type ("manual_marks", "practical_marks", "class_test_marks", "sla_marks")
+        to a list of dicts holding student_id, the natural key and the mark values.
+        Year membership is verified once for every student in the batch, and rows are written
+        with native INSERT ... ON CONFLICT upserts.
+        """
+        subject = Subject.query.get(subject_id)
+        if not subject:
+            return None, "Subject not found."
+
+        if not isinstance(batch, dict):
+            return None, "Marks batch must be an object mapping mark types to lists of entries."
+
+        # Normalise entries per table, the last entry for a key wins
+        entries = {}
+        for mark_type, rows in batch.items():
+            if mark_type not in MarksModule.BATCH_TABLES:
+                return None, f"Unknown mark type: {mark_type}."
+            if rows is not None and not isinstance(rows, list):
+                return None, f"{mark_type} must be a list of entries."
+            _, key_columns, value_columns = MarksModule.BATCH_TABLES[mark_type]
+            keyed = {}
+            for row in rows or []:
+                try:
+                    key = tuple(int(row[column]) for column in key_columns)
+                    values = {column: float(row[column]) for column in value_columns}
+                except (KeyError, TypeError, ValueError):
+                    return None, f"Invalid {mark_type} entry: {row}."
+                if not all(math.isfinite(value) for value in values.values()):  # float() accepts "nan" and "inf"
+                    return None, f"Invalid {mark_type} entry: {row}."
+                keyed[key] = values
+            entries[mark_type] = keyed
+
+        student_ids = {key[0] for keyed in entries.values() for key in keyed}
+        if not student_ids:
+            return {"saved": 0}, None
+
+        valid_ids = {student_id for (student_id,) in db.session.query(Student.student_id).filter(
+            Student.student_id.in_(student_ids), Student.current_year == subject.year
+        )}
+        invalid_ids = student_ids - valid_ids
+        if invalid_ids:
+            return None, f"Students not found or not in year {subject.year}: {sorted(invalid_ids)}."
+
+        saved = 0
+        try:
+            for mark_type, keyed in entries.items():
+                model, key_columns, value_columns = MarksModule.BATCH_TABLES[mark_type]
+                rows = [{"subject_id": subject_id, **dict(zip(key_columns, key)), **values}
+                        for key, values in keyed.items()]
+                MarksModule._upsert(model, rows, ("subject_id",) + key_columns, value_columns)
+                saved += len(rows)
+            MarksModule._refresh_totals(subject_id, student_ids)
+            TableVersions.bump("marks")
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
+        return {"saved": saved}, None
+
+
+    # -------------------- Student/Subject Totals --------------------
+    TOTAL_COLUMNS = ("experiment_total", "practical_exam_marks", "class_test_average", "sla_total", "total")
+
+    @staticmethod
+    def _compute_totals(subject_id=None, student_ids=None):
+        """Aggregate the four mark tables into {(student_id, subject_id): totals}, optionally narrowed."""
+        def narrowed(stmt, model):
+            if subject_id is not None:
+                stmt = stmt.where(model.subject_id == subject_id)
+            if student_ids is not None:
+                stmt = stmt.where(model.student_id.in_(student_ids))
+            return stmt
+
+        totals = {}
+
+        def entry(student_id, subject):
+            return totals.setdefault((student_id, subject), dict.fromkeys(MarksModule.TOTAL_COLUMNS, 0.0))
+
+        manual = narrowed(select(ManualMarks.student_id, ManualMarks.subject_id,
+                                 func.coalesce(func.sum(ManualMarks.marks_obtained), 0))
+                          .group_by(ManualMarks.student_id, ManualMarks.subject_id), ManualMarks)
+        for student_id, subject, experiment_total in db.session.execute(manual):
+            entry(student_id, subject)["experiment_total"] = experiment_total
+
+        practical = narrowed(select(PracticalMarks.student_id, PracticalMarks.subject_id,
+                                    PracticalMarks.practical_exam_marks), PracticalMarks)
+        for student_id, subject, marks in db.session.execute(practical):
+            entry(student_id, subject)["practical_exam_marks"] = marks or 0
+
+        class_test = narrowed(select(ClassTestMarks.student_id, ClassTestMarks.subject_id,
+                                     ClassTestMarks.class_test_1, ClassTestMarks.class_test_2), ClassTestMarks)
+        for student_id, subject, test_1, test_2 in db.session.execute(class_test):
+            entry(student_id, subject)["class_test_average"] = ((test_1 or 0) + (test_2 or 0)) / 2
+
+        sla = narrowed(select(SLAMarks.student_id, SLAMarks.subject_id,
+                              SLAMarks.micro_project, SLAMarks.assignment, SLAMarks.other_marks), SLAMarks)
+        for student_id, subject, micro_project, assignment, other_marks in db.session.execute(sla):
+            entry(student_id, subject)["sla_total"] = (micro_project or 0) + (assignment or 0) + (other_marks or 0)
+
+        for values in totals.values():
+            values["total"] = (values["experiment_total"] + values["practical_exam_marks"]
+                               + values["class_test_average"] + values["sla_total"])
+        return totals
+
+    @staticmethod
+    def _refresh_totals(subject_id, student_ids):
+        """Recompute the totals rows of some students in one subject. Runs inside the caller's transaction."""
+        student_ids = set(student_ids)
+        totals = MarksModule._compute_totals(subject_id, student_ids)
+        rows = [{"student_id": student_id, "subject_id": subject, **values}
+                for (student_id, subject), values in totals.items()]
+        MarksModule._upsert(StudentSubjectTotal, rows, ("student_id", "subject_id"), MarksModule.TOTAL_COLUMNS)
+
+        # Students left without any marks in the subject lose their totals row
+        without_marks = student_ids - {student_id for student_id, _ in totals}
+        if without_marks:
+            StudentSubjectTotal.query.filter(
+                StudentSubjectTotal.subject_id == subject_id,
+                StudentSubjectTotal.student_id.in_(without_marks)
+            ).delete(synchronize_session=False)
+
+    @staticmethod
+    def get_subject_totals(subject_id):
+        """Totals of every student with marks in a subject, highest total first."""
+        return StudentSubjectTotal.query.filter_by(subject_id=subject_id).order_by(
+            StudentSubjectTotal.total.desc(), StudentSubjectTotal.student_id
+        ).all()
+
+    @staticmethod
+    def rebuild_totals():
+        """Recompute the whole totals table from the mark tables, returns the number of rows written."""
+        totals = MarksModule._compute_totals()
+        StudentSubjectTotal.query.delete(synchronize_session=False)
+        rows = [{"student_id": student_id, "subject_id": subject, **values}
+                for (student_id, subject), values in totals.items()]
+        MarksModule._upsert(StudentSubjectTotal, rows, ("student_id", "subject_id"), MarksModule.TOTAL_COLUMNS)
+        TableVersions.bump("marks")
+        db.session.commit()
+        return len(rows)
+
+    @staticmethod
+    def check_totals(tolerance=1e-6):
+        """Compare the totals table with a fresh aggregation, returns a list of mismatch descriptions."""
+        expected = MarksModule._compute_totals()
+        stored = {
+            (row.student_id, row.subject_id): {column: getattr(row, column) for column in MarksModule.TOTAL_COLUMNS}
+            for row in StudentSubjectTotal.query.all()
+        }
+
+        problems = []
+        for key in sorted(expected.keys() | stored.keys()):
+            if key not in stored:
+                problems.append(f"student {key[0]}, subject {key[1]}: missing totals row")
+            elif key not in expected:
+                problems.append(f"student {key[0]}, subject {key[1]}: totals row without marks")
+            else:
+                for column in MarksModule.TOTAL_COLUMNS:
+                    if abs(expected[key][column] - stored[key][column]) > tolerance:
+                        problems.append(f"student {key[0]}, subject {key[1]}: {column} is "
+                                        f"{stored[key][column]}, expected {expected[key][column]}")
+        return problems
+
+
+    # -------------------- Marks Listing (HOD) --------------------
+    DEFAULT_PAGE_SIZE = 50
+    MAX_PAGE_SIZE = 200
+
+    @staticmethod
+    def encode_cursor(student_id, subject_id):
+        """Opaque cursor token for the position after (student_id, subject_id)."""
+        return base64.urlsafe_b64encode(json.dumps([student_id, subject_id]).encode()).decode()
+
+    @staticmethod
+    def decode_cursor(cursor):
+        """Returns (student_id, subject_id) from a cursor token, or None if it is malformed."""
+        try:
+            student_id, subject_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            return int(student_id), int(subject_id)
+        except (binascii.Error, ValueError, TypeError, UnicodeDecodeError):
+            return None
+
+    @staticmethod
+    def get_all_marks(subject_id=None, year=None, student_id=None, cursor=None, limit=DEFAULT_PAGE_SIZE):
+        """
+        One page of consolidated marks, one item per (student, subject) pair with marks, ordered by
+        (student_id, subject_id). Pages are walked with keyset pagination over the totals table's
+        primary key, so each page costs the same four indexed queries however deep it is.
+        Returns ({"items": [...], "next_cursor": token or None}, error).
+        """
+        limit = max(1, min(int(limit or MarksModule.DEFAULT_PAGE_SIZE), MarksModule.MAX_PAGE_SIZE))
+
+        stmt = (
+            select(StudentSubjectTotal, Student.name, Student.enrollment_number, Subject.subject_name, Subject.year)
+            .join(Student, Student.student_id == StudentSubjectTotal.student_id)
+            .join(Subject, Subject.subject_id == StudentSubjectTotal.subject_id)
+        )
+        if subject_id is not None:
+            stmt = stmt.where(StudentSubjectTotal.subject_id == subject_id)
+        if student_id is not None:
+            stmt = stmt.where(StudentSubjectTotal.student_id == student_id)
+        if year is not None:
+            stmt = stmt.where(Subject.year == year)
+        if cursor:
+            position = MarksModule.decode_cursor(cursor)
+            if position is None:
+                return None, "Invalid cursor."
+            after_student, after_subject = position
+            stmt = stmt.where(or_(
+                StudentSubjectTotal.student_id > after_student,
+                and_(StudentSubjectTotal.student_id == after_student, StudentSubjectTotal.subject_id > after_subject)
+            ))
+        stmt = stmt.order_by(StudentSubjectTotal.student_id, StudentSubjectTotal.subject_id).limit(limit + 1)
+
+        rows = db.session.execute(stmt).all()
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        if not rows:
+            return {"items": [], "next_cursor": None}, None
+
+        # Component detail for the page's pairs only
+        pairs = {(row[0].student_id, row[0].subject_id) for row in rows}
+        page_students = {student for student, _ in pairs}
+        page_subjects = {subject for _, subject in pairs}
+
+        def page_rows(model, *columns):
+            return db.session.execute(
+                select(model.student_id, model.subject_id, *columns)
+                .where(model.student_id.in_(page_students), model.subject_id.in_(page_subjects))
+            )
+
+        experiments = {}
+        for student, subject, number, marks in page_rows(ManualMarks, ManualMarks.experiment_number,
+                                                         ManualMarks.marks_obtained):
+            experiments.setdefault((student, subject), []).append(
+                {"experiment_number": number, "marks_obtained": marks}
+            )
+        class_tests = {(student, subject): (test_1, test_2) for student, subject, test_1, test_2
+                       in page_rows(ClassTestMarks, ClassTestMarks.class_test_1, ClassTestMarks.class_test_2)}
+        slas = {(student, subject): rest for student, subject, *rest
+                in page_rows(SLAMarks, SLAMarks.micro_project, SLAMarks.assignment, SLAMarks.other_marks)}
+
+        items = []
+        for totals, name, enrollment_number, subject_name, subject_year in rows:
+            key = (totals.student_id, totals.subject_id)
+            test_1, test_2 = class_tests.get(key, (None, None))
+            micro_project, assignment, other_marks = slas.get(key, (None, None, None))
+            items.append({
+                "student": {"student_id": totals.student_id, "name": name, "enrollment_number": enrollment_number},
+                "subject": {"subject_id": totals.subject_id, "subject_name": subject_name, "year": subject_year},
+                "experiments": sorted(experiments.get(key, []), key=lambda e: e["experiment_number"]),
+                "experiment_total": totals.experiment_total,
+                "practical_exam_marks": totals.practical_exam_marks,
+                "class_test_1": test_1,
+                "class_test_2": test_2,
+                "class_test_average": totals.class_test_average,
+                "micro_project": micro_project,
+                "assignment": assignment,
+                "other_marks": other_marks,
+                "sla_total": totals.sla_total,
+                "total": totals.total,
+                "percentage": round(totals.total / StudentSubjectTotal.MAX_TOTAL * 100, 2),
+            })
+
+        last = rows[-1][0]
+        next_cursor = MarksModule.encode_cursor(last.student_id, last.subject_id) if has_more else None
+        return {"items": items, "next_cursor": next_cursor}, None
+
+    @staticmethod
+    def get_student_marks(student_id, cursor=None, limit=DEFAULT_PAGE_SIZE):
+        """One page of consolidated marks of a single student, see get_all_marks."""
+        return MarksModule.get_all_marks(student_id=student_id, cursor=cursor, limit=limit)
@@ -1,18 +1,52 @@
 from functools import wraps
-from flask import request, redirect, url_for, jsonify
+from flask import request, redirect, url_for, jsonify, g
+from sqlalchemy.orm import joinedload
+from app.extensions import db
+from app.models import Teacher
 from app.modules.session_manager import SessionManager
 from urllib.parse import quote
 
 
+def _load_teacher():
+    """Resolves the logged-in teacher with their subject in one joined query and caches it on flask.g"""
+    if "teacher" in g:
+        return g.teacher
+
+    session_id = request.cookies.get("session_id")
+    user_id = SessionManager.get_user_id_from_session_id(session_id, role="teacher") if session_id else None
+    teacher = None
+    if user_id:
+        teacher = db.session.query(Teacher).options(joinedload(Teacher.subject)).filter(
+            Teacher.teacher_id == user_id
+        ).first()
+
+    g.session_id = session_id
+    g.teacher = teacher
+    g.subject = teacher.subject if teacher else None
+    g.subject_id = g.subject.subject_id if g.subject else None
+    g.year = g.subject.year if g.subject else None
+    return teacher
+
+
+def _load_hod_id():
+    """Resolves the logged-in HOD id and caches it on flask.g"""
+    if "hod_id" in g:
+        return g.hod_id
+
+    session_id = request.cookies.get("session_id")
+    g.session_id = session_id
+    g.hod_id = SessionManager.get_user_id_from_session_id(session_id, role="hod") if session_id else None
+    return g.hod_id
+
+
 def teacher_login_required(func):
     """Middleware to check authentication via session."""
 
     @wraps(func)
     def decorated_function(*args, **kwargs):
-        session_id = request.cookies.get("session_id")
-        user_id = SessionManager.get_user_id_from_session_id(session_id, role="teacher") if session_id else None
+        teacher = _load_teacher()
 
-        if not user_id:
+        if not teacher:
             if request.method == "GET":
                 redirect_url = request.path
                 return redirect(url_for('frontend.teacher_login', redirect=redirect_url))
@@ -28,8 +62,7 @@ def hod_login_required(func):
 
     @wraps(func)
     def decorated_function(*args, **kwargs):
-        session_id = request.cookies.get("session_id")
-        user_id = SessionManager.get_user_id_from_session_id(session_id, role="hod") if session_id else None
+        user_id = _load_hod_id()
 
         if not user_id:
             if request.method == "GET":
@@ -0,0 +1,108 @@
+import os
+import threading
+from datetime import datetime
+
+from fpdf import FPDF
+
+
+class ReportPDF(FPDF):
+    """
+    Landscape report document shared by every PDF report: logo and title header, page number
+    footer, section titles and tables that continue on new pages (repeating the section title
+    and column headers) whenever the next row would not fit above the bottom margin.
+    """
+
+    HEADER_ROW_HEIGHT = 10
+    ROW_HEIGHT = 8
+    BOTTOM_MARGIN = 15
+
+    COLORS = {
+        "header_bg": (41, 128, 185),  # Blue
+        "header_text": (255, 255, 255),  # White
+        "subheader_bg": (52, 152, 219),  # Light Blue
+    }
+
+    _images = {}  # path → parsed image (None when missing), shared by every document of the process
+    _images_lock = threading.Lock()
+
+    def __init__(self, title, logo_path=None, colors=None):
+        super().__init__(orientation='L')
+        self.set_auto_page_break(auto=True, margin=self.BOTTOM_MARGIN)
+        self.report_title = title
+        self.generated_on = datetime.now().strftime("%Y-%m-%d %H:%M")
+        self.colors = colors or self.COLORS
+        self.current_section = None
+        self.logo_path = logo_path if logo_path and self._load_image(logo_path) else None
+
+    def _load_image(self, path):
+        """Registers the parsed image with this document, parsing the file only on first use in the process"""
+        if path not in ReportPDF._images:
+            with ReportPDF._images_lock:
+                if path not in ReportPDF._images:
+                    info = None
+                    if os.path.exists(path):
+                        info = self._parsepng(path) if path.lower().endswith(".png") else self._parsejpg(path)
+                    ReportPDF._images[path] = info
+        info = ReportPDF._images[path]
+        if info is not None and path not in self.images:
+            # Per-document copy: FPDF numbers the image and drops its data when writing the file
+            self.images[path] = dict(info, i=len(self.images) + 1)
+        return info is not None
+
+    def header(self):
+        if self.logo_path:
+            self.image(self.logo_path, 10, 8, 25)
+        self.set_font('Arial', 'B', 16)
+        self.cell(0, 10, self.report_title, 0, 1, 'C')
+        self.set_font('Arial', 'I', 10)
+        self.cell(0, 10, f'Generated on: {self.generated_on}', 0, 1, 'C')
+        self.ln(5)
+
+    def footer(self):
+        self.set_y(-15)
+        self.set_font('Arial', 'I', 8)
+        self.cell(0, 10, f'Page {self.page_no()}', 0, 0, 'C')
+
+    def section_title(self, title):
+        """Full-width section heading; tables repeat it on every page they continue on"""
+        self.current_section = title
+        self.set_font('Arial', 'B', 12)
+        self.set_fill_color(*self.colors["header_bg"])
+        self.set_text_color(*self.colors["header_text"])
+        self.cell(0, 10, title, 1, 1, 'C', True)
+        self.ln(2)
+
+    def _fits(self, height):
+        return self.get_y() + height <= self.page_break_trigger
+
+    def _table_header(self, headers, col_widths):
+        self.set_font('Arial', 'B', 10)
+        self.set_fill_color(*self.colors["subheader_bg"])
+        self.set_text_color(*self.colors["header_text"])
+        for width, header in zip(col_widths, headers):
+            self.cell(width, self.HEADER_ROW_HEIGHT, str(header), 1, 0, 'C', True)
+        self.ln()
+        self.set_font('Arial', '', 9)
+        self.set_text_color(0, 0, 0)
+
+    def _continue_on_new_page(self, headers, col_widths):
+        self.add_page()
+        if self.current_section:
+            self.section_title(self.current_section)
+        self._table_header(headers, col_widths)
+
+    def table(self, headers, rows, col_widths):
+        """Draws rows (any iterable) below the column headers, starting a new page whenever the next row would not fit"""
+        if not self._fits(self.HEADER_ROW_HEIGHT + self.ROW_HEIGHT):
+            self._continue_on_new_page(headers, col_widths)  # don't leave the headers alone at the bottom
+        else:
+            self._table_header(headers, col_widths)
+
+        for row in rows:
+            if not self._fits(self.ROW_HEIGHT):
+                self._continue_on_new_page(headers, col_widths)
+            for width, value in zip(col_widths, row):
+                self.cell(width, self.ROW_HEIGHT, str(value), 1, 0, 'C')
+            self.ln()
+
+        self.ln(5)
@@ -0,0 +1,187 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+class MemoryCacheBackend:
+    """Per-process LRU cache with a TTL (default). Other worker processes see writes after at most one TTL."""
+
+    def __init__(self, max_size=256, ttl=600):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()  # (namespace, key) → (value, cached_at)
+        self._lock = threading.Lock()
+
+    def get(self, namespace, key):
+        """Returns (found, value)"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get((namespace, key))
+            if entry is None:
+                return False, None
+            if now - entry[1] >= self.ttl:
+                del self._entries[(namespace, key)]
+                return False, None
+            self._entries.move_to_end((namespace, key))
+            return True, entry[0]
+
+    def set(self, namespace, key, value):
+        with self._lock:
+            self._entries[(namespace, key)] = (value, time.monotonic())
+            self._entries.move_to_end((namespace, key))
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, namespace):
+        """Drops every entry of a namespace"""
+        with self._lock:
+            for entry_key in [entry_key for entry_key in self._entries if entry_key[0] == namespace]:
+                del self._entries[entry_key]
+
+    def size(self):
+        return len(self._entries)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class SQLiteCacheBackend:
+    """
+    Cache shared by every worker process on a host, kept in a SQLite file.
+    Values are stored as JSON, so only plain data (dicts, lists, scalars) can be cached.
+    """
+
+    def __init__(self, path, max_size=256, ttl=600):
+        self.path = path
+        self.max_size = max_size
+        self.ttl = ttl
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        conn = self._connection()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS ref_cache (
+                namespace TEXT NOT NULL,
+                key TEXT NOT NULL,
+                value TEXT NOT NULL,
+                cached_at REAL NOT NULL,
+                PRIMARY KEY (namespace, key)
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS ix_ref_cache_cached_at ON ref_cache (cached_at)")
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, namespace, key):
+        """Returns (found, value)"""
+        row = self._connection().execute(
+            "SELECT value FROM ref_cache WHERE namespace = ? AND key = ? AND cached_at > ?",
+            (namespace, str(key), time.time() - self.ttl)
+        ).fetchone()
+        return (True, json.loads(row[0])) if row else (False, None)
+
+    def set(self, namespace, key, value):
+        conn = self._connection()
+        conn.execute(
+            "INSERT OR REPLACE INTO ref_cache (namespace, key, value, cached_at) VALUES (?, ?, ?, ?)",
+            (namespace, str(key), json.dumps(value), time.time())
+        )
+        # Size bound: drop the oldest entries past max_size
+        conn.execute(
+            "DELETE FROM ref_cache WHERE rowid IN (SELECT rowid FROM ref_cache ORDER BY cached_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_size,)
+        )
+
+    def invalidate(self, namespace):
+        """Drops every entry of a namespace"""
+        self._connection().execute("DELETE FROM ref_cache WHERE namespace = ?", (namespace,))
+
+    def size(self):
+        return self._connection().execute("SELECT COUNT(*) FROM ref_cache").fetchone()[0]
+
+    def clear(self):
+        self._connection().execute("DELETE FROM ref_cache")
+
+
+class RefCache:
+    """
+    Cache for slow-changing reference data (subjects, teacher list) read on nearly every page
+    and by report generation. Entries are plain data grouped in namespaces; the owning module
+    drops its namespace from its write methods. The backend is pluggable: "memory", "sqlite",
+    or any object with get/set/invalidate/size/clear.
+    """
+
+    _backend = MemoryCacheBackend()  # replaced by init_app() with the configured backend
+    _counters = {}  # namespace → {"hits": n, "misses": n}
+    _generations = {}  # namespace → invalidation count, guards against caching a load that raced a write
+    _counters_lock = threading.Lock()
+
+    @staticmethod
+    def init_app(app):
+        """Selects the cache backend and bounds from the app config"""
+        backend = app.config.get("REF_CACHE_BACKEND", "memory")
+        max_size = app.config.get("REF_CACHE_SIZE", 256)
+        ttl = app.config.get("REF_CACHE_TTL", 600)
+        if backend == "memory":
+            RefCache._backend = MemoryCacheBackend(max_size, ttl)
+        elif backend == "sqlite":
+            path = app.config.get("REF_CACHE_PATH") or os.path.join(app.instance_path, "ref_cache.db")
+            RefCache._backend = SQLiteCacheBackend(path, max_size, ttl)
+        elif isinstance(backend, str):
+            raise ValueError(f"Unsupported reference cache backend: {backend}")
+        else:
+            RefCache._backend = backend
+        with RefCache._counters_lock:
+            RefCache._counters.clear()
+
+    @staticmethod
+    def _count(namespace, counter):
+        with RefCache._counters_lock:
+            RefCache._counters.setdefault(namespace, {"hits": 0, "misses": 0})[counter] += 1
+
+    @staticmethod
+    def get_or_load(namespace, key, loader):
+        """Returns the cached value for (namespace, key), calling loader() and caching its result on a miss.
+        The value may be shared with other callers, so treat it as read-only."""
+        found, value = RefCache._backend.get(namespace, key)
+        if found:
+            RefCache._count(namespace, "hits")
+            return value
+        RefCache._count(namespace, "misses")
+        generation = RefCache._generations.get(namespace, 0)
+        value = loader()
+        if RefCache._generations.get(namespace, 0) == generation:
+            RefCache._backend.set(namespace, key, value)
+        return value
+
+    @staticmethod
+    def invalidate(*namespaces):
+        """Drops every entry of the given namespaces; call after the write has been committed"""
+        for namespace in namespaces:
+            with RefCache._counters_lock:
+                RefCache._generations[namespace] = RefCache._generations.get(namespace, 0) + 1
+            RefCache._backend.invalidate(namespace)
+
+    @staticmethod
+    def stats():
+        """Hit/miss counters per namespace for this process, plus the backend entry count"""
+        with RefCache._counters_lock:
+            namespaces = {namespace: dict(counters) for namespace, counters in RefCache._counters.items()}
+        for counters in namespaces.values():
+            lookups = counters["hits"] + counters["misses"]
+            counters["hit_ratio"] = round(counters["hits"] / lookups, 4) if lookups else None
+        return {"entries": RefCache._backend.size(), "namespaces": namespaces}
+
+    @staticmethod
+    def clear():
+        RefCache._backend.clear()
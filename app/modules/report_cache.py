@@ -0,0 +1,129 @@
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+from app.modules.table_versions import TableVersions
+
+
+class ReportCache:
+    """
+    Content-addressed cache of generated report files under REPORTS_DIR/cache.
+    An entry is a directory named after a digest of the report parameters and the version
+    counters of the tables the report reads, holding the report under its download name.
+    Entries are published with an atomic directory rename, so readers never see a partial
+    file, and the least recently used ones are removed once the cache exceeds its size cap.
+    The key also holds the current TTL period, so an entry missed by a counter bump (a write
+    made outside the app) is served for at most one TTL.
+    """
+
+    TABLES = ("students", "subjects", "marks")  # tables every report reads
+    GRACE_PERIOD = 60  # seconds an entry is kept after its last use, so it isn't deleted while being sent
+    STALE_TMP_AGE = 3600  # seconds after which an abandoned temp directory is removed
+
+    _root = None
+    _enabled = True
+    _max_bytes = 200 * 1024 * 1024
+    _ttl = 60 * 60
+    _evict_lock = threading.Lock()
+
+    @staticmethod
+    def init_app(app, reports_dir):
+        """Reads the cache location, size cap and TTL from the app config"""
+        ReportCache._enabled = app.config.get("REPORT_CACHE_ENABLED", True)
+        ReportCache._max_bytes = app.config.get("REPORT_CACHE_MAX_BYTES", ReportCache._max_bytes)
+        ReportCache._ttl = app.config.get("REPORT_CACHE_TTL", ReportCache._ttl)
+        ReportCache._root = os.path.join(reports_dir, "cache")
+
+    @staticmethod
+    def key(*params):
+        """Digest of the report parameters, the current data version of the report tables and the TTL period"""
+        if ReportCache._ttl:
+            params += (f"ttl:{int(time.time() // ReportCache._ttl)}",)
+        etag, _ = TableVersions.etag(ReportCache.TABLES, *params)
+        return etag
+
+    @staticmethod
+    def _entry_file(entry_dir):
+        names = [name for name in os.listdir(entry_dir) if not name.startswith(".")]
+        return os.path.join(entry_dir, names[0]) if names else None
+
+    @staticmethod
+    def get_or_create(params, generate):
+        """
+        Returns the path of the cached report for params, calling generate(directory) on a miss.
+        generate writes the report into the directory it is given and returns its path, or None
+        when there is nothing to report (then nothing is cached).
+        """
+        if not ReportCache._enabled or ReportCache._root is None:
+            return generate(None)
+
+        entry_dir = os.path.join(ReportCache._root, ReportCache.key(*params))
+        try:
+            path = ReportCache._entry_file(entry_dir)
+            if path:
+                os.utime(entry_dir)  # LRU: mark as recently used
+                return path
+        except FileNotFoundError:
+            pass  # not cached yet, or evicted concurrently
+
+        os.makedirs(ReportCache._root, exist_ok=True)
+        staging_dir = tempfile.mkdtemp(prefix=".tmp-", dir=ReportCache._root)
+        try:
+            path = generate(staging_dir)
+            if not path:
+                return None
+            try:
+                os.rename(staging_dir, entry_dir)  # atomic publish
+            except OSError:
+                if not os.path.isdir(entry_dir):
+                    raise
+                # A concurrent request published the same report first; serve that one
+            path = ReportCache._entry_file(entry_dir)
+        finally:
+            shutil.rmtree(staging_dir, ignore_errors=True)
+
+        ReportCache.evict()
+        return path
+
+    @staticmethod
+    def evict():
+        """
+        Removes entries unused for longer than the TTL, then least recently used ones until the cache
+        fits its size cap; returns how many were removed
+        """
+        if ReportCache._root is None or not os.path.isdir(ReportCache._root):
+            return 0
+        if not ReportCache._evict_lock.acquire(blocking=False):
+            return 0  # another thread is already evicting
+
+        try:
+            now = time.time()
+            entries = []
+            total = 0
+            for name in os.listdir(ReportCache._root):
+                entry_dir = os.path.join(ReportCache._root, name)
+                try:
+                    used_at = os.stat(entry_dir).st_mtime
+                    if name.startswith(".tmp-"):
+                        if now - used_at > ReportCache.STALE_TMP_AGE:
+                            shutil.rmtree(entry_dir, ignore_errors=True)
+                        continue
+                    size = sum(entry.stat().st_size for entry in os.scandir(entry_dir))
+                except FileNotFoundError:
+                    continue  # removed concurrently
+                entries.append((used_at, size, entry_dir))
+                total += size
+
+            removed = 0
+            for used_at, size, entry_dir in sorted(entries):
+                expired = ReportCache._ttl and now - used_at > max(ReportCache._ttl, ReportCache.GRACE_PERIOD)
+                if not expired and (total <= ReportCache._max_bytes or now - used_at < ReportCache.GRACE_PERIOD):
+                    break
+                shutil.rmtree(entry_dir, ignore_errors=True)
+                total -= size
+                removed += 1
+            return removed
+        finally:
+            ReportCache._evict_lock.release()
@@ -0,0 +1,200 @@
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import delete, func, select, update
+
+from app.extensions import db
+from app.models import ReportJob, Student
+from app.modules.reporting_module import ReportingModule
+
+
+class ReportQueueFull(Exception):
+    """Raised when too many report jobs are already waiting"""
+
+    def __init__(self, message, retry_after=5):
+        super().__init__(message)
+        self.message = message
+        self.retry_after = retry_after
+
+
+class ReportJobs:
+    """
+    Runs report generation in the background: a request submits a job and gets its id back
+    at once, then polls the status and downloads the file when it is done. Jobs live in the
+    report_jobs table, so queued ones are picked up again after a restart, and a job that
+    is already queued or running for the same report is reused instead of queued twice.
+    """
+
+    REPORT_TYPES = ("students", "student", "cards")  # cards: ZIP of every student's report in a year
+    FORMATS = ("excel", "pdf")
+    PROGRESS_INTERVAL = 1  # seconds between progress writes of a bulk job
+
+    _app = None
+    _executor = None
+    _workers = 2
+    _queue_depth = 20
+    _stale_after = 1800
+    _submit_lock = threading.Lock()  # makes the in-flight lookup and insert atomic within a process
+    _resumed = False
+    _resume_lock = threading.Lock()
+
+    @staticmethod
+    def init_app(app):
+        """
+        Sizes the worker pool from the app config. Jobs left over by the previous run are resumed
+        on the first request, so CLI commands (which build the app too) never pick up jobs.
+        """
+        ReportJobs._app = app
+        ReportJobs._workers = app.config.get("REPORT_JOB_WORKERS", 2)
+        ReportJobs._queue_depth = app.config.get("REPORT_JOB_QUEUE_DEPTH", 20)
+        ReportJobs._stale_after = app.config.get("REPORT_JOB_STALE_AFTER", 1800)
+        retention = app.config.get("REPORT_JOB_RETENTION", 7 * 24 * 60 * 60)
+
+        @app.before_request
+        def _resume_report_jobs():
+            if ReportJobs._resumed:
+                return
+            with ReportJobs._resume_lock:
+                if not ReportJobs._resumed:
+                    ReportJobs._resumed = True
+                    ReportJobs._resume(retention)
+
+    @staticmethod
+    def _pool():
+        if ReportJobs._executor is None:
+            ReportJobs._executor = ThreadPoolExecutor(max_workers=ReportJobs._workers, thread_name_prefix="report")
+        return ReportJobs._executor
+
+    @staticmethod
+    def _resume(retention):
+        """Drops old finished jobs, re-queues jobs whose worker died and restarts every queued job"""
+        now = time.time()
+        db.session.execute(
+            delete(ReportJob).where(ReportJob.status.in_(("done", "failed")), ReportJob.finished_at < now - retention)
+        )
+        db.session.execute(
+            update(ReportJob)
+            .where(ReportJob.status == "running", ReportJob.started_at < now - ReportJobs._stale_after)
+            .values(status="queued", started_at=None)
+        )
+        db.session.commit()
+
+        queued = db.session.scalars(
+            select(ReportJob.job_id).where(ReportJob.status == "queued").order_by(ReportJob.created_at)
+        ).all()
+        for job_id in queued:
+            ReportJobs._pool().submit(ReportJobs._run, job_id)
+        if queued:
+            ReportJobs._app.logger.info("Resumed %d queued report job(s)", len(queued))
+
+    @staticmethod
+    def _in_flight(dedupe_key):
+        """Returns the queued or (recently started) running job for dedupe_key, if any"""
+        return db.session.scalars(
+            select(ReportJob).where(
+                ReportJob.dedupe_key == dedupe_key,
+                (ReportJob.status == "queued")
+                | ((ReportJob.status == "running") & (ReportJob.started_at >= time.time() - ReportJobs._stale_after))
+            ).limit(1)
+        ).first()
+
+    @staticmethod
+    def submit(report_type, file_format="excel", year=None, student_id=None):
+        """
+        Queues a report job, returns (job, error). An identical job still in flight is returned
+        instead of a new one. Raises ReportQueueFull when REPORT_JOB_QUEUE_DEPTH jobs are waiting.
+        """
+        if report_type not in ReportJobs.REPORT_TYPES:
+            return None, f"Invalid report type. Use one of: {', '.join(ReportJobs.REPORT_TYPES)}."
+        if file_format not in ReportJobs.FORMATS:
+            return None, "Invalid format. Use 'excel' or 'pdf'."
+        if report_type == "student":
+            try:
+                student_id = int(student_id)
+            except (TypeError, ValueError):
+                return None, "Student not found"
+            if not db.session.get(Student, student_id):
+                return None, "Student not found"
+            year = None
+        else:
+            student_id = None
+
+        dedupe_key = f"{report_type}:{year or 'all'}:{student_id or '-'}:{file_format}"
+        with ReportJobs._submit_lock:
+            job = ReportJobs._in_flight(dedupe_key)
+            if job:
+                return job, None
+
+            waiting = db.session.scalar(select(func.count()).select_from(ReportJob).where(ReportJob.status == "queued"))
+            if waiting >= ReportJobs._queue_depth:
+                raise ReportQueueFull("Too many reports are being generated, try again shortly")
+
+            job = ReportJob(
+                job_id=uuid.uuid4().hex, report_type=report_type, file_format=file_format, year=year,
+                student_id=student_id, dedupe_key=dedupe_key, status="queued", progress=0, created_at=time.time()
+            )
+            db.session.add(job)
+            db.session.commit()
+
+        ReportJobs._pool().submit(ReportJobs._run, job.job_id)
+        return job, None
+
+    @staticmethod
+    def get(job_id):
+        """Returns the job or None"""
+        return db.session.get(ReportJob, job_id)
+
+    @staticmethod
+    def _generate(job):
+        if job.report_type == "students":
+            return ReportingModule.generate_student_report(job.file_format, year=job.year)
+        if job.report_type == "cards":
+            return ReportingModule.generate_report_cards(job.file_format, year=job.year,
+                                                         progress=ReportJobs._progress_recorder(job.job_id))
+        return ReportingModule.generate_single_student_report(job.student_id, job.file_format)
+
+    @staticmethod
+    def _progress_recorder(job_id):
+        """progress(done, total) callback saving the count on the job, at most every PROGRESS_INTERVAL seconds"""
+        last_write = [0.0]
+
+        def progress(done, total):
+            now = time.monotonic()
+            if done < total and now - last_write[0] < ReportJobs.PROGRESS_INTERVAL:
+                return
+            last_write[0] = now
+            db.session.execute(update(ReportJob).where(ReportJob.job_id == job_id).values(progress=done, total=total))
+            db.session.commit()
+
+        return progress
+
+    @staticmethod
+    def _run(job_id):
+        """Worker: claims the job (another process may have resumed it too), generates the report and records the result"""
+        app = ReportJobs._app
+        with app.app_context():
+            claimed = db.session.execute(
+                update(ReportJob)
+                .where(ReportJob.job_id == job_id, ReportJob.status == "queued")
+                .values(status="running", started_at=time.time())
+            ).rowcount
+            db.session.commit()
+            if not claimed:
+                return
+
+            job = db.session.get(ReportJob, job_id)
+            try:
+                file_path = ReportJobs._generate(job)
+                error = None if file_path else "Student not found or report generation failed"
+            except Exception as e:
+                db.session.rollback()
+                app.logger.exception("Report job %s failed", job_id)
+                file_path, error = None, str(e)[:500] or type(e).__name__
+
+            job.status = "done" if file_path else "failed"
+            job.file_path = file_path
+            job.error = error
+            job.finished_at = time.time()
+            db.session.commit()
@@ -1,11 +1,21 @@
 import os
 import pandas as pd
-from fpdf import FPDF
 from datetime import datetime
 import matplotlib.pyplot as plt
 import numpy as np
 from io import BytesIO
 import statistics
+import multiprocessing
+import tempfile
+import uuid
+import zipfile
+import xlsxwriter
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, as_completed, wait
+from sqlalchemy import select
+from app.extensions import db
+from app.modules.subject_module import SubjectModule
+from app.modules.report_cache import ReportCache
+from app.modules.pdf_report import ReportPDF
 
 class ReportingModule:
     """
@@ -17,6 +27,8 @@ class ReportingModule:
     BASE_DIR = os.path.dirname(os.path.abspath(__file__))
     REPORTS_DIR = os.path.join(BASE_DIR, "..", "reports")
     LOGO_PATH = os.path.join(BASE_DIR, "..", "static", "img", "logo.png")
+    SPOOL_MAX_SIZE = 8 * 1024 * 1024  # bytes a streamed workbook is kept in memory before spilling to disk
+    XLSX_MIMETYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
 
     COLORS = {
         "header_bg": (41, 128, 185),  # Blue
@@ -27,42 +39,219 @@ class ReportingModule:
     }
 
     @staticmethod
-    def generate_student_report(file_format="excel", year=None):
-        """Generate a comprehensive report for all students of a specific year and their marks."""
-        from app.models import Student, Subject, ManualMarks, PracticalMarks, ClassTestMarks, SLAMarks
+    def init_app(app):
+        """Sets up the generated report cache and the report card pool size"""
+        ReportCache.init_app(app, ReportingModule.REPORTS_DIR)
+        ReportingModule.REPORT_CARD_WORKERS = app.config.get("REPORT_CARD_WORKERS", 0)
+        ReportingModule.REPORT_CARDS_PER_WORKER = app.config.get("REPORT_CARDS_PER_WORKER", 100)
 
-        if year is None:
-            students = Student.query.all()  # Fallback to all students if no year is specified
-        else:
-            students = Student.query.filter_by(current_year=year).all()
+    @staticmethod
+    def generate_student_report(file_format="excel", year=None, stream=False):
+        """Generate a comprehensive report for all students of a specific year and their marks.
+        Unchanged data is served from the report cache; stream=True (Excel only) bypasses it
+        and returns (buffer, filename) instead of a file path."""
+        from app.models import Student
 
-        if file_format == "excel":
-            return ReportingModule._generate_excel_report(students)
-        elif file_format == "pdf":
-            return ReportingModule._generate_pdf_report(students)
-        else:
+        if file_format not in ("excel", "pdf"):
             raise ValueError(f"Unsupported file format: {file_format}")
 
+        def load_students():
+            if year is None:
+                return Student.query.all()  # Fallback to all students if no year is specified
+            return Student.query.filter_by(current_year=year).all()
+
+        if stream and file_format == "excel":
+            return ReportingModule._generate_excel_report(load_students(), stream=True, year=year)
+
+        def generate(directory):
+            if file_format == "excel":
+                return ReportingModule._generate_excel_report(load_students(), directory=directory, year=year)
+            return ReportingModule._generate_pdf_report(load_students(), directory=directory, year=year)
+
+        return ReportCache.get_or_create(("students", year or "all", file_format), generate)
+
     @staticmethod
-    def generate_single_student_report(student_id, file_format="excel"):
-        """Generate a detailed report for a specific student."""
-        from app.models import Student, Subject, ManualMarks, PracticalMarks, ClassTestMarks, SLAMarks
+    def generate_single_student_report(student_id, file_format="excel", stream=False):
+        """Generate a detailed report for a specific student (cached like generate_student_report).
+        stream=True (Excel only) returns (buffer, filename) instead of a file path."""
+        from app.models import Student
+
+        if file_format not in ("excel", "pdf"):
+            raise ValueError(f"Unsupported file format: {file_format}")
 
         student = Student.query.get(student_id)
         if not student:
             return None  # Student not found
 
+        if stream and file_format == "excel":
+            return ReportingModule._generate_excel_report([student], is_single_student=True, stream=True)
+
+        def generate(directory):
+            if file_format == "excel":
+                return ReportingModule._generate_excel_report([student], is_single_student=True, directory=directory)
+            return ReportingModule._generate_pdf_report([student], is_single_student=True, directory=directory)
+
+        return ReportCache.get_or_create(("student", student_id, file_format), generate)
+
+    @staticmethod
+    def generate_report_cards(file_format="pdf", year=None, workers=None, progress=None):
+        """
+        Single student reports for every student of a year (all students if year is None), bundled
+        in one ZIP. The year's data is collected once, the per-student files are rendered on a pool
+        of `workers` processes (default REPORT_CARD_WORKERS, at most one per student; 1 renders in this
+        process) and written into the ZIP as they finish.
+        progress(done, total) is called after each student. Returns the ZIP path, cached like the other reports.
+        """
+        from app.models import Student
+
+        if file_format not in ("excel", "pdf"):
+            raise ValueError(f"Unsupported file format: {file_format}")
+
+        def generate(directory):
+            query = Student.query if year is None else Student.query.filter_by(current_year=year)
+            students = query.order_by(Student.student_id).all()
+            if not students:
+                return None
+            return ReportingModule._generate_report_cards(students, file_format, year, workers, progress, directory)
+
+        return ReportCache.get_or_create(("cards", year or "all", file_format), generate)
+
+    REPORT_CARD_WORKERS = 0  # processes rendering report cards; 0 means one per CPU (set from config by init_app)
+    REPORT_CARDS_PER_WORKER = 100  # students per process when the pool is sized automatically (set from config by init_app)
+
+    @staticmethod
+    def _split_student_data(all_data):
+        """Per-student slices of collected data, each shaped like _collect_student_data([student]) without the index"""
+        per_student = {}
+        for student in all_data["student_info"]:
+            per_student[student["student_id"]] = {
+                "student_info": [dict(student, sr_no=1)],
+                "manual_marks": [], "practical_marks": [], "class_test_marks": [], "sla_marks": []
+            }
+        for name in ("manual_marks", "practical_marks", "class_test_marks", "sla_marks"):
+            for mark in all_data[name]:
+                per_student[mark["student_id"]][name].append(mark)
+        for data in per_student.values():
+            data["totals"] = {}
+        for (student_id, subject_id), totals in all_data.get("totals", {}).items():
+            if student_id in per_student:
+                per_student[student_id]["totals"][(student_id, subject_id)] = totals
+        return per_student
+
+    @staticmethod
+    def _render_report_card(data, subjects, file_format):
+        """Renders one student's report in memory, returns (filename, bytes). Runs in the report card pool."""
+        data["index"] = ReportingModule._build_indexes(data)
+        student_id = data["student_info"][0]["student_id"]
+        extension = "xlsx" if file_format == "excel" else "pdf"
+        filename = f"student_{student_id}_report_{datetime.now().strftime('%Y%m%d')}.{extension}"
+
         if file_format == "excel":
-            return ReportingModule._generate_excel_report([student], is_single_student=True)
-        elif file_format == "pdf":
-            return ReportingModule._generate_pdf_report([student], is_single_student=True)
+            output = BytesIO()
+            workbook = xlsxwriter.Workbook(output, {"in_memory": True})
+            ReportingModule._write_excel_sheets(workbook, data, subjects)
+            workbook.close()
+            return filename, output.getvalue()
+        return filename, ReportingModule._build_pdf(data, subjects).output(dest="S").encode("latin-1")
+
+    @staticmethod
+    def _generate_report_cards(students, file_format, year=None, workers=None, progress=None, directory=None):
+        """Renders the report cards of students across a process pool and streams them into a ZIP."""
+        all_data = ReportingModule._collect_student_data(students, with_totals=True)
+        subjects_by_year = {current_year: SubjectModule.list_subjects(year=current_year)
+                            for current_year in {student.current_year for student in students}}
+        per_student = ReportingModule._split_student_data(all_data)
+        tasks = [(per_student[student.student_id], subjects_by_year[student.current_year], file_format)
+                 for student in students]
+
+        filename = f"report_cards_{ReportingModule._year_label(year)}_{file_format}_{datetime.now().strftime('%Y%m%d')}.zip"
+        directory = directory or ReportingModule.REPORTS_DIR
+        os.makedirs(directory, exist_ok=True)
+        file_path = os.path.join(directory, filename)
+        temp_path = ReportingModule._temp_path(file_path)
+
+        workers = workers or ReportingModule.REPORT_CARD_WORKERS
+        if not workers:
+            # Sized automatically: one process per CPU and per REPORT_CARDS_PER_WORKER students, whichever
+            # is fewer; fewer students per process than that don't pay for starting the process
+            workers = min(os.cpu_count() or 1, len(tasks) // max(ReportingModule.REPORT_CARDS_PER_WORKER, 1))
+        workers = max(1, min(workers, len(tasks)))
+        # .xlsx files are zip containers already, deflating them again gains nothing
+        compression = zipfile.ZIP_STORED if file_format == "excel" else zipfile.ZIP_DEFLATED
+        done = 0
+        try:
+            with zipfile.ZipFile(temp_path, "w", compression) as bundle:
+                for member, content in ReportingModule._render_all(tasks, workers):
+                    bundle.writestr(member, content)
+                    done += 1
+                    if progress:
+                        progress(done, len(tasks))
+        except Exception:
+            ReportingModule._discard(temp_path)
+            raise
+        return ReportingModule._publish(temp_path, file_path)
+
+    @staticmethod
+    def _render_all(tasks, workers):
+        """Yields _render_report_card results as they complete, keeping at most a few tasks per worker in flight"""
+        if workers <= 1:
+            for task in tasks:
+                yield ReportingModule._render_report_card(*task)
+            return
+
+        # spawn: forking a threaded web server process can deadlock the children on inherited locks
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+            pending = set()
+            for task in tasks:
+                pending.add(executor.submit(ReportingModule._render_report_card, *task))
+                if len(pending) >= workers * 4:
+                    finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        yield future.result()
+            for future in as_completed(pending):
+                yield future.result()
+
+    IN_CHUNK_SIZE = 500  # ids per "student_id IN (...)" query, below every backend's bound-parameter limit
+
+    @staticmethod
+    def _fetch_marks(columns, student_ids):
+        """Rows of one mark table for the given students, one query per IN_CHUNK_SIZE ids."""
+        student_id_column = columns[1]
+        rows = []
+        for start in range(0, len(student_ids), ReportingModule.IN_CHUNK_SIZE):
+            chunk = student_ids[start:start + ReportingModule.IN_CHUNK_SIZE]
+            rows.extend(db.session.execute(
+                select(*columns).where(student_id_column.in_(chunk)).order_by(columns[0])
+            ).all())
+        return rows
+
+    @staticmethod
+    def _fetch_totals(student_ids=None, subject_id=None):
+        """
+        (experiment total, practical, class test average, SLA total) per (student_id, subject_id), read
+        from student_subject_totals for the given students (one query per IN_CHUNK_SIZE ids) or one subject.
+        """
+        from app.models import StudentSubjectTotal
+
+        query = select(StudentSubjectTotal.student_id, StudentSubjectTotal.subject_id,
+                       StudentSubjectTotal.experiment_total, StudentSubjectTotal.practical_exam_marks,
+                       StudentSubjectTotal.class_test_average, StudentSubjectTotal.sla_total)
+        if subject_id is not None:
+            rows = db.session.execute(query.where(StudentSubjectTotal.subject_id == subject_id)).all()
         else:
-            raise ValueError(f"Unsupported file format: {file_format}")
+            rows = []
+            for start in range(0, len(student_ids), ReportingModule.IN_CHUNK_SIZE):
+                chunk = student_ids[start:start + ReportingModule.IN_CHUNK_SIZE]
+                rows.extend(db.session.execute(query.where(StudentSubjectTotal.student_id.in_(chunk))).all())
+        return {(row[0], row[1]): tuple(row[2:]) for row in rows}
 
     @staticmethod
-    def _collect_student_data(students):
-        """Collect all marks data for given students."""
-        from app.models import Subject, ManualMarks, PracticalMarks, ClassTestMarks, SLAMarks
+    def _collect_student_data(students, with_totals=False):
+        """
+        Collect all marks data for given students with one bulk query per mark table.
+        with_totals adds their per-subject totals (for the consolidated sheets) as all_data["totals"].
+        """
+        from app.models import ManualMarks, PracticalMarks, ClassTestMarks, SLAMarks
 
         all_data = {
             "student_info": [],
@@ -72,6 +261,29 @@ class ReportingModule:
             "sla_marks": []
         }
 
+        student_ids = [student.student_id for student in students]
+        if with_totals:
+            all_data["totals"] = ReportingModule._fetch_totals(student_ids)
+        subjects_by_year = {year: SubjectModule.list_subjects(year=year)
+                            for year in {student.current_year for student in students}}
+
+        # Group every mark table by (student_id, subject_id); the unique mark indexes allow one
+        # practical/class test/SLA row per key, manual rows keep primary key order
+        manual_by_key = {}
+        for row in ReportingModule._fetch_marks((ManualMarks.manual_marks_id, ManualMarks.student_id, ManualMarks.subject_id,
+                                                 ManualMarks.experiment_number, ManualMarks.marks_obtained), student_ids):
+            manual_by_key.setdefault((row.student_id, row.subject_id), []).append(row)
+
+        practical_by_key = {(row.student_id, row.subject_id): row for row in ReportingModule._fetch_marks(
+            (PracticalMarks.practical_marks_id, PracticalMarks.student_id, PracticalMarks.subject_id,
+             PracticalMarks.practical_exam_marks), student_ids)}
+        class_test_by_key = {(row.student_id, row.subject_id): row for row in ReportingModule._fetch_marks(
+            (ClassTestMarks.class_test_marks_id, ClassTestMarks.student_id, ClassTestMarks.subject_id,
+             ClassTestMarks.class_test_1, ClassTestMarks.class_test_2), student_ids)}
+        sla_by_key = {(row.student_id, row.subject_id): row for row in ReportingModule._fetch_marks(
+            (SLAMarks.sla_marks_id, SLAMarks.student_id, SLAMarks.subject_id, SLAMarks.micro_project,
+             SLAMarks.assignment, SLAMarks.other_marks), student_ids)}
+
         for idx, student in enumerate(students, start=1):
             student_info = {
                 "sr_no": idx,
@@ -83,60 +295,47 @@ class ReportingModule:
             }
             all_data["student_info"].append(student_info)
 
-            subjects = Subject.query.filter_by(year=student.current_year).all()
+            for subject in subjects_by_year[student.current_year]:
+                key = (student.student_id, subject["subject_id"])
 
-            for subject in subjects:
-                manual_marks = ManualMarks.query.filter_by(
-                    student_id=student.student_id,
-                    subject_id=subject.subject_id
-                ).all()
-
-                for mark in manual_marks:
-                    mark_data = mark.serialize()
-                    mark_data["student_name"] = student.name
-                    mark_data["subject_id"] = subject.subject_id
-                    all_data["manual_marks"].append(mark_data)
-
-                practical_mark = PracticalMarks.query.filter_by(
-                    student_id=student.student_id,
-                    subject_id=subject.subject_id
-                ).first()
+                for mark in manual_by_key.get(key, ()):
+                    all_data["manual_marks"].append({
+                        "manual_marks_id": mark.manual_marks_id,
+                        "student_id": student.student_id,
+                        "subject_id": subject["subject_id"],
+                        "experiment_number": mark.experiment_number,
+                        "marks_obtained": mark.marks_obtained,
+                        "student_name": student.name
+                    })
 
+                practical_mark = practical_by_key.get(key)
                 if practical_mark:
                     mark_data = {
                         "student_id": student.student_id,
                         "student_name": student.name,
-                        "subject_id": subject.subject_id,
+                        "subject_id": subject["subject_id"],
                         "practical_exam_marks": practical_mark.practical_exam_marks
                     }
                     all_data["practical_marks"].append(mark_data)
 
-                class_test = ClassTestMarks.query.filter_by(
-                    student_id=student.student_id,
-                    subject_id=subject.subject_id
-                ).first()
-
+                class_test = class_test_by_key.get(key)
                 if class_test:
                     mark_data = {
                         "student_id": student.student_id,
                         "student_name": student.name,
-                        "subject_id": subject.subject_id,
+                        "subject_id": subject["subject_id"],
                         "class_test_1": class_test.class_test_1,
                         "class_test_2": class_test.class_test_2,
-                        "average": class_test.calculate_average()
+                        "average": (class_test.class_test_1 + class_test.class_test_2) / 2
                     }
                     all_data["class_test_marks"].append(mark_data)
 
-                sla_mark = SLAMarks.query.filter_by(
-                    student_id=student.student_id,
-                    subject_id=subject.subject_id
-                ).first()
-
+                sla_mark = sla_by_key.get(key)
                 if sla_mark:
                     mark_data = {
                         "student_id": student.student_id,
                         "student_name": student.name,
-                        "subject_id": subject.subject_id,
+                        "subject_id": subject["subject_id"],
                         "micro_project": sla_mark.micro_project,
                         "assignment": sla_mark.assignment,
                         "other_marks": sla_mark.other_marks,
@@ -144,25 +343,111 @@ class ReportingModule:
                     }
                     all_data["sla_marks"].append(mark_data)
 
+        all_data["index"] = ReportingModule._build_indexes(all_data)
         return all_data
 
     @staticmethod
-    def _generate_excel_report(students, is_single_student=False):
-        """Generate a comprehensive Excel report with multiple worksheets."""
-        from app.models import Subject
+    def _build_indexes(all_data):
+        """
+        Dict indexes over the collected marks so the render loops do O(1) lookups:
+        keyed by (student_id, subject_id[, experiment_number]), plus per-student views
+        (first mark per student, as the year-wide sheets show one row per student).
+        """
+        index = {
+            "manual": {}, "practical": {}, "class_test": {}, "sla": {},
+            "student_manual": {}, "student_manual_count": {},
+            "student_practical": {}, "student_class_test": {}, "student_sla": {}
+        }
+
+        for mark in all_data["manual_marks"]:
+            student_id, subject_id = mark["student_id"], mark["subject_id"]
+            index["manual"][(student_id, subject_id, mark["experiment_number"])] = mark
+            index["student_manual"].setdefault(student_id, {}).setdefault(mark["experiment_number"], mark["marks_obtained"])
+            index["student_manual_count"][student_id] = index["student_manual_count"].get(student_id, 0) + 1
+
+        for name in ("practical", "class_test", "sla"):
+            for mark in all_data[f"{name}_marks"]:
+                index[name][(mark["student_id"], mark["subject_id"])] = mark
+                index[f"student_{name}"].setdefault(mark["student_id"], mark)
+
+        return index
+
+    @staticmethod
+    def _subject_marks(totals, student_id, subject_id):
+        """(experiment total, practical, class test average, SLA total) of a student in a subject, 0 when missing."""
+        return totals.get((student_id, subject_id), (0, 0, 0, 0))
+
+    @staticmethod
+    def _year_label(year):
+        return "all" if year is None else f"year{year}"
+
+    @staticmethod
+    def _temp_path(file_path):
+        """Unique sibling path a report is written to before being published under file_path"""
+        directory, filename = os.path.split(file_path)
+        return os.path.join(directory, f".tmp-{uuid.uuid4().hex}-{filename}")
+
+    @staticmethod
+    def _publish(temp_path, file_path):
+        """Atomically moves a finished report into place; readers see the old file or the new one, never a partial one"""
+        os.replace(temp_path, file_path)
+        return file_path
+
+    @staticmethod
+    def _discard(temp_path):
+        """Removes the temp file of a report whose rendering failed"""
+        try:
+            os.remove(temp_path)
+        except FileNotFoundError:
+            pass
+
+    @staticmethod
+    def _generate_excel_report(students, is_single_student=False, stream=False, directory=None, year=None):
+        """
+        Generate a comprehensive Excel report with multiple worksheets into directory (default REPORTS_DIR).
+        With stream=True the workbook is rendered in xlsxwriter's constant_memory mode into a
+        spooled buffer and (buffer, filename) is returned instead of a path in REPORTS_DIR.
+        """
 
         if is_single_student and students:
             filename = f"student_{students[0].student_id}_report_{datetime.now().strftime('%Y%m%d')}.xlsx"
         else:
-            filename = f"students_report_{datetime.now().strftime('%Y%m%d')}.xlsx"
+            filename = f"students_{ReportingModule._year_label(year)}_report_{datetime.now().strftime('%Y%m%d')}.xlsx"
 
-        all_data = ReportingModule._collect_student_data(students)
+        all_data = ReportingModule._collect_student_data(students, with_totals=is_single_student)
+        subjects = None
+        if is_single_student and students:
+            subjects = SubjectModule.list_subjects(year=students[0].current_year)
 
-        os.makedirs(ReportingModule.REPORTS_DIR, exist_ok=True)
-        file_path = os.path.join(ReportingModule.REPORTS_DIR, filename)
-        writer = pd.ExcelWriter(file_path, engine='xlsxwriter')
-        workbook = writer.book
+        if stream:
+            # constant_memory flushes each finished row to a private temp file of this worker;
+            # the zipped workbook stays in memory up to SPOOL_MAX_SIZE
+            output = tempfile.SpooledTemporaryFile(max_size=ReportingModule.SPOOL_MAX_SIZE)
+            workbook = xlsxwriter.Workbook(output, {"constant_memory": True})
+        else:
+            directory = directory or ReportingModule.REPORTS_DIR
+            os.makedirs(directory, exist_ok=True)
+            file_path = os.path.join(directory, filename)
+            temp_path = ReportingModule._temp_path(file_path)
+            workbook = xlsxwriter.Workbook(temp_path)
+
+        try:
+            ReportingModule._write_excel_sheets(workbook, all_data, subjects)
+            workbook.close()
+        except Exception:
+            if stream:
+                output.close()
+            else:
+                ReportingModule._discard(temp_path)
+            raise
+        if stream:
+            output.seek(0)
+            return output, filename
+        return ReportingModule._publish(temp_path, file_path)
 
+    @staticmethod
+    def _write_excel_sheets(workbook, all_data, subjects=None):
+        """Writes the marks worksheets of collected data; subjects (single student reports) adds the consolidated sheet."""
         header_format = workbook.add_format({'bold': True, 'font_color': 'white', 'bg_color': '#2980b9', 'border': 1, 'align': 'center', 'valign': 'vcenter'})
         subheader_format = workbook.add_format({'bold': True, 'bg_color': '#3498db', 'border': 1, 'align': 'center'})
         cell_format = workbook.add_format({'border': 1, 'align': 'center', 'valign': 'vcenter'})
@@ -178,7 +463,8 @@ class ReportingModule:
                 worksheet.write(1, col, header, subheader_format)
                 col += 1
 
-            max_experiments = max([len([m for m in all_data["manual_marks"] if m["student_id"] == s["student_id"]]) for s in all_data["student_info"]], default=0)
+            index = all_data["index"]
+            max_experiments = max([index["student_manual_count"].get(s["student_id"], 0) for s in all_data["student_info"]], default=0)
             for i in range(max_experiments):
                 worksheet.write(1, col + i, f'Exp {i + 1}', subheader_format)
             worksheet.write(1, col + max_experiments, 'Total', highlight_format)
@@ -191,9 +477,9 @@ class ReportingModule:
                 worksheet.write(row_num, 3, student["name"], cell_format)
 
                 total = 0
-                student_marks = [m for m in all_data["manual_marks"] if m["student_id"] == student["student_id"]]
+                student_marks = index["student_manual"].get(student["student_id"], {})
                 for i in range(max_experiments):
-                    mark = next((m["marks_obtained"] for m in student_marks if m["experiment_number"] == i + 1), 0)
+                    mark = student_marks.get(i + 1, 0)
                     worksheet.write(row_num, 4 + i, mark, cell_format)
                     total += mark
                 worksheet.write(row_num, 4 + max_experiments, total, highlight_format)
@@ -215,7 +501,8 @@ class ReportingModule:
 
             row_num = 2
             for student in all_data["student_info"]:
-                mark = next((m["practical_exam_marks"] for m in all_data["practical_marks"] if m["student_id"] == student["student_id"]), 0)
+                practical = all_data["index"]["student_practical"].get(student["student_id"])
+                mark = practical["practical_exam_marks"] if practical else 0
                 worksheet.write(row_num, 0, student["sr_no"], cell_format)
                 worksheet.write(row_num, 1, student["enrollment_number"], cell_format)
                 worksheet.write(row_num, 2, student["exam_seat_number"], cell_format)
@@ -239,7 +526,7 @@ class ReportingModule:
 
             row_num = 2
             for student in all_data["student_info"]:
-                mark = next((m for m in all_data["class_test_marks"] if m["student_id"] == student["student_id"]), None)
+                mark = all_data["index"]["student_class_test"].get(student["student_id"])
                 worksheet.write(row_num, 0, student["sr_no"], cell_format)
                 worksheet.write(row_num, 1, student["enrollment_number"], cell_format)
                 worksheet.write(row_num, 2, student["exam_seat_number"], cell_format)
@@ -265,7 +552,7 @@ class ReportingModule:
 
             row_num = 2
             for student in all_data["student_info"]:
-                mark = next((m for m in all_data["sla_marks"] if m["student_id"] == student["student_id"]), None)
+                mark = all_data["index"]["student_sla"].get(student["student_id"])
                 worksheet.write(row_num, 0, student["sr_no"], cell_format)
                 worksheet.write(row_num, 1, student["enrollment_number"], cell_format)
                 worksheet.write(row_num, 2, student["exam_seat_number"], cell_format)
@@ -282,9 +569,9 @@ class ReportingModule:
             worksheet.set_column(3, 3, 20)
             worksheet.set_column(4, 7, 12)
 
-        if is_single_student and students:
-            student = students[0]
-            subjects = Subject.query.filter_by(year=student.current_year).all()
+        if subjects is not None:
+            student = all_data["student_info"][0]
+            totals = all_data["totals"]
             worksheet = workbook.add_worksheet('Consolidated Marks')
             worksheet.merge_range('A1:G1', 'CONSOLIDATED MARKS REPORT', header_format)
 
@@ -294,10 +581,7 @@ class ReportingModule:
 
             row_num = 3
             for idx, subject in enumerate(subjects, start=1):
-                exp_total = sum(m["marks_obtained"] for m in all_data["manual_marks"] if m["subject_id"] == subject.subject_id)
-                practical = next((m["practical_exam_marks"] for m in all_data["practical_marks"] if m["subject_id"] == subject.subject_id), 0)
-                class_test = next((m["average"] for m in all_data["class_test_marks"] if m["subject_id"] == subject.subject_id), 0)
-                sla = next((m["total_sla"] for m in all_data["sla_marks"] if m["subject_id"] == subject.subject_id), 0)
+                exp_total, practical, class_test, sla = ReportingModule._subject_marks(totals, student["student_id"], subject["subject_id"])
                 total = exp_total + practical + class_test + sla
                 percentage = (total / 400) * 100
 
@@ -319,83 +603,45 @@ class ReportingModule:
             worksheet.set_column(3, 3, 20)
             worksheet.set_column(4, 9, 12)
 
-        writer.close()
-        return file_path
-
     @staticmethod
-    def _generate_pdf_report(students, is_single_student=False):
-        """Generate a comprehensive PDF report with proper formatting."""
-        from app.models import Subject
+    def _generate_pdf_report(students, is_single_student=False, directory=None, year=None):
+        """Generate a comprehensive PDF report with proper formatting into directory (default REPORTS_DIR)."""
 
         if is_single_student and students:
             filename = f"student_{students[0].student_id}_report_{datetime.now().strftime('%Y%m%d')}.pdf"
         else:
-            filename = f"students_report_{datetime.now().strftime('%Y%m%d')}.pdf"
-
-        all_data = ReportingModule._collect_student_data(students)
-
-        class PDF(FPDF):
-            def __init__(self):
-                super().__init__(orientation='L')
-                self.set_auto_page_break(auto=True, margin=15)
-
-            def header(self):
-                if os.path.exists(ReportingModule.LOGO_PATH):
-                    self.image(ReportingModule.LOGO_PATH, 10, 8, 25)
-                self.set_font('Arial', 'B', 16)
-                self.cell(0, 10, 'ACADEMIC PERFORMANCE REPORT', 0, 1, 'C')
-                self.set_font('Arial', 'I', 10)
-                self.cell(0, 10, f'Generated on: {datetime.now().strftime("%Y-%m-%d %H:%M")}', 0, 1, 'C')
-                self.ln(5)
-
-            def footer(self):
-                self.set_y(-15)
-                self.set_font('Arial', 'I', 8)
-                self.cell(0, 10, f'Page {self.page_no()}', 0, 0, 'C')
-
-            def section_title(self, title):
-                self.set_font('Arial', 'B', 12)
-                self.set_fill_color(*ReportingModule.COLORS["header_bg"])
-                self.set_text_color(*ReportingModule.COLORS["header_text"])
-                self.cell(0, 10, title, 1, 1, 'C', True)
-                self.ln(2)
-
-            def create_table(self, headers, data, col_widths, max_rows_per_page=20):
-                self.set_font('Arial', 'B', 10)
-                self.set_fill_color(*ReportingModule.COLORS["subheader_bg"])
-                self.set_text_color(*ReportingModule.COLORS["header_text"])
-
-                for i, header in enumerate(headers):
-                    self.cell(col_widths[i], 10, str(header), 1, 0, 'C', True)
-                self.ln()
-
-                self.set_font('Arial', '', 9)
-                self.set_text_color(0, 0, 0)
-
-                row_count = 0
-                for row in data:
-                    if row_count >= max_rows_per_page:
-                        self.add_page()
-                        self.section_title(self.current_section)
-                        self.create_table(headers, data[row_count:], col_widths, max_rows_per_page)
-                        break
-                    for i, value in enumerate(row):
-                        self.cell(col_widths[i], 8, str(value), 1, 0, 'C')
-                    self.ln()
-                    row_count += 1
-
-                self.ln(5)
-
-        pdf = PDF()
+            filename = f"students_{ReportingModule._year_label(year)}_report_{datetime.now().strftime('%Y%m%d')}.pdf"
+
+        all_data = ReportingModule._collect_student_data(students, with_totals=is_single_student)
+        subjects = None
+        if is_single_student and students:
+            subjects = SubjectModule.list_subjects(year=students[0].current_year)
+        pdf = ReportingModule._build_pdf(all_data, subjects)
+
+        directory = directory or ReportingModule.REPORTS_DIR
+        os.makedirs(directory, exist_ok=True)
+        file_path = os.path.join(directory, filename)
+        temp_path = ReportingModule._temp_path(file_path)
+        try:
+            pdf.output(temp_path)
+        except Exception:
+            ReportingModule._discard(temp_path)
+            raise
+        return ReportingModule._publish(temp_path, file_path)
+
+    @staticmethod
+    def _build_pdf(all_data, subjects=None):
+        """Lays out the PDF report of collected data; subjects (single student reports) adds the consolidated pages."""
+        pdf = ReportPDF('ACADEMIC PERFORMANCE REPORT', ReportingModule.LOGO_PATH, ReportingModule.COLORS)
         pdf.add_page()
 
         if all_data["manual_marks"]:
             pdf.section_title("EXPERIMENT MARKS")
-            pdf.current_section = "EXPERIMENT MARKS"
 
             headers = ['Sr', 'Enrollment No', 'Exam Seat', 'Name']
             col_widths = [10, 20, 20, 30]
-            max_experiments = max([len([m for m in all_data["manual_marks"] if m["student_id"] == s["student_id"]]) for s in all_data["student_info"]], default=0)
+            index = all_data["index"]
+            max_experiments = max([index["student_manual_count"].get(s["student_id"], 0) for s in all_data["student_info"]], default=0)
 
             for i in range(max_experiments):
                 headers.append(f'E{i + 1}')
@@ -407,69 +653,63 @@ class ReportingModule:
             for student in all_data["student_info"]:
                 row = [student["sr_no"], student["enrollment_number"], student["exam_seat_number"], student["name"]]
                 total = 0
-                student_marks = [m for m in all_data["manual_marks"] if m["student_id"] == student["student_id"]]
+                student_marks = index["student_manual"].get(student["student_id"], {})
                 for i in range(max_experiments):
-                    mark = next((m["marks_obtained"] for m in student_marks if m["experiment_number"] == i + 1), 0)
+                    mark = student_marks.get(i + 1, 0)
                     row.append(mark)
                     total += mark
                 row.append(total)
                 data.append(row)
 
-            pdf.create_table(headers, data, col_widths)
+            pdf.table(headers, data, col_widths)
 
         if all_data["practical_marks"]:
             pdf.section_title("PRACTICAL EXAMINATION MARKS")
-            pdf.current_section = "PRACTICAL EXAMINATION MARKS"
 
             headers = ['Sr. No.', 'Enrollment No.', 'Exam Seat No.', 'Name', 'Marks']
             col_widths = [20, 40, 40, 50, 40]
-            data = [[s["sr_no"], s["enrollment_number"], s["exam_seat_number"], s["name"], next((m["practical_exam_marks"] for m in all_data["practical_marks"] if m["student_id"] == s["student_id"]), 0)] for s in all_data["student_info"]]
+            practical = all_data["index"]["student_practical"]
+            data = [[s["sr_no"], s["enrollment_number"], s["exam_seat_number"], s["name"], m["practical_exam_marks"] if m else 0] for s in all_data["student_info"] for m in [practical.get(s["student_id"])]]
 
-            pdf.create_table(headers, data, col_widths)
+            pdf.table(headers, data, col_widths)
 
         if all_data["class_test_marks"]:
             pdf.section_title("CLASS TEST MARKS")
-            pdf.current_section = "CLASS TEST MARKS"
 
             headers = ['Sr. No.', 'Enrollment No.', 'Exam Seat No.', 'Name', 'Test 1', 'Test 2', 'Average']
             col_widths = [20, 40, 40, 50, 30, 30, 30]
-            data = [[s["sr_no"], s["enrollment_number"], s["exam_seat_number"], s["name"], m["class_test_1"] if m else 0, m["class_test_2"] if m else 0, m["average"] if m else 0] for s in all_data["student_info"] for m in [next((m for m in all_data["class_test_marks"] if m["student_id"] == s["student_id"]), None)]]
+            data = [[s["sr_no"], s["enrollment_number"], s["exam_seat_number"], s["name"], m["class_test_1"] if m else 0, m["class_test_2"] if m else 0, m["average"] if m else 0] for s in all_data["student_info"] for m in [all_data["index"]["student_class_test"].get(s["student_id"])]]
 
-            pdf.create_table(headers, data, col_widths)
+            pdf.table(headers, data, col_widths)
 
         if all_data["sla_marks"]:
             pdf.section_title("SLA ACTIVITY MARKS")
-            pdf.current_section = "SLA ACTIVITY MARKS"
 
             headers = ['Sr. No.', 'Enrollment No.', 'Exam Seat No.', 'Name', 'Micro Project', 'Assignment', 'Other', 'Total']
             col_widths = [20, 40, 40, 50, 30, 30, 30, 30]
-            data = [[s["sr_no"], s["enrollment_number"], s["exam_seat_number"], s["name"], m["micro_project"] if m else 0, m["assignment"] if m else 0, m["other_marks"] if m else 0, m["total_sla"] if m else 0] for s in all_data["student_info"] for m in [next((m for m in all_data["sla_marks"] if m["student_id"] == s["student_id"]), None)]]
+            data = [[s["sr_no"], s["enrollment_number"], s["exam_seat_number"], s["name"], m["micro_project"] if m else 0, m["assignment"] if m else 0, m["other_marks"] if m else 0, m["total_sla"] if m else 0] for s in all_data["student_info"] for m in [all_data["index"]["student_sla"].get(s["student_id"])]]
 
-            pdf.create_table(headers, data, col_widths)
+            pdf.table(headers, data, col_widths)
 
-        if is_single_student and students:
-            student = students[0]
-            subjects = Subject.query.filter_by(year=student.current_year).all()
+        if subjects is not None:
+            student = all_data["student_info"][0]
+            totals = all_data["totals"]
 
             pdf.add_page()
-            pdf.section_title(f"CONSOLIDATED MARKS - {student.name}")
-            pdf.current_section = f"CONSOLIDATED MARKS - {student.name}"
+            pdf.section_title(f"CONSOLIDATED MARKS - {student['name']}")
 
             headers = ['Sr. No.', 'Enrollment No.', 'Exam Seat No.', 'Name', 'Experiments', 'Practical', 'Class Test Avg', 'SLA', 'Total', 'Percentage']
             col_widths = [20, 40, 40, 50, 30, 30, 30, 30, 30, 30]
             data = []
 
             for subject in subjects:
-                exp_total = sum(m["marks_obtained"] for m in all_data["manual_marks"] if m["subject_id"] == subject.subject_id)
-                practical = next((m["practical_exam_marks"] for m in all_data["practical_marks"] if m["subject_id"] == subject.subject_id), 0)
-                class_test = next((m["average"] for m in all_data["class_test_marks"] if m["subject_id"] == subject.subject_id), 0)
-                sla = next((m["total_sla"] for m in all_data["sla_marks"] if m["subject_id"] == subject.subject_id), 0)
+                exp_total, practical, class_test, sla = ReportingModule._subject_marks(totals, student["student_id"], subject["subject_id"])
                 total = exp_total + practical + class_test + sla
                 percentage = (total / 400) * 100
 
                 data.append([student["sr_no"], student["enrollment_number"], student["exam_seat_number"], student["name"], exp_total, practical, f"{class_test:.2f}", sla, total, f"{percentage:.2f}%"])
 
-            pdf.create_table(headers, data, col_widths)
+            pdf.table(headers, data, col_widths)
 
             total_marks = sum(d[-2] for d in data)
             avg_percentage = (total_marks / (len(subjects) * 400)) * 100 if subjects else 0
@@ -479,7 +719,7 @@ class ReportingModule:
             pdf.section_title("PERFORMANCE SUMMARY")
 
             pdf.set_font('Arial', 'B', 12)
-            pdf.cell(0, 10, f"Student: {student.name} (ID: {student.student_id})", 0, 1)
+            pdf.cell(0, 10, f"Student: {student['name']} (ID: {student['student_id']})", 0, 1)
             pdf.ln(5)
 
             pdf.set_fill_color(*ReportingModule.COLORS["section_bg"])
@@ -500,10 +740,7 @@ class ReportingModule:
             pdf.set_font('Arial', '', 12)
             pdf.cell(100, 10, grade, 0, 1)
 
-        os.makedirs(ReportingModule.REPORTS_DIR, exist_ok=True)
-        file_path = os.path.join(ReportingModule.REPORTS_DIR, filename)
-        pdf.output(file_path)
-        return file_path
+        return pdf
 
     @staticmethod
     def generate_subject_report(subject_id, file_format="excel"):
@@ -528,133 +765,81 @@ class ReportingModule:
         """Generate an Excel report focused on a specific subject."""
         from app.models import ManualMarks, PracticalMarks, ClassTestMarks, SLAMarks
 
-        filename = f"subject_{subject.subject_id}_report_{datetime.now().strftime('%Y%m%d')}.xlsx"
+        filename = f"subject_{subject.subject_id}_year{subject.year}_report_{datetime.now().strftime('%Y%m%d')}.xlsx"
         os.makedirs(ReportingModule.REPORTS_DIR, exist_ok=True)
         file_path = os.path.join(ReportingModule.REPORTS_DIR, filename)
-        writer = pd.ExcelWriter(file_path, engine='xlsxwriter')
-        workbook = writer.book
+        temp_path = ReportingModule._temp_path(file_path)
+        try:
+            writer = pd.ExcelWriter(temp_path, engine='xlsxwriter')
+            workbook = writer.book
 
-        header_format = workbook.add_format({'bold': True, 'font_color': 'white', 'bg_color': '#2980b9', 'border': 1, 'align': 'center', 'valign': 'vcenter'})
-        subheader_format = workbook.add_format({'bold': True, 'bg_color': '#3498db', 'border': 1, 'align': 'center'})
-        cell_format = workbook.add_format({'border': 1, 'align': 'center', 'valign': 'vcenter'})
-        highlight_format = workbook.add_format({'bold': True, 'bg_color': '#2ecc71', 'border': 1, 'align': 'center'})
+            header_format = workbook.add_format({'bold': True, 'font_color': 'white', 'bg_color': '#2980b9', 'border': 1, 'align': 'center', 'valign': 'vcenter'})
+            subheader_format = workbook.add_format({'bold': True, 'bg_color': '#3498db', 'border': 1, 'align': 'center'})
+            cell_format = workbook.add_format({'border': 1, 'align': 'center', 'valign': 'vcenter'})
+            highlight_format = workbook.add_format({'bold': True, 'bg_color': '#2ecc71', 'border': 1, 'align': 'center'})
 
-        worksheet = workbook.add_worksheet('Overview')
-        worksheet.merge_range('A1:I1', 'COMPREHENSIVE REPORT', header_format)
+            worksheet = workbook.add_worksheet('Overview')
+            worksheet.merge_range('A1:I1', 'COMPREHENSIVE REPORT', header_format)
 
-        headers = ['Sr. No.', 'Enrollment No.', 'Exam Seat No.', 'Name', 'Exp. Marks', 'Practical', 'Class Test Avg', 'SLA Total', 'Total Marks']
-        for col, header in enumerate(headers):
-            worksheet.write(1, col, header, subheader_format)
+            headers = ['Sr. No.', 'Enrollment No.', 'Exam Seat No.', 'Name', 'Exp. Marks', 'Practical', 'Class Test Avg', 'SLA Total', 'Total Marks']
+            for col, header in enumerate(headers):
+                worksheet.write(1, col, header, subheader_format)
 
-        row = 2
-        all_data = ReportingModule._collect_student_data(students)
-        for student in all_data["student_info"]:
-            exp_total = sum(m["marks_obtained"] for m in all_data["manual_marks"] if m["student_id"] == student["student_id"] and m["subject_id"] == subject.subject_id)
-            practical = next((m["practical_exam_marks"] for m in all_data["practical_marks"] if m["student_id"] == student["student_id"] and m["subject_id"] == subject.subject_id), 0)
-            class_test = next((m["average"] for m in all_data["class_test_marks"] if m["student_id"] == student["student_id"] and m["subject_id"] == subject.subject_id), 0)
-            sla = next((m["total_sla"] for m in all_data["sla_marks"] if m["student_id"] == student["student_id"] and m["subject_id"] == subject.subject_id), 0)
-            total = exp_total + practical + class_test + sla
-
-            worksheet.write(row, 0, student["sr_no"], cell_format)
-            worksheet.write(row, 1, student["enrollment_number"], cell_format)
-            worksheet.write(row, 2, student["exam_seat_number"], cell_format)
-            worksheet.write(row, 3, student["name"], cell_format)
-            worksheet.write(row, 4, exp_total, cell_format)
-            worksheet.write(row, 5, practical, cell_format)
-            worksheet.write(row, 6, class_test, cell_format)
-            worksheet.write(row, 7, sla, cell_format)
-            worksheet.write(row, 8, total, highlight_format)
-            row += 1
-
-        worksheet.set_column(0, 0, 8)
-        worksheet.set_column(1, 1, 15)
-        worksheet.set_column(2, 2, 15)
-        worksheet.set_column(3, 3, 20)
-        worksheet.set_column(4, 8, 12)
-
-        writer.close()
-        return file_path
+            row = 2
+            totals = ReportingModule._fetch_totals(subject_id=subject.subject_id)
+            for sr_no, student in enumerate(students, start=1):
+                exp_total, practical, class_test, sla = ReportingModule._subject_marks(totals, student.student_id, subject.subject_id)
+                total = exp_total + practical + class_test + sla
+
+                worksheet.write(row, 0, sr_no, cell_format)
+                worksheet.write(row, 1, student.enrollment_number, cell_format)
+                worksheet.write(row, 2, student.exam_seat_number, cell_format)
+                worksheet.write(row, 3, student.name, cell_format)
+                worksheet.write(row, 4, exp_total, cell_format)
+                worksheet.write(row, 5, practical, cell_format)
+                worksheet.write(row, 6, class_test, cell_format)
+                worksheet.write(row, 7, sla, cell_format)
+                worksheet.write(row, 8, total, highlight_format)
+                row += 1
+
+            worksheet.set_column(0, 0, 8)
+            worksheet.set_column(1, 1, 15)
+            worksheet.set_column(2, 2, 15)
+            worksheet.set_column(3, 3, 20)
+            worksheet.set_column(4, 8, 12)
+
+            writer.close()
+        except Exception:
+            ReportingModule._discard(temp_path)
+            raise
+        return ReportingModule._publish(temp_path, file_path)
 
     @staticmethod
     def _generate_subject_pdf_report(subject, students):
         """Generate a PDF report focused on a specific subject."""
-        filename = f"subject_{subject.subject_id}_report_{datetime.now().strftime('%Y%m%d')}.pdf"
-        all_data = ReportingModule._collect_student_data(students)
-
-        class PDF(FPDF):
-            def __init__(self):
-                super().__init__(orientation='L')
-                self.set_auto_page_break(auto=True, margin=15)
-
-            def header(self):
-                if os.path.exists(ReportingModule.LOGO_PATH):
-                    self.image(ReportingModule.LOGO_PATH, 10, 8, 25)
-                self.set_font('Arial', 'B', 16)
-                self.cell(0, 10, 'SUBJECT REPORT', 0, 1, 'C')
-                self.set_font('Arial', 'I', 10)
-                self.cell(0, 10, f'Generated on: {datetime.now().strftime("%Y-%m-%d %H:%M")}', 0, 1, 'C')
-                self.ln(5)
-
-            def footer(self):
-                self.set_y(-15)
-                self.set_font('Arial', 'I', 8)
-                self.cell(0, 10, f'Page {self.page_no()}', 0, 0, 'C')
-
-            def section_title(self, title):
-                self.set_font('Arial', 'B', 12)
-                self.set_fill_color(*ReportingModule.COLORS["header_bg"])
-                self.set_text_color(*ReportingModule.COLORS["header_text"])
-                self.cell(0, 10, title, 1, 1, 'C', True)
-                self.ln(2)
-
-            def create_table(self, headers, data, col_widths, max_rows_per_page=20):
-                self.set_font('Arial', 'B', 10)
-                self.set_fill_color(*ReportingModule.COLORS["subheader_bg"])
-                self.set_text_color(*ReportingModule.COLORS["header_text"])
-
-                for i, header in enumerate(headers):
-                    self.cell(col_widths[i], 10, str(header), 1, 0, 'C', True)
-                self.ln()
-
-                self.set_font('Arial', '', 9)
-                self.set_text_color(0, 0, 0)
-
-                row_count = 0
-                for row in data:
-                    if row_count >= max_rows_per_page:
-                        self.add_page()
-                        self.section_title(self.current_section)
-                        self.create_table(headers, data[row_count:], col_widths, max_rows_per_page)
-                        break
-                    for i, value in enumerate(row):
-                        self.cell(col_widths[i], 8, str(value), 1, 0, 'C')
-                    self.ln()
-                    row_count += 1
-
-                self.ln(5)
-
-        pdf = PDF()
+        filename = f"subject_{subject.subject_id}_year{subject.year}_report_{datetime.now().strftime('%Y%m%d')}.pdf"
+        totals = ReportingModule._fetch_totals(subject_id=subject.subject_id)
+
+        pdf = ReportPDF('SUBJECT REPORT', ReportingModule.LOGO_PATH, ReportingModule.COLORS)
         pdf.add_page()
 
         pdf.section_title(f"OVERVIEW - Year {subject.year}")
-        pdf.current_section = f"OVERVIEW - Year {subject.year}"
 
         headers = ['Sr. No.', 'Enrollment No.', 'Exam Seat No.', 'Name', 'Exp. Marks', 'Practical', 'Class Test Avg', 'SLA Total', 'Total']
         col_widths = [20, 40, 40, 50, 30, 30, 30, 30, 30]
-        data = [[s["sr_no"], s["enrollment_number"], s["exam_seat_number"], s["name"],
-                 sum(m["marks_obtained"] for m in all_data["manual_marks"] if m["student_id"] == s["student_id"] and m["subject_id"] == subject.subject_id),
-                 next((m["practical_exam_marks"] for m in all_data["practical_marks"] if m["student_id"] == s["student_id"] and m["subject_id"] == subject.subject_id), 0),
-                 next((m["average"] for m in all_data["class_test_marks"] if m["student_id"] == s["student_id"] and m["subject_id"] == subject.subject_id), 0),
-                 next((m["total_sla"] for m in all_data["sla_marks"] if m["student_id"] == s["student_id"] and m["subject_id"] == subject.subject_id), 0),
-                 sum(m["marks_obtained"] for m in all_data["manual_marks"] if m["student_id"] == s["student_id"] and m["subject_id"] == subject.subject_id) +
-                 next((m["practical_exam_marks"] for m in all_data["practical_marks"] if m["student_id"] == s["student_id"] and m["subject_id"] == subject.subject_id), 0) +
-                 next((m["average"] for m in all_data["class_test_marks"] if m["student_id"] == s["student_id"] and m["subject_id"] == subject.subject_id), 0) +
-                 next((m["total_sla"] for m in all_data["sla_marks"] if m["student_id"] == s["student_id"] and m["subject_id"] == subject.subject_id), 0)]
-                for s in all_data["student_info"]]
-
-        pdf.create_table(headers, data, col_widths)
+        data = []
+        for sr_no, s in enumerate(students, start=1):
+            marks = ReportingModule._subject_marks(totals, s.student_id, subject.subject_id)
+            data.append([sr_no, s.enrollment_number, s.exam_seat_number, s.name, *marks, sum(marks)])
+
+        pdf.table(headers, data, col_widths)
 
         os.makedirs(ReportingModule.REPORTS_DIR, exist_ok=True)
         file_path = os.path.join(ReportingModule.REPORTS_DIR, filename)
-        pdf.output(file_path)
-        return file_path
\ No newline at end of file
+        temp_path = ReportingModule._temp_path(file_path)
+        try:
+            pdf.output(temp_path)
+        except Exception:
+            ReportingModule._discard(temp_path)
+            raise
+        return ReportingModule._publish(temp_path, file_path)
\ No newline at end of file
@@ -0,0 +1,34 @@
+from sqlalchemy import select
+
+from app.extensions import db
+
+# Public fields per model, in the order the ORM serialize() methods emit them
+STUDENT_FIELDS = ("student_id", "name", "email", "phone", "dob", "gender", "address",
+                  "admission_year", "current_year", "enrollment_number", "exam_seat_number")
+SUBJECT_FIELDS = ("subject_id", "subject_name", "year")
+TEACHER_FIELDS = ("teacher_id", "name", "email", "phone")
+
+
+def project(model, fields, *criteria, order_by=None):
+    """Runs a column-projection query on a model and returns plain row tuples (no ORM instances)."""
+    stmt = select(*[getattr(model, field) for field in fields])
+    if criteria:
+        stmt = stmt.where(*criteria)
+    if order_by is not None:
+        stmt = stmt.order_by(order_by)
+    return db.session.execute(stmt).all()
+
+
+def rows_to_dicts(rows, fields):
+    """[(v1, v2), ...] → [{field1: v1, field2: v2}, ...]"""
+    return [dict(zip(fields, row)) for row in rows]
+
+
+def rows_to_columns(rows, fields):
+    """[(v1, v2), ...] → {field1: [v1, ...], field2: [v2, ...]}"""
+    columns = {field: [] for field in fields}
+    appenders = [columns[field].append for field in fields]
+    for row in rows:
+        for append, value in zip(appenders, row):
+            append(value)
+    return columns
@@ -1,43 +1,188 @@
+import threading
+import time
 import uuid
 
+from itsdangerous import BadSignature, SignatureExpired, URLSafeTimedSerializer
+
+from app.modules.session_store import MemorySessionStore, create_session_store
+
 
 class SessionManager:
     """Manages sessions for both HOD and Teacher"""
 
-    _sessions = {}  # user_id → {session_id, role}
+    _store = MemorySessionStore()  # replaced by init_app() with the configured backend
+    _idle_ttl = 2 * 60 * 60  # seconds without a request before a session expires
+    _absolute_ttl = 12 * 60 * 60  # seconds after login before a session expires regardless of activity
+    _counters = {"expired": 0, "evicted": 0}  # expired: rejected on lookup, evicted: removed by the sweeper
+    _counters_lock = threading.Lock()
+    _sweeper = None
+    _serializer = None  # set when SESSION_MODE is "signed"
+
+    @staticmethod
+    def init_app(app):
+        """Selects the session store backend and expiry policy from the app config"""
+        SessionManager._store = create_session_store(app)
+        SessionManager._idle_ttl = app.config.get("SESSION_IDLE_TTL", SessionManager._idle_ttl)
+        SessionManager._absolute_ttl = app.config.get("SESSION_ABSOLUTE_TTL", SessionManager._absolute_ttl)
+
+        mode = app.config.get("SESSION_MODE", "server")
+        if mode == "signed":
+            SessionManager._serializer = URLSafeTimedSerializer(app.config["SECRET_KEY"], salt="nested-session")
+        elif mode == "server":
+            SessionManager._serializer = None
+        else:
+            raise ValueError(f"Unsupported session mode: {mode}")
+
+        interval = app.config.get("SESSION_SWEEP_INTERVAL", 60)
+        if interval and SessionManager._sweeper is None:
+            SessionManager._sweeper = SessionSweeper(interval)
+            SessionManager._sweeper.start()
+
+    @staticmethod
+    def _count(counter, amount=1):
+        with SessionManager._counters_lock:
+            SessionManager._counters[counter] += amount
+
+    @staticmethod
+    def _expiry_for(created_at, now):
+        """Sliding idle expiry, capped by the absolute lifetime of the session"""
+        return min(now + SessionManager._idle_ttl, created_at + SessionManager._absolute_ttl)
 
     @staticmethod
     def create_session(user_id, role):
         """Creates a session for a user and stores their role (HOD/Teacher)"""
+        if SessionManager._serializer:
+            # Signed mode: the token itself carries the identity, nothing is stored
+            # iat: issue time with sub-second precision, compared against logout cutoffs
+            return SessionManager._serializer.dumps(
+                {"uid": user_id, "role": role, "jti": uuid.uuid4().hex, "iat": time.time()}
+            )
+
         session_id = str(uuid.uuid4())
-        SessionManager._sessions[user_id] = {"session_id": session_id, "role": role}
+        now = time.time()
+        SessionManager._store.add(session_id, user_id, role, expires_at=SessionManager._expiry_for(now, now))
         return session_id
 
+    @staticmethod
+    def _load_token(token):
+        """Verifies a signed session token, returns (payload, issued_at) or (None, None)"""
+        try:
+            payload, issued_at = SessionManager._serializer.loads(
+                token, max_age=SessionManager._absolute_ttl, return_timestamp=True
+            )
+        except SignatureExpired:
+            SessionManager._count("expired")
+            return None, None
+        except BadSignature:
+            return None, None
+        if SessionManager._store.is_revoked(payload["jti"]):
+            return None, None
+        cutoff = SessionManager._store.get_cutoff("*", f"{payload['role']}:{payload['uid']}")
+        if cutoff is not None and payload.get("iat", issued_at.timestamp()) < cutoff:
+            return None, None  # logged out by flush_sessions() or delete_session()
+        return payload, issued_at
+
     @staticmethod
     def get_session(user_id, role):
         """Retrieves the session details (session_id & role) for a user_id and role"""
-        session = SessionManager._sessions.get(user_id, None)
-        if session and session["role"] == role:
-            return session
+        if SessionManager._serializer:
+            return None  # signed tokens are not tracked per user
+        record = SessionManager._store.get_by_user(user_id, role)
+        if record:
+            return {"session_id": record["session_id"], "role": record["role"]}
         return None
 
     @staticmethod
     def get_user_id_from_session_id(session_id, role):
         """Finds the user_id associated with a session ID and role"""
-        for user_id, data in SessionManager._sessions.items():
-            if data["session_id"] == session_id and data["role"] == role:
-                return user_id
-        return None
+        if SessionManager._serializer:
+            payload, _ = SessionManager._load_token(session_id)
+            if payload and payload["role"] == role:
+                return payload["uid"]
+            return None
+
+        record = SessionManager._store.get(session_id)
+        if not record or record["role"] != role:
+            return None
+
+        now = time.time()
+        if record["expires_at"] is not None and record["expires_at"] < now:
+            SessionManager._store.remove(session_id)
+            SessionManager._count("expired")
+            return None
+
+        # Sliding refresh, written at most about once a minute per session to keep the shared store quiet
+        expires_at = SessionManager._expiry_for(record["created_at"], now)
+        if record["expires_at"] is not None and expires_at - record["expires_at"] > min(60, SessionManager._idle_ttl / 10):
+            SessionManager._store.touch(session_id, expires_at)
+        return record["user_id"]
 
     @staticmethod
-    def delete_session(user_id):
-        """Deletes a session using user_id"""
-        return SessionManager._sessions.pop(user_id, None)
+    def delete_session(user_id, role=None):
+        """Deletes a session using user_id (for every role unless one is given).
+        Signed tokens of the user issued until now are rejected from then on."""
+        roles = [role] if role else ["hod", "teacher"]
+        deleted = None
+        now = time.time()
+        for user_role in roles:
+            deleted = SessionManager._store.remove_user(user_id, user_role) or deleted
+            if SessionManager._serializer:
+                SessionManager._store.set_cutoff(f"{user_role}:{user_id}", now, now + SessionManager._absolute_ttl)
+        return deleted
+
+    @staticmethod
+    def end_session(session_id):
+        """Deletes a session using the session_id from the cookie"""
+        if SessionManager._serializer:
+            payload, issued_at = SessionManager._load_token(session_id)
+            if not payload:
+                return None
+            # Revoke until the token would have expired on its own, then the sweeper drops the entry
+            SessionManager._store.revoke(payload["jti"], issued_at.timestamp() + SessionManager._absolute_ttl)
+            return {"session_id": session_id, "role": payload["role"]}
+        return SessionManager._store.remove(session_id)
 
     @staticmethod
     def flush_sessions():
-        """Clears all sessions (logout all users)"""
-        SessionManager._sessions.clear()
+        """Clears all sessions (logout all users); in signed mode every token issued until now is rejected"""
+        SessionManager._store.clear()
+        if SessionManager._serializer:
+            now = time.time()
+            SessionManager._store.set_cutoff("*", now, now + SessionManager._absolute_ttl)
+
+    @staticmethod
+    def sweep_expired():
+        """Evicts every expired session from the store, returns how many were evicted"""
+        evicted = SessionManager._store.purge_expired(time.time())
+        if evicted:
+            SessionManager._count("evicted", evicted)
+        return evicted
+
+    @staticmethod
+    def stats():
+        """Live session count plus expiry counters for this process"""
+        with SessionManager._counters_lock:
+            counters = dict(SessionManager._counters)
+        return {"live": SessionManager._store.count(), **counters}
+
+
+class SessionSweeper(threading.Thread):
+    """Daemon thread that periodically evicts expired sessions"""
+
+    def __init__(self, interval):
+        super().__init__(name="session-sweeper", daemon=True)
+        self.interval = interval
+        self._stopped = threading.Event()
+
+    def run(self):
+        while not self._stopped.wait(self.interval):
+            try:
+                SessionManager.sweep_expired()
+            except Exception as error:  # keep sweeping even if one pass fails (e.g. a locked sqlite file)
+                print(f"Session sweep failed: {error}")
+
+    def stop(self):
+        self._stopped.set()
 
 # -------------------- USAGE EXAMPLE --------------------
 # if __name__ == "__main__":
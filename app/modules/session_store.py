@@ -0,0 +1,273 @@
+import heapq
+import os
+import sqlite3
+import threading
+import time
+
+
+class MemorySessionStore:
+    """Per-process session store (default). Sessions are lost on restart and not shared between workers."""
+
+    def __init__(self):
+        self._sessions = {}  # (user_id, role) → {session_id, role}
+        self._session_index = {}  # session_id → record
+        self._expiry_heap = []  # (expires_at, session_id), drained by purge_expired()
+        self._revoked = {}  # signed token id → expires_at
+        self._revoked_heap = []  # (expires_at, token id)
+        self._cutoffs = {}  # subject ("*" or "role:user_id") → (not_before, expires_at)
+        self._lock = threading.RLock()  # guards both maps under threaded WSGI servers
+
+    def add(self, session_id, user_id, role, expires_at=None):
+        """Stores a session, replacing any previous session of the same user and role"""
+        record = {"session_id": session_id, "user_id": user_id, "role": role,
+                  "created_at": time.time(), "expires_at": expires_at}
+        with self._lock:
+            previous = self._sessions.get((user_id, role))
+            if previous:
+                self._session_index.pop(previous["session_id"], None)
+            self._sessions[(user_id, role)] = {"session_id": session_id, "role": role}
+            self._session_index[session_id] = record
+            if expires_at is not None:
+                heapq.heappush(self._expiry_heap, (expires_at, session_id))
+        return record
+
+    def get(self, session_id):
+        """Returns the session record for a session_id"""
+        return self._session_index.get(session_id)
+
+    def touch(self, session_id, expires_at):
+        """Moves the expiry of a session forward"""
+        record = self._session_index.get(session_id)
+        if record:
+            # The heap entry is left as is; purge_expired() re-queues it when it comes due
+            record["expires_at"] = expires_at
+
+    def get_by_user(self, user_id, role):
+        """Returns the session record of a user for a role"""
+        session = self._sessions.get((user_id, role))
+        return self._session_index.get(session["session_id"]) if session else None
+
+    def remove(self, session_id):
+        """Removes a session by session_id and returns its record"""
+        with self._lock:
+            record = self._session_index.pop(session_id, None)
+            if record:
+                self._sessions.pop((record["user_id"], record["role"]), None)
+            return record
+
+    def remove_user(self, user_id, role):
+        """Removes the session of a user for a role and returns its record"""
+        with self._lock:
+            session = self._sessions.pop((user_id, role), None)
+            if session:
+                return self._session_index.pop(session["session_id"], None)
+            return None
+
+    def purge_expired(self, now):
+        """Removes every session whose expiry is before `now`, returns how many were removed"""
+        removed = 0
+        with self._lock:
+            heap = self._expiry_heap
+            while heap and heap[0][0] < now:
+                _, session_id = heapq.heappop(heap)
+                record = self._session_index.get(session_id)
+                if not record or record["expires_at"] is None:
+                    continue  # already removed
+                if record["expires_at"] >= now:
+                    heapq.heappush(heap, (record["expires_at"], session_id))  # refreshed since queued
+                    continue
+                self.remove(session_id)
+                removed += 1
+
+            while self._revoked_heap and self._revoked_heap[0][0] < now:
+                _, token_id = heapq.heappop(self._revoked_heap)
+                self._revoked.pop(token_id, None)
+
+            for subject in [subject for subject, (_, expires_at) in self._cutoffs.items() if expires_at < now]:
+                del self._cutoffs[subject]
+        return removed
+
+    def revoke(self, token_id, expires_at):
+        """Adds a signed token id to the revocation list until the token would have expired anyway"""
+        with self._lock:
+            self._revoked[token_id] = expires_at
+            heapq.heappush(self._revoked_heap, (expires_at, token_id))
+
+    def is_revoked(self, token_id):
+        """Checks whether a signed token id has been revoked"""
+        return token_id in self._revoked
+
+    def set_cutoff(self, subject, not_before, expires_at):
+        """Rejects signed tokens of subject ("*" for everyone, "role:user_id") issued before not_before, until expires_at"""
+        with self._lock:
+            self._cutoffs[subject] = (not_before, expires_at)
+
+    def get_cutoff(self, *subjects):
+        """Latest not_before of the given subjects, or None"""
+        cutoffs = [self._cutoffs[subject][0] for subject in subjects if subject in self._cutoffs]
+        return max(cutoffs, default=None)
+
+    def count(self):
+        """Returns the number of stored sessions"""
+        return len(self._session_index)
+
+    def clear(self):
+        """Removes all sessions; signed token revocations and cutoffs are kept"""
+        with self._lock:
+            self._sessions.clear()
+            self._session_index.clear()
+            self._expiry_heap.clear()
+
+
+class SQLiteSessionStore:
+    """
+    Session store backed by a SQLite file, shared by every worker process on a host.
+    Lookups go through the session_id primary key and expiry is purged in one indexed DELETE.
+    """
+
+    COLUMNS = ("session_id", "user_id", "role", "created_at", "expires_at")
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()  # sqlite connections must not cross threads
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with self._connection() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS sessions (
+                    session_id TEXT PRIMARY KEY,
+                    user_id INTEGER NOT NULL,
+                    role TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    expires_at REAL
+                )
+            """)
+            conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS ix_sessions_user_role ON sessions (user_id, role)")
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_sessions_expires_at ON sessions (expires_at)")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS revoked_tokens (
+                    token_id TEXT PRIMARY KEY,
+                    expires_at REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_revoked_tokens_expires_at ON revoked_tokens (expires_at)")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS token_cutoffs (
+                    subject TEXT PRIMARY KEY,
+                    not_before REAL NOT NULL,
+                    expires_at REAL NOT NULL
+                )
+            """)
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _row_to_record(self, row):
+        return dict(zip(self.COLUMNS, row)) if row else None
+
+    def add(self, session_id, user_id, role, expires_at=None):
+        """Stores a session, replacing any previous session of the same user and role"""
+        record = {"session_id": session_id, "user_id": user_id, "role": role,
+                  "created_at": time.time(), "expires_at": expires_at}
+        # REPLACE drops the row that conflicts on the (user_id, role) unique index
+        self._connection().execute(
+            "INSERT OR REPLACE INTO sessions (session_id, user_id, role, created_at, expires_at) VALUES (?, ?, ?, ?, ?)",
+            (session_id, user_id, role, record["created_at"], expires_at)
+        )
+        return record
+
+    def get(self, session_id):
+        """Returns the session record for a session_id"""
+        row = self._connection().execute(
+            "SELECT session_id, user_id, role, created_at, expires_at FROM sessions WHERE session_id = ?",
+            (session_id,)
+        ).fetchone()
+        return self._row_to_record(row)
+
+    def get_by_user(self, user_id, role):
+        """Returns the session record of a user for a role"""
+        row = self._connection().execute(
+            "SELECT session_id, user_id, role, created_at, expires_at FROM sessions WHERE user_id = ? AND role = ?",
+            (user_id, role)
+        ).fetchone()
+        return self._row_to_record(row)
+
+    def touch(self, session_id, expires_at):
+        """Moves the expiry of a session forward"""
+        self._connection().execute(
+            "UPDATE sessions SET expires_at = ? WHERE session_id = ?", (expires_at, session_id)
+        )
+
+    def remove(self, session_id):
+        """Removes a session by session_id and returns its record"""
+        record = self.get(session_id)
+        if record:
+            self._connection().execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+        return record
+
+    def remove_user(self, user_id, role):
+        """Removes the session of a user for a role and returns its record"""
+        record = self.get_by_user(user_id, role)
+        if record:
+            self._connection().execute("DELETE FROM sessions WHERE session_id = ?", (record["session_id"],))
+        return record
+
+    def purge_expired(self, now):
+        """Removes every session whose expiry is before `now`, returns how many were removed"""
+        conn = self._connection()
+        cursor = conn.execute("DELETE FROM sessions WHERE expires_at IS NOT NULL AND expires_at < ?", (now,))
+        conn.execute("DELETE FROM revoked_tokens WHERE expires_at < ?", (now,))
+        conn.execute("DELETE FROM token_cutoffs WHERE expires_at < ?", (now,))
+        return cursor.rowcount
+
+    def revoke(self, token_id, expires_at):
+        """Adds a signed token id to the revocation list until the token would have expired anyway"""
+        self._connection().execute(
+            "INSERT OR REPLACE INTO revoked_tokens (token_id, expires_at) VALUES (?, ?)", (token_id, expires_at)
+        )
+
+    def is_revoked(self, token_id):
+        """Checks whether a signed token id has been revoked"""
+        row = self._connection().execute(
+            "SELECT 1 FROM revoked_tokens WHERE token_id = ?", (token_id,)
+        ).fetchone()
+        return row is not None
+
+    def set_cutoff(self, subject, not_before, expires_at):
+        """Rejects signed tokens of subject ("*" for everyone, "role:user_id") issued before not_before, until expires_at"""
+        self._connection().execute(
+            "INSERT OR REPLACE INTO token_cutoffs (subject, not_before, expires_at) VALUES (?, ?, ?)",
+            (subject, not_before, expires_at)
+        )
+
+    def get_cutoff(self, *subjects):
+        """Latest not_before of the given subjects, or None"""
+        row = self._connection().execute(
+            f"SELECT MAX(not_before) FROM token_cutoffs WHERE subject IN ({','.join('?' * len(subjects))})", subjects
+        ).fetchone()
+        return row[0]
+
+    def count(self):
+        """Returns the number of stored sessions"""
+        return self._connection().execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+
+    def clear(self):
+        """Removes all sessions; signed token revocations and cutoffs are kept"""
+        self._connection().execute("DELETE FROM sessions")
+
+
+def create_session_store(app):
+    """Builds the session store selected by the SESSION_BACKEND config value"""
+    backend = app.config.get("SESSION_BACKEND", "memory")
+    if backend == "memory":
+        return MemorySessionStore()
+    if backend == "sqlite":
+        path = app.config.get("SESSION_STORE_PATH") or os.path.join(app.instance_path, "sessions.db")
+        return SQLiteSessionStore(path)
+    raise ValueError(f"Unsupported session backend: {backend}")
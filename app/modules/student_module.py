@@ -1,5 +1,8 @@
 from app.models import Student
 from app.extensions import db
+from app.modules.year_cache import YearCache
+from app.modules.table_versions import TableVersions
+from app.modules.serializers import STUDENT_FIELDS, project, rows_to_dicts
 
 
 class StudentModule:
@@ -9,6 +12,7 @@ class StudentModule:
         new_student = Student(name=name, email=email, phone=phone, dob=dob, gender=gender,
                               address=address, admission_year=admission_year, current_year=current_year, enrollment_number=enrollment_no, exam_seat_number=exam_seat_no) #add current year
         db.session.add(new_student)
+        TableVersions.bump("students")
         db.session.commit()
         return new_student
 
@@ -17,6 +21,13 @@ class StudentModule:
         """Returns all students"""
         return Student.query.all()
 
+    @staticmethod
+    def list_students(year=None):
+        """Returns students as plain dicts from a column projection (no ORM instances)"""
+        criteria = [Student.current_year == year] if year is not None else []
+        rows = project(Student, STUDENT_FIELDS, *criteria, order_by=Student.student_id)
+        return rows_to_dicts(rows, STUDENT_FIELDS)
+
     @staticmethod
     def get_student_by_id(student_id):
         """Fetch student by ID"""
@@ -28,7 +39,9 @@ class StudentModule:
         student = Student.query.get(student_id)
         if student:
             db.session.delete(student)
+            TableVersions.bump("students")
             db.session.commit()
+            YearCache.invalidate_student(student_id)
             return True
         return False
 
@@ -41,5 +54,7 @@ class StudentModule:
         for key, value in kwargs.items():
             if hasattr(student, key):
                 setattr(student, key, value)
+        TableVersions.bump("students")
         db.session.commit()
+        YearCache.invalidate_student(student_id)
         return student
\ No newline at end of file
@@ -1,5 +1,9 @@
 from app.models import Subject
 from app.extensions import db
+from app.modules.year_cache import YearCache
+from app.modules.table_versions import TableVersions
+from app.modules.ref_cache import RefCache
+from app.modules.serializers import SUBJECT_FIELDS, project, rows_to_dicts
 
 
 class SubjectModule:
@@ -8,7 +12,9 @@ class SubjectModule:
         """Creates a new subject"""
         new_subject = Subject(subject_name=subject_name, year=year)
         db.session.add(new_subject)
+        TableVersions.bump("subjects")
         db.session.commit()
+        RefCache.invalidate("subjects", "teachers")  # the teacher list embeds subjects
         return new_subject
 
     @staticmethod
@@ -16,6 +22,16 @@ class SubjectModule:
         """Returns all subjects"""
         return Subject.query.all()
 
+    @staticmethod
+    def list_subjects(year=None):
+        """Returns subjects as plain dicts, served from the reference cache (treat as read-only)"""
+        def load():
+            criteria = [Subject.year == year] if year is not None else []
+            rows = project(Subject, SUBJECT_FIELDS, *criteria, order_by=Subject.subject_id)
+            return rows_to_dicts(rows, SUBJECT_FIELDS)
+
+        return RefCache.get_or_load("subjects", "all" if year is None else year, load)
+
     @staticmethod
     def get_subject_by_id(subject_id):
         """Fetch subject by ID"""
@@ -27,7 +43,10 @@ class SubjectModule:
         subject = Subject.query.get(subject_id)
         if subject:
             db.session.delete(subject)
+            TableVersions.bump("subjects")
             db.session.commit()
+            YearCache.invalidate_subject(subject_id)
+            RefCache.invalidate("subjects", "teachers")
             return True
         return False
 
@@ -37,6 +56,9 @@ class SubjectModule:
         subject = Subject.query.get(subject_id)
         if subject:
             subject.subject_name = new_subject_name
+            TableVersions.bump("subjects")
             db.session.commit()
+            YearCache.invalidate_subject(subject_id)
+            RefCache.invalidate("subjects", "teachers")
             return subject
         return None
@@ -0,0 +1,113 @@
+import hashlib
+import time
+from email.utils import formatdate
+from functools import wraps
+
+from flask import make_response, request
+from sqlalchemy import select, update
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+
+from app.extensions import db
+from app.models import TableVersion
+
+
+class TableVersions:
+    """
+    Version counter per table, kept in the table_versions table of the main database and bumped
+    by the module write methods in the same transaction as the write, so a counter changes exactly
+    when its data commits, whichever worker or host wrote it. List endpoints derive their ETag
+    from the counters of the tables they read, so an unchanged list is answered with 304 after
+    one small query, before any serialization runs. Writes made outside the modules (migrations,
+    restores, manual SQL) must bump the counters too: 'flask versions bump'.
+    """
+
+    TABLES = ("students", "subjects", "teachers", "marks")  # "marks" covers the four mark tables and the totals
+
+    @staticmethod
+    def _bump_statement(table, now):
+        """INSERT of version 1, or increment of the existing counter, in one statement where the dialect allows"""
+        dialect = db.session.get_bind().dialect.name
+        values = {"name": table, "version": 1, "modified_at": now}
+        if dialect in ("sqlite", "postgresql"):
+            dialect_insert = sqlite.insert if dialect == "sqlite" else postgresql.insert
+            stmt = dialect_insert(TableVersion).values(values)
+            return stmt.on_conflict_do_update(
+                index_elements=["name"], set_={"version": TableVersion.version + 1, "modified_at": stmt.excluded.modified_at}
+            )
+        if dialect in ("mysql", "mariadb"):
+            stmt = mysql.insert(TableVersion).values(values)
+            return stmt.on_duplicate_key_update({"version": TableVersion.version + 1, "modified_at": stmt.inserted.modified_at})
+        return None
+
+    @staticmethod
+    def bump(*tables):
+        """Marks tables as changed in the current transaction; call before db.session.commit()"""
+        now = time.time()
+        for table in tables:
+            stmt = TableVersions._bump_statement(table, now)
+            if stmt is not None:
+                db.session.execute(stmt)
+                continue
+            # No native upsert: update, and create the counter on its first bump
+            updated = db.session.execute(
+                update(TableVersion).where(TableVersion.name == table)
+                .values(version=TableVersion.version + 1, modified_at=now)
+            ).rowcount
+            if not updated:
+                db.session.add(TableVersion(name=table, version=1, modified_at=now))
+
+    @staticmethod
+    def get_many(tables):
+        """Returns {table: (version, modified_at)}; never-written tables report (0, 0.0)"""
+        rows = db.session.execute(
+            select(TableVersion.name, TableVersion.version, TableVersion.modified_at).where(TableVersion.name.in_(tables))
+        )
+        found = {name: (version, modified_at) for name, version, modified_at in rows}
+        return {table: found.get(table, (0, 0.0)) for table in tables}
+
+    @staticmethod
+    def etag(tables, *key):
+        """Returns (etag, last_modified) for the current versions of tables plus any extra key parts"""
+        versions = TableVersions.get_many(tables)
+        # modified_at keeps ETags unique when counters restart (a new or restored database)
+        parts = [f"{table}:{versions[table][0]}:{versions[table][1]!r}" for table in tables]
+        parts += [str(part) for part in key]
+        digest = hashlib.sha1("|".join(parts).encode("utf-8")).hexdigest()[:20]
+        return digest, max(modified_at for _, modified_at in versions.values())
+
+
+def conditional_get(*tables, key=None):
+    """
+    Route decorator answering 304 Not Modified when none of `tables` changed since the client's copy.
+    `key` is an optional callable returning extra ETag parts for responses that vary per user (e.g. year).
+    Goes below the login decorator so the principal is resolved first.
+    """
+
+    def decorator(func):
+        @wraps(func)
+        def decorated_function(*args, **kwargs):
+            extra = key() if key else ()
+            etag, last_modified = TableVersions.etag(tables, *extra)
+
+            # If-None-Match wins over If-Modified-Since (HTTP dates only have one-second resolution)
+            if request.if_none_match:
+                not_modified = request.if_none_match.contains_weak(etag)  # weak: compression marks the ETag W/
+            else:
+                since = request.if_modified_since
+                not_modified = since is not None and int(last_modified) <= since.timestamp()
+
+            if not_modified:
+                response = make_response("", 304)
+            else:
+                response = make_response(func(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+            response.set_etag(etag)
+            if last_modified:
+                response.headers["Last-Modified"] = formatdate(int(last_modified), usegmt=True)
+            response.headers["Cache-Control"] = "private, no-cache"  # always revalidate, never serve stale
+            return response
+
+        return decorated_function
+
+    return decorator
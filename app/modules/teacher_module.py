@@ -1,5 +1,12 @@
-from app.models import Teacher
+from sqlalchemy import select
+from sqlalchemy.orm import joinedload
+
+from app.models import Teacher, Subject
 from app.extensions import db
+from app.modules.serializers import SUBJECT_FIELDS, TEACHER_FIELDS
+from app.modules.login_guard import LoginGuard
+from app.modules.table_versions import TableVersions
+from app.modules.ref_cache import RefCache
 
 
 class TeacherModule:
@@ -9,31 +16,63 @@ class TeacherModule:
         new_teacher = Teacher(name=name, email=email, phone=phone, subject_id=subject_id)
         new_teacher.set_password(password)
         db.session.add(new_teacher)
+        TableVersions.bump("teachers")
         db.session.commit()
+        RefCache.invalidate("teachers")
         return new_teacher
 
     @staticmethod
     def get_all_teachers():
-        """Returns all teachers"""
-        return Teacher.query.all()
+        """Returns all teachers with their subject loaded in the same query"""
+        return Teacher.query.options(joinedload(Teacher.subject)).all()
+
+    @staticmethod
+    def list_teachers():
+        """Returns teachers as plain dicts (same shape as Teacher.serialize), served from the reference cache"""
+        return RefCache.get_or_load("teachers", "all", TeacherModule._load_teacher_list)
+
+    @staticmethod
+    def _load_teacher_list():
+        rows = db.session.execute(
+            select(*[getattr(Teacher, field) for field in TEACHER_FIELDS],
+                   *[getattr(Subject, field) for field in SUBJECT_FIELDS])
+            .outerjoin(Subject, Subject.subject_id == Teacher.subject_id)
+            .order_by(Teacher.teacher_id)
+        )
+        split = len(TEACHER_FIELDS)
+        return [
+            dict(zip(TEACHER_FIELDS, row[:split]),
+                 subject=dict(zip(SUBJECT_FIELDS, row[split:])) if row[split] is not None else None)
+            for row in rows
+        ]
 
     @staticmethod
     def get_teacher_by_id(teacher_id):
         """Fetch teacher by ID"""
-        return Teacher.query.get(teacher_id)
+        return Teacher.query.options(joinedload(Teacher.subject)).filter_by(teacher_id=teacher_id).first()
 
     @staticmethod
     def get_teacher_by_email(email):
         """Fetch teacher by email"""
         return Teacher.query.filter_by(email=email).first()
 
+    @staticmethod
+    def login(email, password):
+        """Login teacher"""
+        teacher = Teacher.query.filter_by(email=email).first()
+        if teacher and LoginGuard.verify_password(teacher, password):
+            return teacher
+        return None
+
     @staticmethod
     def delete_teacher(teacher_id):
         """Delete a teacher"""
         teacher = Teacher.query.get(teacher_id)
         if teacher:
             db.session.delete(teacher)
+            TableVersions.bump("teachers")
             db.session.commit()
+            RefCache.invalidate("teachers")
             return True
         return False
 
@@ -48,5 +87,7 @@ class TeacherModule:
                 teacher.set_password(value)
             elif hasattr(teacher, key):
                 setattr(teacher, key, value)
+        TableVersions.bump("teachers")
         db.session.commit()
+        RefCache.invalidate("teachers")
         return teacher
@@ -0,0 +1,75 @@
+import threading
+import time
+from collections import OrderedDict
+
+from app.models import Student, Subject
+from app.extensions import db
+
+
+class YearCache:
+    """
+    Bounded LRU cache of student_id → current_year and subject_id → year for the marks write path.
+    Entries are dropped explicitly by the student/subject update and delete paths; the TTL only
+    bounds staleness for edits made by another worker process.
+    """
+
+    _entries = OrderedDict()  # (kind, id) → (year, cached_at)
+    _lock = threading.Lock()
+    _max_size = 4096
+    _ttl = 300  # seconds
+
+    @staticmethod
+    def init_app(app):
+        """Reads the cache bounds from the app config"""
+        YearCache._max_size = app.config.get("YEAR_CACHE_SIZE", YearCache._max_size)
+        YearCache._ttl = app.config.get("YEAR_CACHE_TTL", YearCache._ttl)
+        YearCache.clear()
+
+    @staticmethod
+    def _get(kind, key, loader):
+        now = time.monotonic()
+        with YearCache._lock:
+            entry = YearCache._entries.get((kind, key))
+            if entry and now - entry[1] < YearCache._ttl:
+                YearCache._entries.move_to_end((kind, key))
+                return entry[0]
+
+        year = loader()
+        if year is None:
+            return None  # unknown ids are not cached
+
+        with YearCache._lock:
+            YearCache._entries[(kind, key)] = (year, now)
+            YearCache._entries.move_to_end((kind, key))
+            while len(YearCache._entries) > YearCache._max_size:
+                YearCache._entries.popitem(last=False)
+        return year
+
+    @staticmethod
+    def get_student_year(student_id):
+        """Current year of a student, or None if the student does not exist"""
+        return YearCache._get("student", student_id, lambda: db.session.query(Student.current_year).filter(
+            Student.student_id == student_id
+        ).scalar())
+
+    @staticmethod
+    def get_subject_year(subject_id):
+        """Year of a subject, or None if the subject does not exist"""
+        return YearCache._get("subject", subject_id, lambda: db.session.query(Subject.year).filter(
+            Subject.subject_id == subject_id
+        ).scalar())
+
+    @staticmethod
+    def invalidate_student(student_id):
+        with YearCache._lock:
+            YearCache._entries.pop(("student", student_id), None)
+
+    @staticmethod
+    def invalidate_subject(subject_id):
+        with YearCache._lock:
+            YearCache._entries.pop(("subject", subject_id), None)
+
+    @staticmethod
+    def clear():
+        with YearCache._lock:
+            YearCache._entries.clear()
@@ -1,4 +1,4 @@
-from flask import Blueprint, render_template, jsonify, request
+from flask import Blueprint, render_template, jsonify, request, g
 
 from app.modules.middleware import hod_login_required, teacher_login_required
 from app.modules.session_manager import SessionManager
@@ -75,11 +75,11 @@ def teacher_dashboard_view_marks():
 @hod_login_required
 def logout_hod():
     """Logs out the user by clearing session from backend and frontend"""
-    session_id = request.cookies.get("session_id")
+    session_id = g.session_id
 
     # If session exists, remove it from SessionManager
     if session_id:
-        SessionManager.delete_session(session_id)  # Remove session from memory
+        SessionManager.end_session(session_id)  # Remove session from memory
 
     response = render_template("logout_hod.html")  # Load logout page
     return response
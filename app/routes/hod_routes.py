@@ -1,14 +1,18 @@
 import os
 
-from flask import Blueprint, request, jsonify, send_file
+from flask import Blueprint, request, jsonify, send_file, g, current_app, url_for
 from app.modules.hod_module import HODModule
 from app.modules.reporting_module import ReportingModule
+from app.modules.report_jobs import ReportJobs, ReportQueueFull
 from app.modules.teacher_module import TeacherModule
 from app.modules.subject_module import SubjectModule
 from app.modules.student_module import StudentModule
 from app.modules.marks_module import MarksModule
 from app.modules.session_manager import SessionManager
+from app.modules.login_guard import LoginGuard, LoginRejected
 from app.modules.middleware import hod_login_required as login_required
+from app.modules.table_versions import conditional_get
+from app.modules.ref_cache import RefCache
 
 hod_blueprint = Blueprint("hod", __name__)
 
@@ -20,7 +24,11 @@ def hod_login():
     email_id = data["email"]
     password = data["password"]
 
-    hod_object = HODModule.login(email_id, password)
+    try:
+        LoginGuard.admit(request.remote_addr, email_id)
+        hod_object = HODModule.login(email_id, password)
+    except LoginRejected as rejected:
+        return jsonify({"success": False, "error": rejected.message}), 429, {"Retry-After": str(rejected.retry_after)}
     if hod_object:
         session_id = SessionManager.create_session(hod_object.hod_id, role="hod")
         response = jsonify({"success": True, "hod_object": hod_object.serialize()})
@@ -32,13 +40,24 @@ def hod_login():
 @hod_blueprint.route("/logout", methods=["POST"])
 @login_required
 def hod_logout():
-    session_id = request.cookies.get("session_id")
-    SessionManager.delete_session(session_id)
+    SessionManager.end_session(g.session_id)
     response = jsonify({"success": True})
     response.set_cookie("session_id", "", expires=0)
     return response
 
 
+@hod_blueprint.route("/sessions/stats", methods=["GET"])
+@login_required
+def session_stats():
+    return jsonify(SessionManager.stats())
+
+
+@hod_blueprint.route("/cache/stats", methods=["GET"])
+@login_required
+def cache_stats():
+    return jsonify(RefCache.stats())
+
+
 # -------------------- Manage Teachers --------------------
 @hod_blueprint.route("/teachers", methods=["POST"])
 @login_required
@@ -52,9 +71,9 @@ def create_teacher():
 
 @hod_blueprint.route("/teachers", methods=["GET"])
 @login_required
+@conditional_get("teachers", "subjects")
 def list_teachers():
-    teachers = TeacherModule.get_all_teachers()
-    return jsonify([teacher.serialize() for teacher in teachers])
+    return jsonify(TeacherModule.list_teachers())
 
 
 @hod_blueprint.route("/teachers/<int:teacher_id>", methods=["DELETE"])
@@ -88,9 +107,9 @@ def create_subject():
 
 @hod_blueprint.route("/subjects", methods=["GET"])
 @login_required
+@conditional_get("subjects")
 def list_subjects():
-    subjects = SubjectModule.get_all_subjects()
-    return jsonify([subject.serialize() for subject in subjects])
+    return jsonify(SubjectModule.list_subjects())
 
 
 @hod_blueprint.route("/subjects/<int:subject_id>", methods=["DELETE"])
@@ -126,9 +145,9 @@ def create_student():
 
 @hod_blueprint.route("/students", methods=["GET"])
 @login_required
+@conditional_get("students")
 def list_students():
-    students = StudentModule.get_all_students()
-    return jsonify([student.serialize() for student in students])
+    return jsonify(StudentModule.list_students())
 
 
 @hod_blueprint.route("/students/<int:student_id>", methods=["DELETE"])
@@ -162,16 +181,29 @@ def update_student(student_id):
 @hod_blueprint.route("/students/<int:student_id>/marks", methods=["GET"])
 @login_required
 def get_student_marks(student_id):
-    marks = MarksModule.get_student_marks(student_id)
-    return jsonify([mark.serialize() for mark in marks])
+    page, error = MarksModule.get_student_marks(
+        student_id, cursor=request.args.get("cursor"), limit=request.args.get("limit", type=int)
+    )
+    if error:
+        return jsonify({"error": error}), 400
+    return jsonify(page)
 
 
 # -------------------- View Marks -------------------- #
 @hod_blueprint.route("/marks", methods=["GET"])
 @login_required
 def view_marks():
-    marks = MarksModule.get_all_marks()
-    return jsonify([mark.serialize() for mark in marks])
+    """Keyset-paginated marks, filterable by subject_id, year and student_id"""
+    page, error = MarksModule.get_all_marks(
+        subject_id=request.args.get("subject_id", type=int),
+        year=request.args.get("year", type=int),
+        student_id=request.args.get("student_id", type=int),
+        cursor=request.args.get("cursor"),
+        limit=request.args.get("limit", type=int)
+    )
+    if error:
+        return jsonify({"error": error}), 400
+    return jsonify(page)
 
 
 # -------------------- Reporting Routes--------------- #
@@ -184,6 +216,10 @@ def download_student_report():
     if file_format not in ["excel", "pdf"]:
         return jsonify({"error": "Invalid format. Use 'excel' or 'pdf'."}), 400
 
+    if file_format == "excel" and current_app.config.get("REPORT_STREAMING"):
+        buffer, filename = ReportingModule.generate_student_report(file_format, stream=True)
+        return send_file(buffer, as_attachment=True, download_name=filename, mimetype=ReportingModule.XLSX_MIMETYPE)
+
     file_path = ReportingModule.generate_student_report(file_format)
 
     if not file_path or not os.path.exists(file_path):
@@ -200,9 +236,65 @@ def download_single_student_report(student_id):
     if file_format not in ["excel", "pdf"]:
         return jsonify({"error": "Invalid format. Use 'excel' or 'pdf'."}), 400
 
+    if file_format == "excel" and current_app.config.get("REPORT_STREAMING"):
+        result = ReportingModule.generate_single_student_report(student_id, file_format, stream=True)
+        if not result:
+            return jsonify({"error": "Student not found or report generation failed"}), 404
+        buffer, filename = result
+        return send_file(buffer, as_attachment=True, download_name=filename, mimetype=ReportingModule.XLSX_MIMETYPE)
+
     file_path = ReportingModule.generate_single_student_report(student_id, file_format)
 
     if not file_path or not os.path.exists(file_path):
         return jsonify({"error": "Student not found or report generation failed"}), 404
 
     return send_file(file_path, as_attachment=True)
+
+
+@hod_blueprint.route("/report/jobs", methods=["POST"])
+@login_required
+def submit_report_job():
+    """Queue a report for background generation; poll the returned job and download it when done"""
+    data = request.json or {}
+    if not isinstance(data, dict):
+        return jsonify({"error": "Expected a JSON object"}), 400
+    year = data.get("year")
+    if year is not None:
+        try:
+            year = int(year)
+        except (TypeError, ValueError):
+            return jsonify({"error": "Invalid year"}), 400
+    try:
+        job, error = ReportJobs.submit(
+            data.get("type", "students"), data.get("format", "excel"),
+            year=year, student_id=data.get("student_id")
+        )
+    except ReportQueueFull as full:
+        return jsonify({"error": full.message}), 429, {"Retry-After": str(full.retry_after)}
+    if error:
+        return jsonify({"error": error}), 400
+    return jsonify(job.serialize()), 202, {"Location": url_for("hod.report_job_status", job_id=job.job_id)}
+
+
+@hod_blueprint.route("/report/jobs/<job_id>", methods=["GET"])
+@login_required
+def report_job_status(job_id):
+    """Status of a report job"""
+    job = ReportJobs.get(job_id)
+    if not job:
+        return jsonify({"error": "Report job not found"}), 404
+    return jsonify(job.serialize())
+
+
+@hod_blueprint.route("/report/jobs/<job_id>/download", methods=["GET"])
+@login_required
+def download_report_job(job_id):
+    """Download the file of a finished report job"""
+    job = ReportJobs.get(job_id)
+    if not job:
+        return jsonify({"error": "Report job not found"}), 404
+    if job.status != "done":
+        return jsonify({"error": "Report is not ready", "status": job.status}), 409
+    if not os.path.exists(job.file_path):
+        return jsonify({"error": "Report file has expired, submit the job again"}), 410
+    return send_file(job.file_path, as_attachment=True)
@@ -1,25 +1,22 @@
 import os
 
-from flask import Blueprint, request, jsonify, send_file
+from flask import Blueprint, request, jsonify, send_file, g, current_app, url_for
 
-from app.models import Subject, Student
 from app.modules.reporting_module import ReportingModule
+from app.modules.report_jobs import ReportJobs, ReportQueueFull
 from app.modules.session_manager import SessionManager
+from app.modules.login_guard import LoginGuard, LoginRejected
 from app.modules.teacher_module import TeacherModule
 from app.modules.student_module import StudentModule
 from app.modules.marks_module import MarksModule
 from app.modules.middleware import teacher_login_required as login_required, teacher_login_required
+from app.modules.table_versions import conditional_get
 
 teacher_blueprint = Blueprint("teacher", __name__)
 
-# Helper function to get subject ID for a teacher
+# Helper function to get subject ID for a teacher (resolved once per request by the middleware)
 def get_teacher_subject_id(request):
-    teacher_id = SessionManager.get_user_id_from_session_id(request.cookies.get("session_id"), role="teacher")
-    if teacher_id:
-        teacher = TeacherModule.get_teacher_by_id(teacher_id)
-        if teacher:
-            return teacher.subject_id
-    return None
+    return g.get("subject_id")
 
 # -------------------- Teacher Authentication --------------------
 @teacher_blueprint.route("/login", methods=["POST"])
@@ -27,8 +24,12 @@ def teacher_login():
     data = request.json
     email = data["email"]
     password = data["password"]
-    teacher = TeacherModule.get_teacher_by_email(email)
-    if teacher and teacher.check_password(password):
+    try:
+        LoginGuard.admit(request.remote_addr, email)
+        teacher = TeacherModule.login(email, password)
+    except LoginRejected as rejected:
+        return jsonify({"success": False, "error": rejected.message}), 429, {"Retry-After": str(rejected.retry_after)}
+    if teacher:
         session_id = SessionManager.create_session(user_id=teacher.teacher_id, role="teacher")
         if session_id:
             response = jsonify({"success": True})
@@ -42,21 +43,37 @@ def teacher_login():
 
 @teacher_blueprint.route("/students", methods=["GET"])
 @teacher_login_required
+@conditional_get("students", key=lambda: (g.year,))
 def list_students():
-    subject_id = get_teacher_subject_id(request)
-    if not subject_id:
+    subject = g.subject
+    if not subject:
         return jsonify({"error": "Unauthorized or subject not found"}), 403
 
-    subject = Subject.query.get(subject_id)
-    if not subject:
-        return jsonify({"error": "Subject not found"}), 404
+    return jsonify(StudentModule.list_students(year=subject.year))
 
-    students = Student.query.filter_by(current_year=subject.year).all() #filter students
 
-    return jsonify([student.serialize() for student in students])
 
 
+@teacher_blueprint.route("/gradebook", methods=["GET"])
+@teacher_login_required
+@conditional_get("students", "subjects", "marks", key=lambda: (g.subject_id,))
+def get_gradebook():
+    """Every student of the teacher's subject year with all four mark types, in columnar form"""
+    if not g.subject:
+        return jsonify({"error": "Unauthorized or subject not found"}), 403
+    return jsonify(MarksModule.get_gradebook(g.subject))
+
 
+@teacher_blueprint.route("/totals", methods=["GET"])
+@teacher_login_required
+@conditional_get("marks", key=lambda: (g.subject_id,))
+def get_subject_totals():
+    """Per-student totals and percentages for the teacher's subject, highest total first"""
+    subject_id = get_teacher_subject_id(request)
+    if not subject_id:
+        return jsonify({"error": "Unauthorized or subject not found"}), 403
+    totals = MarksModule.get_subject_totals(subject_id)
+    return jsonify([dict(total.serialize(), rank=rank) for rank, total in enumerate(totals, start=1)])
 
 
 # -------------------- Manual Marks (Experiments) --------------------
@@ -246,6 +263,22 @@ def delete_sla_marks(sla_marks_id):
     return jsonify({"success": success})
 
 
+# -------------------- Batch Marks --------------------
+@teacher_blueprint.route("/marks/batch", methods=["POST"])
+@teacher_login_required
+def upsert_marks_batch():
+    """Insert or update manual, practical, class test and SLA marks for many students at once"""
+    data = request.json or {}
+    subject_id = get_teacher_subject_id(request)
+    if not subject_id:
+        return jsonify({"error": "Unauthorized or subject not found"}), 403
+
+    result, error = MarksModule.bulk_upsert_marks(subject_id, data)
+    if error:
+        return jsonify({"error": error}), 400
+    return jsonify({"success": True, **result})
+
+
 #
 @teacher_blueprint.route("/report/students", methods=["GET"])
 @login_required
@@ -255,20 +288,16 @@ def download_student_report():
     if file_format not in ["excel", "pdf"]:
         return jsonify({"error": "Invalid format. Use 'excel' or 'pdf'."}), 400
 
-    # Get the subject ID assigned to the teacher
-    subject_id = get_teacher_subject_id(request)
-    if not subject_id:
-        return jsonify({"error": "Unauthorized or subject not found"}), 403
-
-    # Fetch the subject to get the associated year
-    subject = Subject.query.get(subject_id)
-    if not subject:
-        return jsonify({"error": "Subject not found"}), 404
-
     # Use the year from the teacher's subject
-    year = subject.year
+    year = g.year
+    if year is None:
+        return jsonify({"error": "Unauthorized or subject not found"}), 403
 
     # Generate the report for students in that year
+    if file_format == "excel" and current_app.config.get("REPORT_STREAMING"):
+        buffer, filename = ReportingModule.generate_student_report(file_format=file_format, year=year, stream=True)
+        return send_file(buffer, as_attachment=True, download_name=filename, mimetype=ReportingModule.XLSX_MIMETYPE)
+
     file_path = ReportingModule.generate_student_report(file_format=file_format, year=year)
 
     if not file_path or not os.path.exists(file_path):
@@ -285,6 +314,13 @@ def download_single_student_report(student_id):
     if file_format not in ["excel", "pdf"]:
         return jsonify({"error": "Invalid format. Use 'excel' or 'pdf'."}), 400
 
+    if file_format == "excel" and current_app.config.get("REPORT_STREAMING"):
+        result = ReportingModule.generate_single_student_report(student_id, file_format, stream=True)
+        if not result:
+            return jsonify({"error": "Student not found or report generation failed"}), 404
+        buffer, filename = result
+        return send_file(buffer, as_attachment=True, download_name=filename, mimetype=ReportingModule.XLSX_MIMETYPE)
+
     file_path = ReportingModule.generate_single_student_report(student_id, file_format)
 
     if not file_path or not os.path.exists(file_path):
@@ -292,14 +328,61 @@ def download_single_student_report(student_id):
 
     return send_file(file_path, as_attachment=True)
 
+def _teacher_can_access(job):
+    """Teachers may fetch any single student report, but only the year report of their subject's year"""
+    return job.report_type == "student" or job.year == g.year
+
+
+@teacher_blueprint.route("/report/jobs", methods=["POST"])
+@login_required
+def submit_report_job():
+    """Queue a report for background generation; year reports are for the teacher's subject year"""
+    data = request.json or {}
+    if not isinstance(data, dict):
+        return jsonify({"error": "Expected a JSON object"}), 400
+    if g.year is None:
+        return jsonify({"error": "Unauthorized or subject not found"}), 403
+    try:
+        job, error = ReportJobs.submit(
+            data.get("type", "students"), data.get("format", "excel"),
+            year=g.year, student_id=data.get("student_id")
+        )
+    except ReportQueueFull as full:
+        return jsonify({"error": full.message}), 429, {"Retry-After": str(full.retry_after)}
+    if error:
+        return jsonify({"error": error}), 400
+    return jsonify(job.serialize()), 202, {"Location": url_for("teacher.report_job_status", job_id=job.job_id)}
+
+
+@teacher_blueprint.route("/report/jobs/<job_id>", methods=["GET"])
+@login_required
+def report_job_status(job_id):
+    """Status of a report job"""
+    job = ReportJobs.get(job_id)
+    if not job or not _teacher_can_access(job):
+        return jsonify({"error": "Report job not found"}), 404
+    return jsonify(job.serialize())
+
+
+@teacher_blueprint.route("/report/jobs/<job_id>/download", methods=["GET"])
+@login_required
+def download_report_job(job_id):
+    """Download the file of a finished report job"""
+    job = ReportJobs.get(job_id)
+    if not job or not _teacher_can_access(job):
+        return jsonify({"error": "Report job not found"}), 404
+    if job.status != "done":
+        return jsonify({"error": "Report is not ready", "status": job.status}), 409
+    if not os.path.exists(job.file_path):
+        return jsonify({"error": "Report file has expired, submit the job again"}), 410
+    return send_file(job.file_path, as_attachment=True)
+
 
 # -------------------- Get Teacher Details --------------------
 @teacher_blueprint.route("/details", methods=["GET"])
 @login_required
 def get_teacher_details():
-    session_id = request.cookies.get("session_id")
-    teacher_id = SessionManager.get_user_id_from_session_id(session_id, role="teacher")
-    teacher = TeacherModule.get_teacher_by_id(teacher_id)
+    teacher = g.teacher
 
     if teacher:
         return jsonify(teacher.serialize())
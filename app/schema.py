@@ -0,0 +1,66 @@
+import sqlalchemy as sa
+
+from app.extensions import db
+
+
+def missing_indexes():
+    """Returns (table, index) for every model index missing from a table that already exists"""
+    inspector = sa.inspect(db.engine)
+    existing_tables = set(inspector.get_table_names())
+    missing = []
+    for table in db.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        existing = {index["name"] for index in inspector.get_indexes(table.name)}
+        missing += [(table, index) for index in table.indexes if index.name not in existing]
+    return missing
+
+
+def duplicate_rows(conn, table, columns):
+    """
+    Rows a unique index on columns would reject: every row but the most recently inserted one
+    (highest primary key) of each key, as migration 3b8f2c1d9a4e removes them.
+    """
+    pk = table.primary_key.columns.values()[0].name
+    key = ", ".join(columns)
+    return conn.execute(sa.text(
+        f"SELECT * FROM {table.name} WHERE {pk} NOT IN (SELECT MAX({pk}) FROM {table.name} GROUP BY {key}) "
+        f"ORDER BY {key}, {pk}"
+    )).mappings().all()
+
+
+def check_indexes(app):
+    """
+    Warns about model indexes missing from existing tables; db.create_all() only indexes the tables
+    it creates. Nothing is changed here: 'flask db upgrade' or 'flask schema repair-indexes' adds them.
+    """
+    missing = missing_indexes()
+    if missing:
+        app.logger.warning(
+            "Missing indexes %s; mark writes fail until the unique ones exist. Run 'flask db upgrade', or "
+            "'flask schema repair-indexes --dry-run' to see the duplicate rows blocking them.",
+            ", ".join(index.name for _, index in missing)
+        )
+    return missing
+
+
+def check_totals(app):
+    """
+    Warns when student_subject_totals is empty but marks exist (a table created by create_all on an
+    old database). Migration 8d41e7a0c2f5 or 'flask marks rebuild-totals' fills it; reports read it.
+    """
+    from app.models import ManualMarks, PracticalMarks, ClassTestMarks, SLAMarks, StudentSubjectTotal
+
+    if db.session.query(StudentSubjectTotal.student_id).first() is not None:
+        return True
+    if not any(db.session.query(model.student_id).first() is not None
+               for model in (ManualMarks, PracticalMarks, ClassTestMarks, SLAMarks)):
+        return True
+    app.logger.warning("student_subject_totals is empty but marks exist; run 'flask marks rebuild-totals'")
+    return False
+
+
+def check_schema(app):
+    """Checks a database created by an older version for what create_all leaves out; call after db.create_all()"""
+    check_indexes(app)
+    check_totals(app)
@@ -0,0 +1,71 @@
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+from app.extensions import db
+
+
+@contextmanager
+def count_queries():
+    """
+    Counts the SQL statements executed inside the block (needs an app context).
+
+        with count_queries() as queries:
+            client.get("/api/hod/teachers")
+        print(queries.count, queries.statements)
+    """
+    class Counter:
+        count = 0
+        statements = []
+
+    counter = Counter()
+    counter.statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        counter.count += 1
+        counter.statements.append(statement)
+
+    engine = db.engine
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield counter
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+def assert_queries_independent_of_size(populate, call, sizes=(2, 20)):
+    """
+    Fails when the number of queries issued by `call()` grows with the size of the data set.
+
+    `populate(size)` must bring the data set to `size` rows (e.g. teachers or students) and
+    `call()` runs the code under test, typically a test client request. Catches N+1 loading:
+
+        assert_queries_independent_of_size(
+            populate=lambda n: create_teachers(n),
+            call=lambda: client.get("/api/hod/teachers"),
+        )
+
+    The in-process caches are cleared before every call so each size is measured cold; a
+    call answered with 304 (a request sending If-None-Match) fails, as it ran no queries.
+    """
+    from app.modules.ref_cache import RefCache
+    from app.modules.year_cache import YearCache
+
+    counts = {}
+    for size in sizes:
+        populate(size)
+        RefCache.clear()
+        YearCache.clear()
+        with count_queries() as queries:
+            result = call()
+        if getattr(result, "status_code", None) == 304:
+            raise AssertionError("Response was 304 Not Modified, so no queries were measured; don't send validators")
+        counts[size] = queries
+    if len({queries.count for queries in counts.values()}) > 1:
+        largest = counts[max(sizes)]
+        raise AssertionError(
+            "Query count grows with result size: "
+            + ", ".join(f"{size} rows → {queries.count} queries" for size, queries in counts.items())
+            + "\nStatements for the largest size:\n  " + "\n  ".join(largest.statements)
+        )
+    return {size: queries.count for size, queries in counts.items()}
@@ -0,0 +1,146 @@
+"""
+Renders a 2,000 row marks table with the previous per-report PDF class (recursive create_table,
+a new page every 20 rows, logo looked up in header()) and with the shared ReportPDF renderer,
+then renders many one-page documents with a logo to show the effect of the parsed-logo cache.
+
+    python benchmarks/bench_pdf_tables.py [rows]
+"""
+import os
+import struct
+import sys
+import tempfile
+import time
+import tracemalloc
+import zlib
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fpdf import FPDF
+
+from app.modules.pdf_report import ReportPDF
+
+HEADERS = ['Sr. No.', 'Enrollment No.', 'Exam Seat No.', 'Name', 'Exp. Marks', 'Practical', 'Class Test Avg', 'SLA Total', 'Total']
+COL_WIDTHS = [20, 40, 40, 50, 30, 30, 30, 30, 30]
+DOCUMENTS = 200
+
+
+class LegacyPDF(FPDF):
+    """The table class previously defined inside each PDF report function"""
+
+    logo_path = None
+
+    def __init__(self):
+        super().__init__(orientation='L')
+        self.set_auto_page_break(auto=True, margin=15)
+
+    def header(self):
+        if self.logo_path and os.path.exists(self.logo_path):
+            self.image(self.logo_path, 10, 8, 25)
+        self.set_font('Arial', 'B', 16)
+        self.cell(0, 10, 'SUBJECT REPORT', 0, 1, 'C')
+        self.set_font('Arial', 'I', 10)
+        self.cell(0, 10, f'Generated on: {datetime.now().strftime("%Y-%m-%d %H:%M")}', 0, 1, 'C')
+        self.ln(5)
+
+    def footer(self):
+        self.set_y(-15)
+        self.set_font('Arial', 'I', 8)
+        self.cell(0, 10, f'Page {self.page_no()}', 0, 0, 'C')
+
+    def section_title(self, title):
+        self.set_font('Arial', 'B', 12)
+        self.set_fill_color(41, 128, 185)
+        self.set_text_color(255, 255, 255)
+        self.cell(0, 10, title, 1, 1, 'C', True)
+        self.ln(2)
+
+    def create_table(self, headers, data, col_widths, max_rows_per_page=20):
+        self.set_font('Arial', 'B', 10)
+        self.set_fill_color(52, 152, 219)
+        self.set_text_color(255, 255, 255)
+        for i, header in enumerate(headers):
+            self.cell(col_widths[i], 10, str(header), 1, 0, 'C', True)
+        self.ln()
+        self.set_font('Arial', '', 9)
+        self.set_text_color(0, 0, 0)
+
+        row_count = 0
+        for row in data:
+            if row_count >= max_rows_per_page:
+                self.add_page()
+                self.section_title(self.current_section)
+                self.create_table(headers, data[row_count:], col_widths, max_rows_per_page)
+                break
+            for i, value in enumerate(row):
+                self.cell(col_widths[i], 8, str(value), 1, 0, 'C')
+            self.ln()
+            row_count += 1
+        self.ln(5)
+
+
+def legacy(rows, logo_path=None):
+    LegacyPDF.logo_path = logo_path
+    pdf = LegacyPDF()
+    pdf.add_page()
+    pdf.section_title("OVERVIEW")
+    pdf.current_section = "OVERVIEW"
+    pdf.create_table(HEADERS, rows, COL_WIDTHS)
+    return pdf
+
+
+def shared(rows, logo_path=None):
+    pdf = ReportPDF('SUBJECT REPORT', logo_path)
+    pdf.add_page()
+    pdf.section_title("OVERVIEW")
+    pdf.table(HEADERS, rows, COL_WIDTHS)
+    return pdf
+
+
+def write_png(path, width=200, height=80):
+    """Writes a plain RGB PNG, standing in for static/img/logo.png"""
+    raw = b"".join(b"\x00" + b"".join(bytes((x % 256, y % 256, 128)) for x in range(width)) for y in range(height))
+
+    def chunk(kind, data):
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+    with open(path, "wb") as png:
+        png.write(b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+                  + chunk(b"IDAT", zlib.compress(raw)) + chunk(b"IEND", b""))
+
+
+def measure(render, *args):
+    """Returns (ms, peak MiB, pages) of rendering and serializing one document"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    pdf = render(*args)
+    pdf.output(dest="S")
+    elapsed = (time.perf_counter() - start) * 1000
+    peak = tracemalloc.get_traced_memory()[1] / 2 ** 20
+    tracemalloc.stop()
+    return elapsed, peak, pdf.page_no()
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    rows = [[i, f"EN{i:06d}", f"SEAT{i:06d}", f"Student {i}", 180, 75, 24.5, 22, 301.5] for i in range(1, count + 1)]
+    logo_path = os.path.join(tempfile.mkdtemp(), "logo.png")
+    write_png(logo_path)
+
+    print(f"{count} rows, one table")
+    print(f"{'renderer':>10}{'ms':>10}{'peak MiB':>10}{'pages':>8}")
+    for name, render in (("legacy", legacy), ("ReportPDF", shared)):
+        elapsed, peak, pages = measure(render, rows)
+        print(f"{name:>10}{elapsed:>10.0f}{peak:>10.1f}{pages:>8}")
+
+    print(f"\n{DOCUMENTS} one-page documents with a logo")
+    print(f"{'renderer':>10}{'ms':>10}")
+    for name, render in (("legacy", legacy), ("ReportPDF", shared)):
+        start = time.perf_counter()
+        for _ in range(DOCUMENTS):
+            render(rows[:10], logo_path).output(dest="S")
+        print(f"{name:>10}{(time.perf_counter() - start) * 1000:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Times year-wide report generation (data collection + Excel + PDF rendering) for growing
+numbers of students. With the indexed lookups the time per student should stay flat.
+
+    python benchmarks/bench_reports.py [max_students]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.config import Config
+
+# Every file the app writes goes to a temp dir, never into instance/ or app/reports
+BENCH_DIR = tempfile.mkdtemp()
+Config.SQLALCHEMY_DATABASE_URI = "sqlite:///" + os.path.join(BENCH_DIR, "bench.db")
+Config.SESSION_STORE_PATH = os.path.join(BENCH_DIR, "sessions.db")
+Config.REF_CACHE_PATH = os.path.join(BENCH_DIR, "ref_cache.db")
+
+from app import create_app
+from app.extensions import db
+from app.models import Student, Subject, ManualMarks, PracticalMarks, ClassTestMarks, SLAMarks
+from app.modules.reporting_module import ReportingModule
+
+ReportingModule.REPORTS_DIR = os.path.join(BENCH_DIR, "reports")  # read by create_app()
+
+SUBJECTS = 6
+EXPERIMENTS = 8
+
+
+def seed(count):
+    subjects = [Subject(subject_name=f"Subject {i}", year=2) for i in range(SUBJECTS)]
+    db.session.add_all(subjects)
+    db.session.add_all(
+        Student(name=f"Student {i}", email=f"student{i}@example.com", phone=f"9{i:09d}", dob="2004-01-01",
+                gender="M", address="Pune", admission_year=2023, current_year=2,
+                enrollment_number=f"EN{i:06d}", exam_seat_number=f"SEAT{i:06d}")
+        for i in range(count)
+    )
+    db.session.commit()
+
+    rng = random.Random(42)
+    student_ids = [student_id for (student_id,) in db.session.query(Student.student_id)]
+    manual, practical, class_test, sla = [], [], [], []
+    for student_id in student_ids:
+        for subject in subjects:
+            key = {"student_id": student_id, "subject_id": subject.subject_id}
+            manual += [dict(key, experiment_number=n, marks_obtained=rng.randint(0, 25)) for n in range(1, EXPERIMENTS + 1)]
+            practical.append(dict(key, practical_exam_marks=rng.randint(0, 100)))
+            class_test.append(dict(key, class_test_1=rng.randint(0, 30), class_test_2=rng.randint(0, 30)))
+            sla.append(dict(key, micro_project=rng.randint(0, 10), assignment=rng.randint(0, 10), other_marks=rng.randint(0, 5)))
+    for model, rows in ((ManualMarks, manual), (PracticalMarks, practical), (ClassTestMarks, class_test), (SLAMarks, sla)):
+        db.session.execute(model.__table__.insert(), rows)
+    db.session.commit()
+
+
+def timed(func):
+    start = time.perf_counter()
+    func()
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    max_students = int(sys.argv[1]) if len(sys.argv) > 1 else 1600
+    sizes = [max_students // 8, max_students // 4, max_students // 2, max_students]
+    app = create_app()
+
+    with app.app_context():
+        seed(max_students)
+        students = Student.query.order_by(Student.student_id).all()
+        print(f"{SUBJECTS} subjects, {EXPERIMENTS} experiments per subject (ms, µs per student in brackets)")
+        print(f"{'students':>9}{'collect':>18}{'excel':>18}{'pdf':>18}")
+        for size in sizes:
+            subset = students[:size]
+            collect = timed(lambda: ReportingModule._collect_student_data(subset))
+            excel = timed(lambda: ReportingModule._generate_excel_report(subset))
+            pdf = timed(lambda: ReportingModule._generate_pdf_report(subset))
+            print(f"{size:>9}" + "".join(f"{ms:>10.0f} ({ms * 1000 / size:>5.0f})" for ms in (collect, excel, pdf)))
+
+
+if __name__ == "__main__":
+    main()
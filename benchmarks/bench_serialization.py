@@ -0,0 +1,84 @@
+"""
+Compares the student list paths: ORM instances + serialize() against the column projection,
+each encoded with the stdlib JSON provider and (when installed) the orjson provider.
+
+    python benchmarks/bench_serialization.py [number_of_students]
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.config import Config
+
+# Every file the app writes goes to a temp dir, never into instance/ or app/reports
+BENCH_DIR = tempfile.mkdtemp()
+Config.SQLALCHEMY_DATABASE_URI = "sqlite:///" + os.path.join(BENCH_DIR, "bench.db")
+Config.SESSION_STORE_PATH = os.path.join(BENCH_DIR, "sessions.db")
+Config.REF_CACHE_PATH = os.path.join(BENCH_DIR, "ref_cache.db")
+
+from flask.json.provider import DefaultJSONProvider
+
+from app import create_app
+from app.extensions import db
+from app.json_provider import OrjsonProvider, orjson
+from app.models import Student
+from app.modules.student_module import StudentModule
+
+REPEAT = 5
+
+
+def seed(count):
+    db.session.add_all(
+        Student(name=f"Student {i}", email=f"student{i}@example.com", phone=f"9{i:09d}", dob="2004-01-01",
+                gender="M", address="Pune", admission_year=2023, current_year=2,
+                enrollment_number=f"EN{i:06d}", exam_seat_number=f"SEAT{i:06d}")
+        for i in range(count)
+    )
+    db.session.commit()
+
+
+def orm_path():
+    return [student.serialize() for student in Student.query.all()]
+
+
+def projection_path():
+    return StudentModule.list_students()
+
+
+def best_of(func):
+    """Best wall time of REPEAT runs, in milliseconds"""
+    timings = []
+    for _ in range(REPEAT):
+        db.session.expire_all()
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return min(timings)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    app = create_app()
+    providers = [("json", DefaultJSONProvider(app))]
+    if orjson is not None:
+        providers.append(("orjson", OrjsonProvider(app)))
+    else:
+        print("⚠️ orjson not installed, only the default provider is measured")
+
+    with app.app_context():
+        seed(count)
+        print(f"{count} students, best of {REPEAT} runs (ms)")
+        print(f"{'path':<12}{'provider':<10}{'query+build':>13}{'encode':>10}{'total':>10}")
+        for name, build in (("orm", orm_path), ("projection", projection_path)):
+            rows = build()
+            build_ms = best_of(build)
+            for provider_name, provider in providers:
+                encode_ms = best_of(lambda: provider.dumps(rows, separators=(",", ":")))
+                print(f"{name:<12}{provider_name:<10}{build_ms:>13.1f}{encode_ms:>10.1f}{build_ms + encode_ms:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""unique (student_id, subject_id) indexes on mark tables, year indexes
+
+Duplicate mark rows are compacted first, keeping the most recently inserted
+row for each key, so the unique indexes can be created on existing data.
+
+Revision ID: 3b8f2c1d9a4e
+Revises: 6efd523a0007
+Create Date: 2026-10-18 10:12:31.482910
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3b8f2c1d9a4e'
+down_revision = '6efd523a0007'
+branch_labels = None
+depends_on = None
+
+
+# table → (primary key, unique key columns, unique index name)
+MARK_TABLES = {
+    'manual_marks': ('manual_marks_id', ['student_id', 'subject_id', 'experiment_number'],
+                     'ux_manual_marks_student_subject_experiment'),
+    'practical_marks': ('practical_marks_id', ['student_id', 'subject_id'], 'ux_practical_marks_student_subject'),
+    'class_test_marks': ('class_test_marks_id', ['student_id', 'subject_id'], 'ux_class_test_marks_student_subject'),
+    'sla_marks': ('sla_marks_id', ['student_id', 'subject_id'], 'ux_sla_marks_student_subject'),
+}
+
+
+def _index_names(table):
+    return {index['name'] for index in sa.inspect(op.get_bind()).get_indexes(table)}
+
+
+def upgrade():
+    # 'flask schema repair-indexes' or db.create_all() may have created any of these already
+    for table, (pk, columns, index_name) in MARK_TABLES.items():
+        if index_name in _index_names(table):
+            continue
+        # The derived table keeps this valid on MySQL, which rejects a subquery on the DELETE target
+        removed = op.get_bind().execute(sa.text(
+            f"DELETE FROM {table} WHERE {pk} NOT IN ("
+            f"SELECT keep_id FROM (SELECT MAX({pk}) AS keep_id FROM {table} GROUP BY {', '.join(columns)}) AS keep)"
+        )).rowcount
+        if removed:
+            print(f"⚠️ Deleted {removed} duplicate {table} rows, keeping the newest row of each key")
+        op.create_index(index_name, table, columns, unique=True)
+
+    if 'ix_students_current_year' not in _index_names('students'):
+        op.create_index('ix_students_current_year', 'students', ['current_year'])
+    if 'ix_subjects_year' not in _index_names('subjects'):
+        op.create_index('ix_subjects_year', 'subjects', ['year'])
+
+
+def downgrade():
+    op.drop_index('ix_subjects_year', table_name='subjects')
+    op.drop_index('ix_students_current_year', table_name='students')
+
+    for table, (_, _, index_name) in MARK_TABLES.items():
+        op.drop_index(index_name, table_name=table)
@@ -0,0 +1,71 @@
+"""student_subject_totals table, backfilled from the mark tables
+
+Revision ID: 8d41e7a0c2f5
+Revises: 3b8f2c1d9a4e
+Create Date: 2026-10-18 11:03:54.217336
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8d41e7a0c2f5'
+down_revision = '3b8f2c1d9a4e'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # The app's create_all may have created the (empty) table already; the backfill below runs either way
+    if not sa.inspect(op.get_bind()).has_table('student_subject_totals'):
+        op.create_table('student_subject_totals',
+            sa.Column('student_id', sa.Integer(), nullable=False),
+            sa.Column('subject_id', sa.Integer(), nullable=False),
+            sa.Column('experiment_total', sa.Float(), nullable=False),
+            sa.Column('practical_exam_marks', sa.Float(), nullable=False),
+            sa.Column('class_test_average', sa.Float(), nullable=False),
+            sa.Column('sla_total', sa.Float(), nullable=False),
+            sa.Column('total', sa.Float(), nullable=False),
+            sa.ForeignKeyConstraint(['student_id'], ['students.student_id'], ),
+            sa.ForeignKeyConstraint(['subject_id'], ['subjects.subject_id'], ),
+            sa.PrimaryKeyConstraint('student_id', 'subject_id')
+        )
+    indexes = {index['name'] for index in sa.inspect(op.get_bind()).get_indexes('student_subject_totals')}
+    if 'ix_student_subject_totals_subject_total' not in indexes:
+        op.create_index('ix_student_subject_totals_subject_total', 'student_subject_totals', ['subject_id', 'total'])
+
+    # Rows the app wrote before the upgrade are rebuilt with the rest
+    op.execute(sa.text("DELETE FROM student_subject_totals"))
+
+    # Same arithmetic as MarksModule._compute_totals; the unique indexes from 3b8f2c1d9a4e
+    # guarantee at most one practical / class test / SLA row per pair.
+    op.execute(sa.text("""
+        INSERT INTO student_subject_totals
+            (student_id, subject_id, experiment_total, practical_exam_marks, class_test_average, sla_total, total)
+        SELECT student_id, subject_id, experiment_total, practical_exam_marks, class_test_average, sla_total,
+               experiment_total + practical_exam_marks + class_test_average + sla_total
+        FROM (
+            SELECT k.student_id, k.subject_id,
+                   COALESCE((SELECT SUM(m.marks_obtained) FROM manual_marks m
+                             WHERE m.student_id = k.student_id AND m.subject_id = k.subject_id), 0) AS experiment_total,
+                   COALESCE((SELECT p.practical_exam_marks FROM practical_marks p
+                             WHERE p.student_id = k.student_id AND p.subject_id = k.subject_id), 0) AS practical_exam_marks,
+                   COALESCE((SELECT (COALESCE(c.class_test_1, 0) + COALESCE(c.class_test_2, 0)) / 2.0 FROM class_test_marks c
+                             WHERE c.student_id = k.student_id AND c.subject_id = k.subject_id), 0) AS class_test_average,
+                   COALESCE((SELECT COALESCE(s.micro_project, 0) + COALESCE(s.assignment, 0) + COALESCE(s.other_marks, 0)
+                             FROM sla_marks s
+                             WHERE s.student_id = k.student_id AND s.subject_id = k.subject_id), 0) AS sla_total
+            FROM (
+                SELECT student_id, subject_id FROM manual_marks
+                UNION SELECT student_id, subject_id FROM practical_marks
+                UNION SELECT student_id, subject_id FROM class_test_marks
+                UNION SELECT student_id, subject_id FROM sla_marks
+            ) AS k
+        ) AS e
+    """))
+
+
+def downgrade():
+    op.drop_index('ix_student_subject_totals_subject_total', table_name='student_subject_totals')
+    op.drop_table('student_subject_totals')
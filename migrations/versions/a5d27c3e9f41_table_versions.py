@@ -0,0 +1,50 @@
+"""table_versions counters in the main database
+
+The counters behind the list ETags and the report cache used to live in a SQLite file per host,
+bumped after each commit. Writes now bump them in their own transaction. Every counter starts
+with a fresh modified_at, so ETags and cached reports from before the upgrade never match.
+
+Revision ID: a5d27c3e9f41
+Revises: e7b3d05a9c18
+Create Date: 2026-10-18 19:05:12.331847
+
+"""
+import time
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a5d27c3e9f41'
+down_revision = 'e7b3d05a9c18'
+branch_labels = None
+depends_on = None
+
+NAMES = ('students', 'subjects', 'teachers', 'marks')
+
+
+def upgrade():
+    # The app's create_all may have created the table already
+    if not sa.inspect(op.get_bind()).has_table('table_versions'):
+        op.create_table('table_versions',
+            sa.Column('name', sa.String(length=50), nullable=False),
+            sa.Column('version', sa.Integer(), nullable=False),
+            sa.Column('modified_at', sa.Float(), nullable=False),
+            sa.PrimaryKeyConstraint('name')
+        )
+
+    table_versions = sa.table('table_versions', sa.column('name'), sa.column('version'), sa.column('modified_at'))
+    bind = op.get_bind()
+    existing = {row[0] for row in bind.execute(sa.select(table_versions.c.name))}
+    now = time.time()
+    for name in NAMES:
+        if name in existing:
+            bind.execute(table_versions.update().where(table_versions.c.name == name)
+                         .values(version=table_versions.c.version + 1, modified_at=now))
+        else:
+            bind.execute(table_versions.insert().values(name=name, version=1, modified_at=now))
+
+
+def downgrade():
+    op.drop_table('table_versions')
@@ -0,0 +1,46 @@
+"""report_jobs table for background report generation
+
+Revision ID: c4a9e1f7b2d6
+Revises: 8d41e7a0c2f5
+Create Date: 2026-10-18 14:21:07.635194
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4a9e1f7b2d6'
+down_revision = '8d41e7a0c2f5'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # The app's create_all may have created the table (with its indexes) already
+    if sa.inspect(op.get_bind()).has_table('report_jobs'):
+        return
+
+    op.create_table('report_jobs',
+        sa.Column('job_id', sa.String(length=32), nullable=False),
+        sa.Column('report_type', sa.String(length=20), nullable=False),
+        sa.Column('file_format', sa.String(length=10), nullable=False),
+        sa.Column('year', sa.Integer(), nullable=True),
+        sa.Column('student_id', sa.Integer(), nullable=True),
+        sa.Column('dedupe_key', sa.String(length=64), nullable=False),
+        sa.Column('status', sa.String(length=10), nullable=False),
+        sa.Column('file_path', sa.String(length=500), nullable=True),
+        sa.Column('error', sa.String(length=500), nullable=True),
+        sa.Column('created_at', sa.Float(), nullable=False),
+        sa.Column('started_at', sa.Float(), nullable=True),
+        sa.Column('finished_at', sa.Float(), nullable=True),
+        sa.PrimaryKeyConstraint('job_id')
+    )
+    op.create_index('ix_report_jobs_dedupe_key_status', 'report_jobs', ['dedupe_key', 'status'])
+    op.create_index('ix_report_jobs_status_created_at', 'report_jobs', ['status', 'created_at'])
+
+
+def downgrade():
+    op.drop_index('ix_report_jobs_status_created_at', table_name='report_jobs')
+    op.drop_index('ix_report_jobs_dedupe_key_status', table_name='report_jobs')
+    op.drop_table('report_jobs')
@@ -0,0 +1,32 @@
+"""progress counters on report_jobs for bulk report card jobs
+
+Revision ID: e7b3d05a9c18
+Revises: c4a9e1f7b2d6
+Create Date: 2026-10-18 15:02:44.918352
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e7b3d05a9c18'
+down_revision = 'c4a9e1f7b2d6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # The app's create_all may have created report_jobs with these columns already
+    columns = {column['name'] for column in sa.inspect(op.get_bind()).get_columns('report_jobs')}
+    with op.batch_alter_table('report_jobs') as batch_op:
+        if 'progress' not in columns:
+            batch_op.add_column(sa.Column('progress', sa.Integer(), nullable=False, server_default='0'))
+        if 'total' not in columns:
+            batch_op.add_column(sa.Column('total', sa.Integer(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('report_jobs') as batch_op:
+        batch_op.drop_column('total')
+        batch_op.drop_column('progress')
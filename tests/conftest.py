@@ -0,0 +1,76 @@
+import pytest
+
+from app import create_app
+from app.config import Config
+from app.extensions import db
+from app.models import Student, Subject, Teacher
+
+
+@pytest.fixture
+def make_app(tmp_path, monkeypatch):
+    """Builds the app on a fresh SQLite database under tmp_path, with config overrides"""
+    def make_app(**overrides):
+        settings = {
+            "SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'test.db'}",
+            "SESSION_SWEEP_INTERVAL": 0,
+            "BCRYPT_LOG_ROUNDS": 4,  # the minimum; keeps logins fast
+            **overrides,
+        }
+        for name, value in settings.items():
+            monkeypatch.setattr(Config, name, value, raising=False)
+        return create_app()
+
+    return make_app
+
+
+@pytest.fixture
+def app(make_app):
+    app = make_app()
+    app.config["TESTING"] = True
+    with app.app_context():
+        yield app
+        db.session.remove()
+        db.engine.dispose()
+
+
+@pytest.fixture
+def hod_client(app):
+    client = app.test_client()
+    response = client.post("/api/hod/login", json={"email": "admin@mit.edu", "password": "admin123"})
+    assert response.status_code == 200, response.get_json()
+    return client
+
+
+@pytest.fixture
+def subject(app):
+    subject = Subject(subject_name="Mathematics", year=2)
+    db.session.add(subject)
+    db.session.commit()
+    return subject
+
+
+@pytest.fixture
+def teacher_client(app, subject):
+    teacher = Teacher(name="Teacher", email="teacher@mit.edu", phone="9000000000", subject_id=subject.subject_id)
+    teacher.set_password("teacher123")
+    db.session.add(teacher)
+    db.session.commit()
+
+    client = app.test_client()
+    response = client.post("/api/teacher/login", json={"email": "teacher@mit.edu", "password": "teacher123"})
+    assert response.status_code == 200, response.get_json()
+    return client
+
+
+@pytest.fixture
+def students(app, subject):
+    """Three students in the subject's year"""
+    students = [
+        Student(name=f"Student {i}", email=f"student{i}@example.com", phone=f"70000{i:05d}", dob="2005-01-01",
+                gender="F", address="Pune", current_year=subject.year, admission_year=2024,
+                enrollment_number=f"EN{i:05d}", exam_seat_number=f"SEAT{i:05d}")
+        for i in range(3)
+    ]
+    db.session.add_all(students)
+    db.session.commit()
+    return students
@@ -0,0 +1,60 @@
+from app.extensions import db
+from app.models import Student
+from app.modules.student_module import StudentModule
+from app.modules.table_versions import TableVersions
+
+
+def list_students(client, etag=None):
+    headers = {"If-None-Match": etag} if etag else {}
+    with client.application.app_context():
+        return client.get("/api/hod/students", headers=headers)
+
+
+def add_student(n):
+    StudentModule.create_student(f"Student {n}", f"student{n}@example.com", f"70000{n:05d}", "2005-01-01", "F",
+                                 "Pune", 2024, 2, f"EN{n:05d}", f"SEAT{n:05d}")
+
+
+def test_unchanged_list_is_not_modified(hod_client):
+    first = list_students(hod_client)
+    assert first.status_code == 200 and first.headers["ETag"]
+
+    second = list_students(hod_client, first.headers["ETag"])
+    assert second.status_code == 304
+    assert second.headers["ETag"] == first.headers["ETag"]
+
+
+def test_write_changes_the_etag(hod_client):
+    etag = list_students(hod_client).headers["ETag"]
+    add_student(1)
+
+    response = list_students(hod_client, etag)
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert len(response.get_json()) == 1
+
+
+def test_write_from_another_process_changes_the_etag(make_app, tmp_path):
+    """The counters live in the shared database, so a write by another worker is seen"""
+    shared = {"SESSION_BACKEND": "sqlite", "SESSION_STORE_PATH": str(tmp_path / "sessions.db")}
+    client = make_app(**shared).test_client()
+    with client.application.app_context():
+        client.post("/api/hod/login", json={"email": "admin@mit.edu", "password": "admin123"})
+    etag = list_students(client).headers["ETag"]
+
+    with make_app(**shared).app_context():
+        add_student(1)
+        db.session.remove()
+
+    assert list_students(client, etag).status_code == 200
+
+
+def test_rolled_back_write_keeps_the_etag(hod_client):
+    etag = list_students(hod_client).headers["ETag"]
+    db.session.add(Student(name="Ghost", email="ghost@example.com", phone="7999999999", dob="2005-01-01", gender="F",
+                           address="Pune", current_year=2, admission_year=2024, enrollment_number="EN99999",
+                           exam_seat_number="SEAT99999"))
+    TableVersions.bump("students")
+    db.session.rollback()
+
+    assert list_students(hod_client, etag).status_code == 304
@@ -0,0 +1,21 @@
+def login(client, email, forwarded_for):
+    return client.post("/api/teacher/login", json={"email": email, "password": "wrong"},
+                       headers={"X-Forwarded-For": forwarded_for})
+
+
+def test_ip_throttle_uses_forwarded_client_address(make_app):
+    app = make_app(PROXY_FIX_HOPS=1, LOGIN_IP_BURST=2, LOGIN_IP_RATE=1 / 3600)
+    client = app.test_client()
+    assert login(client, "a1@example.com", "10.0.0.1").status_code == 401
+    assert login(client, "a2@example.com", "10.0.0.1").status_code == 401
+    assert login(client, "a3@example.com", "10.0.0.1").status_code == 429
+
+    # Another client behind the same proxy has its own bucket
+    assert login(client, "b1@example.com", "10.0.0.2").status_code == 401
+
+
+def test_ip_throttle_without_proxy_fix_ignores_forwarded_header(make_app):
+    app = make_app(LOGIN_IP_BURST=1, LOGIN_IP_RATE=1 / 3600)
+    client = app.test_client()
+    assert login(client, "a1@example.com", "10.0.0.1").status_code == 401
+    assert login(client, "b1@example.com", "10.0.0.2").status_code == 429
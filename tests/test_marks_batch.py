@@ -0,0 +1,59 @@
+import pytest
+
+from app.extensions import db
+from app.models import ManualMarks, PracticalMarks, StudentSubjectTotal
+
+BATCH_URL = "/api/teacher/marks/batch"
+
+
+def batch_for(students):
+    return {
+        "manual_marks": [{"student_id": s.student_id, "experiment_number": 1, "marks_obtained": 20} for s in students],
+        "practical_marks": [{"student_id": s.student_id, "practical_exam_marks": 40} for s in students],
+    }
+
+
+def test_batch_upsert_is_idempotent(teacher_client, students):
+    for _ in range(2):
+        response = teacher_client.post(BATCH_URL, json=batch_for(students))
+        assert response.status_code == 200, response.get_json()
+        assert response.get_json()["saved"] == 2 * len(students)
+
+    assert ManualMarks.query.count() == len(students)
+    assert PracticalMarks.query.count() == len(students)
+
+
+def test_batch_upsert_updates_in_place(teacher_client, students):
+    teacher_client.post(BATCH_URL, json=batch_for(students))
+    update = {"practical_marks": [{"student_id": students[0].student_id, "practical_exam_marks": 35}]}
+    assert teacher_client.post(BATCH_URL, json=update).status_code == 200
+
+    marks = PracticalMarks.query.filter_by(student_id=students[0].student_id).all()
+    assert [m.practical_exam_marks for m in marks] == [35]
+    total = StudentSubjectTotal.query.filter_by(student_id=students[0].student_id).one()
+    assert total.practical_exam_marks == 35 and total.total == 55
+
+
+@pytest.mark.parametrize("value", ["nan", "inf", "-inf", "abc", None])
+def test_batch_rejects_invalid_values(teacher_client, students, value):
+    batch = batch_for(students)
+    batch["practical_marks"][1]["practical_exam_marks"] = value
+    response = teacher_client.post(BATCH_URL, json=batch)
+
+    assert response.status_code == 400
+    assert "Invalid practical_marks entry" in response.get_json()["error"]
+    assert ManualMarks.query.count() == 0  # the whole batch is refused
+
+
+@pytest.mark.parametrize("body", [[{"manual_marks": []}], {"practical_marks": 5}, {"other_marks": []}])
+def test_batch_rejects_malformed_body(teacher_client, students, body):
+    assert teacher_client.post(BATCH_URL, json=body).status_code == 400
+
+
+def test_batch_rejects_students_of_another_year(teacher_client, students, subject):
+    students[2].current_year = subject.year + 1
+    db.session.commit()
+
+    response = teacher_client.post(BATCH_URL, json=batch_for(students))
+    assert response.status_code == 400
+    assert str(students[2].student_id) in response.get_json()["error"]
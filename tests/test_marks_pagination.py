@@ -0,0 +1,78 @@
+import pytest
+
+from app.extensions import db
+from app.models import Subject
+from app.modules.marks_module import MarksModule
+
+
+@pytest.fixture
+def marked(teacher_client, students, subject):
+    """Practical marks for every student in two subjects, five (student, subject) pairs in all"""
+    other = Subject(subject_name="Physics", year=subject.year)
+    db.session.add(other)
+    db.session.commit()
+    response = teacher_client.post("/api/teacher/marks/batch", json={
+        "practical_marks": [{"student_id": s.student_id, "practical_exam_marks": 40} for s in students],
+    })
+    assert response.status_code == 200, response.get_json()
+    for student in students[:2]:
+        MarksModule.assign_practical_mark(student.student_id, other.subject_id, 50)
+    pairs = [(s.student_id, subject.subject_id) for s in students] + [(s.student_id, other.subject_id) for s in students[:2]]
+    return sorted(pairs)
+
+
+def walk(hod_client, url, limit, cursor=None, **filters):
+    """Follows next_cursor to the end, returns the (student_id, subject_id) pairs and the page count"""
+    pairs, pages = [], 0
+    while True:
+        query = {"limit": limit, **filters, **({"cursor": cursor} if cursor else {})}
+        response = hod_client.get(url, query_string=query)
+        assert response.status_code == 200, response.get_json()
+        page = response.get_json()
+        pairs += [(item["student"]["student_id"], item["subject"]["subject_id"]) for item in page["items"]]
+        pages += 1
+        cursor = page["next_cursor"]
+        if not cursor:
+            return pairs, pages
+
+
+@pytest.mark.parametrize("limit", [1, 2, 5, 50])
+def test_pages_cover_every_pair_once_in_order(hod_client, marked, limit):
+    pairs, pages = walk(hod_client, "/api/hod/marks", limit)
+    assert pairs == marked
+    assert pages == max(1, -(-len(marked) // limit))
+
+
+def test_filters_apply_across_pages(hod_client, marked, subject):
+    pairs, _ = walk(hod_client, "/api/hod/marks", 1, subject_id=subject.subject_id)
+    assert pairs == [pair for pair in marked if pair[1] == subject.subject_id]
+
+    student_id = marked[0][0]
+    pairs, _ = walk(hod_client, f"/api/hod/students/{student_id}/marks", 1)
+    assert pairs == [pair for pair in marked if pair[0] == student_id]
+
+
+def test_write_between_pages_does_not_shift_the_cursor(hod_client, marked, subject):
+    first = hod_client.get("/api/hod/marks", query_string={"limit": 2}).get_json()
+    MarksModule.assign_practical_mark(marked[0][0], subject.subject_id, 10)  # updates a pair already served
+
+    rest, _ = walk(hod_client, "/api/hod/marks", 2, cursor=first["next_cursor"])
+    assert rest == marked[2:]
+
+
+def test_limit_is_clamped(hod_client, marked, monkeypatch):
+    monkeypatch.setattr(MarksModule, "MAX_PAGE_SIZE", 2)
+    assert len(hod_client.get("/api/hod/marks?limit=100").get_json()["items"]) == 2
+    assert len(hod_client.get("/api/hod/marks?limit=-5").get_json()["items"]) == 1
+
+
+def test_cursor_round_trip():
+    assert MarksModule.decode_cursor(MarksModule.encode_cursor(12, 3)) == (12, 3)
+
+
+@pytest.mark.parametrize("cursor", ["not-a-cursor", "W10=", "WzEsMiwzXQ==", "WyJhIiwgMV0=", "e30=", "%%%"])
+def test_malformed_cursor_is_rejected(hod_client, marked, cursor):
+    assert MarksModule.decode_cursor(cursor) is None
+    response = hod_client.get("/api/hod/marks", query_string={"cursor": cursor})
+    assert response.status_code == 400
+    assert response.get_json() == {"error": "Invalid cursor."}
@@ -0,0 +1,73 @@
+"""List endpoints must issue the same number of queries whatever the size of the list (no N+1 loading)"""
+import pytest
+
+from app.extensions import db
+from app.models import Student, Subject, Teacher, ManualMarks, PracticalMarks, ClassTestMarks, SLAMarks
+from app.modules.marks_module import MarksModule
+from app.testing import assert_queries_independent_of_size
+
+
+def create_teachers(count):
+    """Adds teachers, each with its own subject, until there are `count`"""
+    for i in range(Teacher.query.count(), count):
+        subject = Subject(subject_name=f"Subject {i}", year=i % 3 + 1)
+        db.session.add(subject)
+        db.session.flush()
+        db.session.add(Teacher(name=f"Teacher {i}", email=f"teacher{i}@example.com", phone=f"80000{i:05d}",
+                               password_hash="-", subject_id=subject.subject_id))
+    db.session.commit()
+
+
+def create_marked_students(subject, count):
+    """Adds students of the subject's year with every mark type, until there are `count`"""
+    for i in range(Student.query.count(), count):
+        student = Student(name=f"Student {i}", email=f"student{i}@example.com", phone=f"70000{i:05d}",
+                          dob="2005-01-01", gender="F", address="Pune", current_year=subject.year,
+                          admission_year=2024, enrollment_number=f"EN{i:05d}", exam_seat_number=f"SEAT{i:05d}")
+        db.session.add(student)
+        db.session.flush()
+        db.session.add_all([
+            ManualMarks(student_id=student.student_id, subject_id=subject.subject_id, experiment_number=1, marks_obtained=20),
+            ManualMarks(student_id=student.student_id, subject_id=subject.subject_id, experiment_number=2, marks_obtained=18),
+            PracticalMarks(student_id=student.student_id, subject_id=subject.subject_id, practical_exam_marks=40),
+            ClassTestMarks(student_id=student.student_id, subject_id=subject.subject_id, class_test_1=25, class_test_2=27),
+            SLAMarks(student_id=student.student_id, subject_id=subject.subject_id, micro_project=8, assignment=9, other_marks=7),
+        ])
+    db.session.commit()
+    MarksModule.rebuild_totals()
+
+
+def get_ok(client, url):
+    # A fresh app context, as in a real request: flask.g and the session would otherwise carry
+    # over from the test's context, hiding the per-request lookups
+    with client.application.app_context():
+        response = client.get(url)
+    assert response.status_code == 200, response.get_json()
+    return response
+
+
+def test_teacher_list(hod_client):
+    assert_queries_independent_of_size(create_teachers, lambda: get_ok(hod_client, "/api/hod/teachers"))
+
+
+def test_gradebook(teacher_client, subject):
+    assert_queries_independent_of_size(lambda count: create_marked_students(subject, count),
+                                       lambda: get_ok(teacher_client, "/api/teacher/gradebook"))
+
+
+def test_subject_totals(teacher_client, subject):
+    assert_queries_independent_of_size(lambda count: create_marked_students(subject, count),
+                                       lambda: get_ok(teacher_client, "/api/teacher/totals"))
+
+
+def test_student_list(teacher_client, subject):
+    assert_queries_independent_of_size(lambda count: create_marked_students(subject, count),
+                                       lambda: get_ok(teacher_client, "/api/teacher/students"))
+
+
+def test_cached_response_is_not_measured(hod_client):
+    etag = get_ok(hod_client, "/api/hod/teachers").headers["ETag"]
+    with pytest.raises(AssertionError, match="304"):
+        assert_queries_independent_of_size(
+            create_teachers, lambda: hod_client.get("/api/hod/teachers", headers={"If-None-Match": etag}), sizes=(0,)
+        )
@@ -0,0 +1,78 @@
+import os
+import time
+
+import pytest
+
+from app.extensions import db
+from app.modules import report_cache
+from app.modules.report_cache import ReportCache
+from app.modules.table_versions import TableVersions
+
+
+@pytest.fixture
+def cache(app, tmp_path):
+    ReportCache.init_app(app, str(tmp_path))
+    return ReportCache
+
+
+def get(cache, params=("students", "all", "excel")):
+    """Returns (path, generated) for params, writing a small report on a miss"""
+    calls = []
+
+    def generate(directory):
+        calls.append(directory)
+        path = os.path.join(directory, "report.xlsx")
+        with open(path, "w") as report:
+            report.write("report")
+        return path
+
+    return cache.get_or_create(params, generate), bool(calls)
+
+
+def test_unchanged_data_is_served_from_the_cache(cache):
+    path, generated = get(cache)
+    assert generated
+
+    again, generated = get(cache)
+    assert not generated
+    assert again == path
+
+
+def test_version_bump_invalidates(cache):
+    path, _ = get(cache)
+    TableVersions.bump("marks")
+    db.session.commit()
+
+    again, generated = get(cache)
+    assert generated
+    assert again != path
+
+
+def test_entries_expire_after_the_ttl(cache, monkeypatch):
+    get(cache)
+    later = time.time() + cache._ttl
+    monkeypatch.setattr(report_cache.time, "time", lambda: later)
+
+    _, generated = get(cache)
+    assert generated
+
+
+def test_ttl_zero_disables_expiry(cache, monkeypatch):
+    monkeypatch.setattr(ReportCache, "_ttl", 0)
+    get(cache)
+    later = time.time() + 10 * 24 * 60 * 60
+    monkeypatch.setattr(report_cache.time, "time", lambda: later)
+
+    _, generated = get(cache)
+    assert not generated
+
+
+def test_evict_removes_entries_unused_for_the_ttl(cache, monkeypatch):
+    stale, _ = get(cache, ("students", 1, "excel"))
+    fresh, _ = get(cache, ("students", 2, "excel"))
+    long_ago = time.time() - cache._ttl - 1
+    os.utime(os.path.dirname(stale), (long_ago, long_ago))
+
+    assert cache.evict() == 1
+    assert not os.path.exists(stale)
+    assert os.path.exists(fresh)
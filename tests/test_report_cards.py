@@ -0,0 +1,51 @@
+import pytest
+
+from app.modules.reporting_module import ReportingModule
+
+
+@pytest.fixture
+def pool_sizes(monkeypatch, tmp_path):
+    """Records the worker count of each report card run, rendering inline"""
+    sizes = []
+
+    def render_all(tasks, workers):
+        sizes.append(workers)
+        return (ReportingModule._render_report_card(*task) for task in tasks)
+
+    monkeypatch.setattr(ReportingModule, "_render_all", staticmethod(render_all))
+    monkeypatch.setattr(ReportingModule, "REPORTS_DIR", str(tmp_path))
+    return sizes
+
+
+def generate(students, workers=None):
+    return ReportingModule._generate_report_cards(students, "excel", workers=workers)
+
+
+def test_explicit_worker_count_is_honored(students, pool_sizes):
+    generate(students, workers=2)
+    assert pool_sizes == [2]
+
+
+def test_configured_worker_count_is_honored(students, pool_sizes, monkeypatch):
+    monkeypatch.setattr(ReportingModule, "REPORT_CARD_WORKERS", 2)
+    generate(students)
+    assert pool_sizes == [2]
+
+
+def test_workers_are_capped_at_one_per_student(students, pool_sizes):
+    generate(students, workers=16)
+    assert pool_sizes == [len(students)]
+
+
+def test_automatic_size_never_drops_to_zero(students, pool_sizes, monkeypatch):
+    monkeypatch.setattr(ReportingModule, "REPORT_CARD_WORKERS", 0)
+    generate(students)
+    assert pool_sizes == [1]
+
+
+def test_automatic_size_follows_students_per_worker(students, pool_sizes, monkeypatch):
+    monkeypatch.setattr(ReportingModule, "REPORT_CARD_WORKERS", 0)
+    monkeypatch.setattr(ReportingModule, "REPORT_CARDS_PER_WORKER", 1)
+    monkeypatch.setattr("os.cpu_count", lambda: 2)
+    generate(students)
+    assert pool_sizes == [2]
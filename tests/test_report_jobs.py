@@ -0,0 +1,120 @@
+import pytest
+
+from app.modules.report_cache import ReportCache
+from app.modules.report_jobs import ReportJobs
+from app.modules.reporting_module import ReportingModule
+
+
+@pytest.fixture
+def queued(app, monkeypatch, tmp_path):
+    """Job ids handed to the worker pool; nothing runs until the test calls run(job_id)"""
+    job_ids = []
+
+    class Pool:
+        def submit(self, func, job_id):
+            job_ids.append(job_id)
+
+    monkeypatch.setattr(ReportJobs, "_pool", staticmethod(Pool))
+    monkeypatch.setattr(ReportJobs, "_resumed", True)
+    monkeypatch.setattr(ReportingModule, "REPORTS_DIR", str(tmp_path))
+    ReportCache.init_app(app, str(tmp_path))
+    return job_ids
+
+
+def call(client, method, url, **kwargs):
+    with client.application.app_context():
+        return client.open(url, method=method, **kwargs)
+
+
+def submit(client, **body):
+    return call(client, "POST", "/api/hod/report/jobs", json=body)
+
+
+def status(client, job_id):
+    return call(client, "GET", f"/api/hod/report/jobs/{job_id}").get_json()
+
+
+def test_job_is_queued_run_and_downloaded(hod_client, students, queued):
+    response = submit(hod_client, type="students", format="excel")
+    assert response.status_code == 202
+    job = response.get_json()
+    assert response.headers["Location"].endswith(f"/api/hod/report/jobs/{job['job_id']}")
+    assert queued == [job["job_id"]]
+    assert status(hod_client, job["job_id"])["status"] == "queued"
+    assert call(hod_client, "GET", f"/api/hod/report/jobs/{job['job_id']}/download").status_code == 409
+
+    ReportJobs._run(job["job_id"])
+
+    assert status(hod_client, job["job_id"])["status"] == "done"
+    download = call(hod_client, "GET", f"/api/hod/report/jobs/{job['job_id']}/download")
+    assert download.status_code == 200
+    assert download.data[:2] == b"PK"  # xlsx is a zip container
+    download.close()
+
+
+def test_identical_job_in_flight_is_reused(hod_client, students, queued):
+    first = submit(hod_client, type="students", format="pdf").get_json()
+    again = submit(hod_client, type="students", format="pdf").get_json()
+    other = submit(hod_client, type="students", format="excel").get_json()
+
+    assert again["job_id"] == first["job_id"]
+    assert other["job_id"] != first["job_id"]
+    assert queued == [first["job_id"], other["job_id"]]
+
+    ReportJobs._run(first["job_id"])
+    assert submit(hod_client, type="students", format="pdf").get_json()["job_id"] != first["job_id"]
+
+
+def test_full_queue_is_rejected_with_retry_after(hod_client, students, queued, monkeypatch):
+    monkeypatch.setattr(ReportJobs, "_queue_depth", 1)
+    assert submit(hod_client, type="students", format="pdf").status_code == 202
+
+    response = submit(hod_client, type="students", format="excel")
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "5"
+    assert len(queued) == 1
+
+
+@pytest.mark.parametrize("body", [
+    {"type": "everything"},
+    {"type": "students", "format": "csv"},
+    {"type": "students", "year": "second"},
+    {"type": "student", "student_id": 999},
+    {"type": "student", "student_id": "abc"},
+])
+def test_invalid_job_is_rejected(hod_client, queued, body):
+    response = submit(hod_client, **body)
+    assert response.status_code == 400
+    assert "error" in response.get_json()
+    assert queued == []
+
+
+def test_non_object_body_is_rejected(hod_client, queued):
+    assert call(hod_client, "POST", "/api/hod/report/jobs", json=[1, 2]).status_code == 400
+
+
+def test_report_card_job_records_progress(hod_client, students, subject, queued):
+    job = submit(hod_client, type="cards", format="excel", year=subject.year).get_json()
+    ReportJobs._run(job["job_id"])
+
+    job = status(hod_client, job["job_id"])
+    assert job["status"] == "done"
+    assert (job["progress"], job["total"]) == (len(students), len(students))
+
+
+def test_failed_job_records_the_error(hod_client, students, queued, monkeypatch):
+    def fail(job):
+        raise RuntimeError("renderer crashed")
+
+    monkeypatch.setattr(ReportJobs, "_generate", staticmethod(fail))
+    job = submit(hod_client, type="students", format="excel").get_json()
+    ReportJobs._run(job["job_id"])
+
+    job = status(hod_client, job["job_id"])
+    assert (job["status"], job["error"]) == ("failed", "renderer crashed")
+    assert call(hod_client, "GET", f"/api/hod/report/jobs/{job['job_id']}/download").status_code == 409
+
+
+def test_unknown_job_is_not_found(hod_client, queued):
+    assert call(hod_client, "GET", "/api/hod/report/jobs/missing").status_code == 404
+    assert call(hod_client, "GET", "/api/hod/report/jobs/missing/download").status_code == 404
@@ -0,0 +1,64 @@
+import pytest
+import sqlalchemy as sa
+
+from app.extensions import db
+from app.models import ManualMarks
+
+INDEX = "ux_manual_marks_student_subject_experiment"
+
+
+@pytest.fixture
+def legacy_app(make_app, app, students, subject):
+    """An app started on a database whose manual_marks table lacks its unique index and has duplicates"""
+    with db.engine.begin() as conn:
+        conn.execute(sa.text(f"DROP INDEX {INDEX}"))
+        for value in (10, 12):
+            conn.execute(ManualMarks.__table__.insert().values(
+                student_id=students[0].student_id, subject_id=subject.subject_id, experiment_number=1, marks_obtained=value
+            ))
+    db.session.remove()
+    return make_app()
+
+
+def marks(app):
+    with app.app_context():
+        return sorted(mark.marks_obtained for mark in ManualMarks.query.all())
+
+
+def index_names(app):
+    with app.app_context():
+        return {index["name"] for index in sa.inspect(db.engine).get_indexes("manual_marks")}
+
+
+def test_startup_keeps_duplicates_and_leaves_indexes_alone(legacy_app, caplog):
+    assert marks(legacy_app) == [10, 12]
+    assert INDEX not in index_names(legacy_app)
+
+    from app.schema import check_indexes
+    with legacy_app.app_context():
+        assert [index.name for _, index in check_indexes(legacy_app)] == [INDEX]
+    assert INDEX in caplog.text
+
+
+def test_repair_indexes_dry_run_lists_rows_without_deleting(legacy_app):
+    result = legacy_app.test_cli_runner().invoke(args=["schema", "repair-indexes", "--dry-run"])
+
+    assert "1 duplicate rows to delete" in result.output
+    assert "'marks_obtained': 10.0" in result.output
+    assert marks(legacy_app) == [10, 12]
+    assert INDEX not in index_names(legacy_app)
+
+
+def test_repair_indexes_asks_before_deleting(legacy_app):
+    result = legacy_app.test_cli_runner().invoke(args=["schema", "repair-indexes"], input="n\n")
+
+    assert result.exit_code != 0
+    assert marks(legacy_app) == [10, 12]
+
+
+def test_repair_indexes_keeps_newest_row_and_creates_index(legacy_app):
+    result = legacy_app.test_cli_runner().invoke(args=["schema", "repair-indexes", "--yes"])
+
+    assert result.exit_code == 0, result.output
+    assert marks(legacy_app) == [12]
+    assert INDEX in index_names(legacy_app)
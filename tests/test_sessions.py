@@ -0,0 +1,117 @@
+import types
+
+import pytest
+
+from app.extensions import db
+from app.modules import session_manager, session_store
+from app.modules.session_manager import SessionManager
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controls the time the session manager and stores see; advance it by adding to clock.now"""
+    clock = types.SimpleNamespace(now=1_000_000.0)
+    fake_time = types.SimpleNamespace(time=lambda: clock.now)
+    monkeypatch.setattr(session_manager, "time", fake_time)
+    monkeypatch.setattr(session_store, "time", fake_time)
+    return clock
+
+
+def is_logged_in(client):
+    with client.application.app_context():
+        return client.get("/api/hod/students").status_code == 200
+
+
+def test_session_expires_after_the_idle_ttl(app, clock):
+    session_id = SessionManager.create_session(1, "hod")
+    clock.now += SessionManager._idle_ttl - 1
+    assert SessionManager.get_user_id_from_session_id(session_id, "hod") == 1
+
+    clock.now += SessionManager._idle_ttl + 1
+    expired = SessionManager.stats()["expired"]
+    assert SessionManager.get_user_id_from_session_id(session_id, "hod") is None
+    assert SessionManager.stats()["expired"] == expired + 1
+
+
+def test_activity_slides_the_idle_expiry_up_to_the_absolute_ttl(app, clock):
+    session_id = SessionManager.create_session(1, "hod")
+    logged_in_at = clock.now
+    while clock.now + SessionManager._idle_ttl / 2 < logged_in_at + SessionManager._absolute_ttl:
+        clock.now += SessionManager._idle_ttl / 2
+        assert SessionManager.get_user_id_from_session_id(session_id, "hod") == 1
+
+    clock.now = logged_in_at + SessionManager._absolute_ttl + 1
+    assert SessionManager.get_user_id_from_session_id(session_id, "hod") is None
+
+
+def test_session_is_bound_to_its_role(app):
+    session_id = SessionManager.create_session(1, "teacher")
+    assert SessionManager.get_user_id_from_session_id(session_id, "hod") is None
+    assert SessionManager.get_user_id_from_session_id(session_id, "teacher") == 1
+
+
+def test_sweeper_evicts_expired_sessions(app, clock):
+    SessionManager.create_session(1, "hod")
+    SessionManager.create_session(2, "teacher")
+    live = SessionManager.stats()["live"]
+    clock.now += SessionManager._idle_ttl + 1
+
+    assert SessionManager.sweep_expired() == 2
+    assert SessionManager.stats()["live"] == live - 2
+
+
+def test_logout_revokes_the_session(hod_client):
+    assert is_logged_in(hod_client)
+    cookie = hod_client.get_cookie("session_id").value
+    with hod_client.application.app_context():
+        assert hod_client.post("/api/hod/logout").status_code == 200
+
+    hod_client.set_cookie("session_id", cookie)  # a copy of the cookie kept from before the logout
+    assert not is_logged_in(hod_client)
+
+
+def test_flush_logs_everyone_out(hod_client):
+    assert is_logged_in(hod_client)
+    SessionManager.flush_sessions()
+    assert not is_logged_in(hod_client)
+
+
+@pytest.fixture
+def signed_app(make_app):
+    app = make_app(SESSION_MODE="signed")
+    with app.app_context():
+        yield app
+        db.session.remove()
+        db.engine.dispose()
+
+
+def test_signed_token_is_revoked_by_end_session(signed_app):
+    token = SessionManager.create_session(1, "hod")
+    other = SessionManager.create_session(1, "hod")
+    SessionManager.end_session(token)
+
+    assert SessionManager.get_user_id_from_session_id(token, "hod") is None
+    assert SessionManager.get_user_id_from_session_id(other, "hod") == 1
+
+
+def test_signed_tokens_issued_before_a_cutoff_are_rejected(signed_app, clock):
+    first = SessionManager.create_session(1, "hod")
+    other_user = SessionManager.create_session(2, "hod")
+    clock.now += 1
+    SessionManager.delete_session(1, "hod")
+    clock.now += 1
+    second = SessionManager.create_session(1, "hod")
+
+    assert SessionManager.get_user_id_from_session_id(first, "hod") is None
+    assert SessionManager.get_user_id_from_session_id(second, "hod") == 1
+    assert SessionManager.get_user_id_from_session_id(other_user, "hod") == 2
+
+    clock.now += 1
+    SessionManager.flush_sessions()
+    assert SessionManager.get_user_id_from_session_id(second, "hod") is None
+    assert SessionManager.get_user_id_from_session_id(other_user, "hod") is None
+
+
+def test_tampered_signed_token_is_rejected(signed_app):
+    token = SessionManager.create_session(1, "hod")
+    assert SessionManager.get_user_id_from_session_id(token[:-2] + "xx", "hod") is None
@@ -0,0 +1,81 @@
+import pytest
+
+from app.extensions import db
+from app.models import ManualMarks, StudentSubjectTotal
+from app.modules.marks_module import MarksModule
+from app.modules.reporting_module import ReportingModule
+from app.testing import count_queries
+
+
+@pytest.fixture
+def marked(teacher_client, students):
+    """Marks for every student written through the single-mark and batch endpoints"""
+    for student in students:
+        for experiment, marks in ((1, 20), (2, 15)):
+            response = teacher_client.post(f"/api/teacher/students/{student.student_id}/manual_marks",
+                                           json={"experiment_number": experiment, "marks_obtained": marks})
+            assert response.status_code == 200, response.get_json()
+    response = teacher_client.post("/api/teacher/marks/batch", json={
+        "practical_marks": [{"student_id": s.student_id, "practical_exam_marks": 30 + i} for i, s in enumerate(students)],
+        "class_test_marks": [{"student_id": s.student_id, "class_test_1": 20, "class_test_2": 25} for s in students],
+        "sla_marks": [{"student_id": students[0].student_id, "micro_project": 5, "assignment": 6, "other_marks": 7}],
+    })
+    assert response.status_code == 200, response.get_json()
+    return students
+
+
+def test_totals_follow_every_write(teacher_client, marked, subject):
+    assert MarksModule.check_totals() == []
+    total = db.session.get(StudentSubjectTotal, (marked[0].student_id, subject.subject_id))
+    assert (total.experiment_total, total.practical_exam_marks, total.class_test_average, total.sla_total) == (35, 30, 22.5, 18)
+    assert total.total == 105.5
+
+    mark = ManualMarks.query.filter_by(student_id=marked[0].student_id, experiment_number=2).one()
+    assert teacher_client.put(f"/api/teacher/manual_marks/{mark.manual_marks_id}", json={"marks_obtained": 5}).status_code == 200
+    assert teacher_client.delete(f"/api/teacher/manual_marks/{mark.manual_marks_id}").status_code == 200
+    db.session.expire_all()
+    assert MarksModule.check_totals() == []
+    assert db.session.get(StudentSubjectTotal, (marked[0].student_id, subject.subject_id)).experiment_total == 20
+
+
+def test_subject_totals_are_ranked(teacher_client, marked):
+    ranked = teacher_client.get("/api/teacher/totals").get_json()
+    # 105.5 (with SLA marks), then 89.5 and 88.5 (practical 32 and 31)
+    assert [row["student_id"] for row in ranked] == [marked[0].student_id, marked[2].student_id, marked[1].student_id]
+    assert [row["rank"] for row in ranked] == [1, 2, 3]
+
+
+def test_subject_report_reads_only_the_totals_table(marked, subject, tmp_path, monkeypatch):
+    monkeypatch.setattr(ReportingModule, "REPORTS_DIR", str(tmp_path))
+    for file_format in ("excel", "pdf"):
+        with count_queries() as queries:
+            assert ReportingModule.generate_subject_report(subject.subject_id, file_format).startswith(str(tmp_path))
+        statements = " ".join(queries.statements)
+        assert "student_subject_totals" in statements
+        assert "manual_marks" not in statements and "practical_marks" not in statements
+
+
+def test_consolidated_marks_come_from_the_totals_table(marked, subject):
+    all_data = ReportingModule._collect_student_data([marked[0]], with_totals=True)
+    assert ReportingModule._subject_marks(all_data["totals"], marked[0].student_id, subject.subject_id) == (35, 30, 22.5, 18)
+    assert ReportingModule._subject_marks(all_data["totals"], marked[0].student_id, subject.subject_id + 1) == (0, 0, 0, 0)
+
+    per_student = ReportingModule._split_student_data(ReportingModule._collect_student_data(marked, with_totals=True))
+    assert set(per_student[marked[1].student_id]["totals"]) == {(marked[1].student_id, subject.subject_id)}
+
+
+def test_startup_only_warns_about_missing_totals(make_app, marked, caplog):
+    StudentSubjectTotal.query.delete()
+    db.session.commit()
+    db.session.remove()
+
+    app = make_app()
+    assert "flask marks rebuild-totals" in caplog.text
+    with app.app_context():
+        assert StudentSubjectTotal.query.count() == 0
+
+    result = app.test_cli_runner().invoke(args=["marks", "rebuild-totals"])
+    assert result.exit_code == 0, result.output
+    with app.app_context():
+        assert StudentSubjectTotal.query.count() == len(marked)
+        assert MarksModule.check_totals() == []